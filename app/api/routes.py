@@ -1,24 +1,135 @@
 """
 API Routes - Endpoints REST
 """
+import asyncio
+import json
+import uuid
 import httpx
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks, Query
+from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from urllib.parse import quote
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
 import logging
+from typing import Optional
 from app.services.task_processor import task_processor
+from app.services.task_history import task_history
+from app.services.chunked_upload import UploadConflictError, UploadNotFoundError, chunked_uploads
+from app.services.admission_control import admission_controller
+from app.services.profiler_service import profiler_service
+from app.services.cache_service import response_cache
+from app.services.circuit_breaker import CircuitOpenError, mongo_breaker
+from app.services.local_index import local_index
+from app.services.rate_limiter import rate_limiter
 from app.config.settings import get_settings
-from app.utils.constants import ErrorMessages, FileFormats
+from app.dto.schemas import BulkSearchRequest, CoercionSpec, ColumnSpec
+from app.mapper.data_mapper import DataMapper
+from app.utils.constants import CsvEngines, ErrorMessages, FileFormats, LoadModes
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/bulk-load-data", tags=["bulk-load"])
 settings = get_settings()
 
 
+async def _admit(reservation_id: str, incoming_bytes: int):
+    """
+    Aplicar control de admisión; 429/503 con Retry-After si no hay capacidad
+
+    Args:
+        reservation_id: Clave de la reserva
+        incoming_bytes: Tamaño de la carga (0 si se desconoce)
+    """
+    await admission_controller.refresh_queue_depth()
+    rejection = admission_controller.try_admit(reservation_id, incoming_bytes)
+    if rejection is not None:
+        status_code, reason = rejection
+        logger.warning(f"🚦 Carga rechazada ({status_code}): {reason}")
+        raise HTTPException(
+            status_code=status_code,
+            detail=reason,
+            headers={"Retry-After": str(admission_controller.retry_after_seconds)}
+        )
+
+
+def _parse_coercion(coerce_types: Optional[bool], column_types: Optional[str]) -> Optional[CoercionSpec]:
+    """
+    Construir la conversión de tipos de una carga; 400 si column_types es inválido
+
+    Args:
+        coerce_types: Inferir tipos (None = TYPE_COERCION_ENABLED)
+        column_types: JSON con tipos forzados por columna
+
+    Returns:
+        CoercionSpec o None si la carga va toda como string
+    """
+    infer = settings.TYPE_COERCION_ENABLED if coerce_types is None else coerce_types
+
+    try:
+        spec = CoercionSpec(infer=infer, column_types=json.loads(column_types) if column_types else {})
+    except (ValueError, ValidationError) as e:
+        detail = e.errors()[0]["msg"] if isinstance(e, ValidationError) else str(e)
+        raise HTTPException(status_code=400, detail=ErrorMessages.COLUMN_TYPES_INVALID.format(detail=detail))
+
+    if not spec.infer and not spec.column_types:
+        return None
+    return spec
+
+
+def _parse_column_spec(column_spec: Optional[str]) -> Optional[ColumnSpec]:
+    """
+    Validar el column_spec de una carga; 400 si es inválido
+
+    Args:
+        column_spec: JSON con include, exclude, rename e id_column
+
+    Returns:
+        ColumnSpec o None si no se envió
+    """
+    if not column_spec:
+        return None
+
+    try:
+        return ColumnSpec(**json.loads(column_spec))
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorMessages.COLUMN_SPEC_INVALID.format(detail=e.errors()[0]["msg"])
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=ErrorMessages.COLUMN_SPEC_INVALID.format(detail=str(e)))
+
+
+def _resolve_load_mode(load_mode: Optional[str]) -> str:
+    """
+    Validar el modo de carga; 400 si no existe
+
+    Args:
+        load_mode: insert, upsert o replace (None = LOAD_MODE)
+
+    Returns:
+        Modo de carga a usar
+    """
+    load_mode = load_mode or settings.LOAD_MODE
+    if load_mode not in LoadModes.ALL:
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorMessages.LOAD_MODE_NOT_SUPPORTED.format(mode=load_mode)
+        )
+    return load_mode
+
+
 @router.post("/file")
 async def upload_file(
-    background_tasks: BackgroundTasks,
     client_id: str = Form(..., description="ID del cliente"),
     business_name: str = Form(..., description="Nombre del negocio"),
-    file: UploadFile = File(..., description="Archivo CSV o Excel")
+    file: UploadFile = File(..., description="Archivo CSV, Excel, Parquet o Arrow IPC"),
+    csv_engine: Optional[str] = Form(None, description="Motor CSV: stdlib, pandas-c o pyarrow"),
+    profile: bool = Form(False, description="Perfilar el procesamiento de esta tarea con cProfile"),
+    coerce_types: Optional[bool] = Form(None, description="Inferir tipos por columna (por defecto TYPE_COERCION_ENABLED)"),
+    column_types: Optional[str] = Form(None, description='Tipos forzados, JSON {"columna": "string|int|float|bool|datetime"}'),
+    column_spec: Optional[str] = Form(None, description='Columnas, JSON {"include": [], "exclude": [], "rename": {}, "id_column": ""}'),
+    load_mode: Optional[str] = Form(None, description="Modo de carga: insert, upsert o replace (por defecto LOAD_MODE)")
 ):
     """
     ...
@@ -26,6 +137,12 @@ async def upload_file(
         client_id: ID del cliente
         business_name: Nombre del negocio
         file: Archivo a procesar
+        csv_engine: Motor de parseo CSV (opcional, por defecto CSV_ENGINE)
+        profile: Perfilar la tarea (descargable en /profile/{task_id})
+        coerce_types: Convertir columnas a int, float, bool, datetime o null según una muestra
+        column_types: Tipos forzados por columna (JSON, con los nombres ya renombrados)
+        column_spec: Columnas a conservar/descartar, renombres y columna del _id (JSON)
+        load_mode: insert, upsert por _id o replace atómico de la colección
 
     Returns:
         task_id: ID de la tarea para consultar progreso
@@ -42,10 +159,26 @@ async def upload_file(
     if not any(filename_lower.endswith(ext) for ext in FileFormats.ALL_SUPPORTED):
         raise HTTPException(status_code=400, detail=ErrorMessages.FILE_NOT_SUPPORTED)
 
+    # Validar motor CSV
+    if csv_engine and csv_engine not in CsvEngines.ALL:
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorMessages.CSV_ENGINE_NOT_SUPPORTED.format(engine=csv_engine)
+        )
+
+    coercion = _parse_coercion(coerce_types, column_types)
+    projection = _parse_column_spec(column_spec)
+    load_mode = _resolve_load_mode(load_mode)
+
+    # Control de admisión antes de cargar el archivo en memoria
+    reservation_id = f"upload-{uuid.uuid4()}"
+    await _admit(reservation_id, file.size or 0)
+
     try:
         # Leer contenido del archivo
         file_content = await file.read()
         file_size_mb = len(file_content) / (1024 * 1024)
+        admission_controller.reserve(reservation_id, len(file_content))
 
         # Validar tamaño del archivo
         if file_size_mb > settings.MAX_FILE_SIZE_MB:
@@ -58,24 +191,35 @@ async def upload_file(
         logger.info(f"👤 Cliente ID: {client_id}, Negocio: {business_name}")
 
         # Crear tarea
-        task_id = task_processor.create_task(
+        task_id = await task_processor.create_task(
             client_id=client_id,
             business_name=business_name,
             filename=file.filename
         )
 
         # Agregar procesamiento en background
-        background_tasks.add_task(
-            task_processor.process_file_async,
-            task_id,
-            file_content,
-            file.filename,
-            client_id,
-            business_name
-        )
+        process_args = (task_id, file_content, file.filename, client_id, business_name, csv_engine, coercion, projection, load_mode)
+        profiled = profile or settings.PROFILING_ENABLED
+
+        if settings.WORKER_MODE == "queue":
+            # Cualquier worker/réplica puede tomar la tarea desde la cola compartida
+            await task_processor.enqueue_file(*process_args, profile=profiled)
+        else:
+            # La reserva se libera cuando termina process_file_async
+            admission_controller.reassign(reservation_id, task_id)
+
+            if profiled:
+                task_processor.submit(
+                    profiler_service.profile_task,
+                    task_id,
+                    task_processor.process_file_async,
+                    *process_args
+                )
+            else:
+                task_processor.submit(task_processor.process_file_async, *process_args)
 
         # Responder inmediatamente
-        return {
+        response = {
             "task_id": task_id,
             "status": "queued",
             "message": "Archivo recibido. Procesando en background.",
@@ -83,6 +227,10 @@ async def upload_file(
             "business_name": business_name,
             "filename": file.filename
         }
+        if profiled:
+            response["profile_url"] = f"{router.prefix}/profile/{task_id}"
+
+        return response
 
     except HTTPException:
         raise
@@ -92,6 +240,433 @@ async def upload_file(
             status_code=500,
             detail=f"{ErrorMessages.INTERNAL_ERROR}: {str(e)}"
         )
+    finally:
+        # No-op si la reserva ya pasó al task_id
+        admission_controller.release(reservation_id)
+
+
+@router.post("/stream")
+async def upload_stream(
+    request: Request,
+    client_id: str = Query(..., description="ID del cliente"),
+    business_name: str = Query(..., description="Nombre del negocio"),
+    filename: str = Query("stream.ndjson", description="Nombre lógico del flujo"),
+    coerce_types: Optional[bool] = Query(None, description="Inferir tipos de los valores string"),
+    column_types: Optional[str] = Query(None, description="Tipos forzados por columna (JSON)"),
+    column_spec: Optional[str] = Query(None, description="Claves a conservar/renombrar y clave del _id (JSON)"),
+    load_mode: Optional[str] = Query(None, description="Modo de carga: insert, upsert o replace")
+):
+    """
+    Ingerir un flujo NDJSON (JSON Lines) enviado como cuerpo de la request
+
+    El cuerpo (por ejemplo con Transfer-Encoding: chunked) se procesa a medida
+    que llega: cada batch completo se envía a ig-db-mongo sin esperar a que
+    termine la subida ni escribir archivos temporales. La respuesta llega al
+    cerrarse el flujo; mientras tanto el progreso puede consultarse en
+    /status/{task_id}. Con un filename .csv el flujo se parsea como CSV.
+
+    Args:
+        client_id: ID del cliente
+        business_name: Nombre del negocio
+        filename: Nombre lógico del flujo (para logs y estado)
+        coerce_types: Convertir columnas string a int, float, bool, datetime o null
+        column_types: Tipos forzados por columna (JSON)
+        column_spec: Claves a conservar/renombrar y clave del _id (JSON)
+        load_mode: insert, upsert por _id o replace atómico de la colección
+
+    Returns:
+        task_id y estado final de la tarea
+    """
+    coercion = _parse_coercion(coerce_types, column_types)
+    projection = _parse_column_spec(column_spec)
+    load_mode = _resolve_load_mode(load_mode)
+
+    logger.info(f"🌊 Flujo NDJSON recibido: {filename}")
+    logger.info(f"👤 Cliente ID: {client_id}, Negocio: {business_name}")
+
+    # El flujo no retiene el archivo completo: cuenta como tarea con 0 bytes
+    reservation_id = f"stream-{uuid.uuid4()}"
+    await _admit(reservation_id, 0)
+
+    try:
+        task_id = await task_processor.create_task(
+            client_id=client_id,
+            business_name=business_name,
+            filename=filename
+        )
+
+        await task_processor.process_stream_async(
+            task_id,
+            request.stream(),
+            filename,
+            client_id,
+            business_name,
+            coercion,
+            projection,
+            load_mode
+        )
+    finally:
+        admission_controller.release(reservation_id)
+
+    return {
+        "task_id": task_id,
+        **(await task_processor.get_task_status(task_id))
+    }
+
+
+def _is_streamable(filename: str, csv_engine: Optional[str]) -> bool:
+    """CSV con el motor stdlib y NDJSON se pueden procesar mientras llegan las partes"""
+    filename_lower = filename.lower()
+    if filename_lower.endswith(tuple(FileFormats.NDJSON)):
+        return True
+    return (
+        filename_lower.endswith(tuple(FileFormats.CSV))
+        and (csv_engine or settings.CSV_ENGINE) == CsvEngines.STDLIB
+    )
+
+
+async def _fail_upload_task(task_id: str, message: str):
+    """Marcar como fallida la tarea de una subida que no llegó a procesarse"""
+    status = await task_processor.get_task_status(task_id)
+    if status is not None and status.get("status") == "queued":
+        await task_processor.update_task_status(
+            task_id=task_id,
+            status="failed",
+            progress=0,
+            message=f"Error: {message}",
+            error_detail=message
+        )
+
+
+@contextmanager
+def _upload_errors(upload_id: str):
+    """Traducir los errores de chunked_uploads a HTTP (404, 409, 400)"""
+    try:
+        yield
+    except UploadNotFoundError:
+        raise HTTPException(status_code=404, detail=ErrorMessages.UPLOAD_NOT_FOUND.format(upload_id=upload_id))
+    except UploadConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/uploads")
+async def create_upload(
+    client_id: str = Form(..., description="ID del cliente"),
+    business_name: str = Form(..., description="Nombre del negocio"),
+    filename: str = Form(..., description="Nombre del archivo (define el formato)"),
+    csv_engine: Optional[str] = Form(None, description="Motor CSV: stdlib, pandas-c o pyarrow"),
+    profile: bool = Form(False, description="Perfilar el procesamiento de esta tarea con cProfile"),
+    coerce_types: Optional[bool] = Form(None, description="Inferir tipos por columna (por defecto TYPE_COERCION_ENABLED)"),
+    column_types: Optional[str] = Form(None, description='Tipos forzados, JSON {"columna": "string|int|float|bool|datetime"}'),
+    column_spec: Optional[str] = Form(None, description='Columnas, JSON {"include": [], "exclude": [], "rename": {}, "id_column": ""}'),
+    load_mode: Optional[str] = Form(None, description="Modo de carga: insert, upsert o replace (por defecto LOAD_MODE)")
+):
+    """
+    Iniciar una subida por partes
+
+    Después se envía cada parte con PUT /uploads/{upload_id}/parts/{n} (cuerpo
+    binario, n desde 1) y se cierra con POST /uploads/{upload_id}/complete.
+    Si la conexión se corta, GET /uploads/{upload_id} indica qué partes
+    llegaron y solo se reenvían las que faltan.
+
+    CSV (motor stdlib) y NDJSON se procesan a medida que llegan las partes
+    consecutivas desde la 1 (streaming=true), con tope UPLOAD_MAX_SIZE_MB.
+    Los demás formatos se procesan al completar la subida y mantienen el
+    tope MAX_FILE_SIZE_MB porque se leen enteros en memoria.
+
+    Args:
+        client_id: ID del cliente
+        business_name: Nombre del negocio
+        filename: Nombre del archivo
+        csv_engine: Motor de parseo CSV (opcional, por defecto CSV_ENGINE)
+        profile: Perfilar la tarea (descargable en /profile/{task_id})
+        coerce_types: Convertir columnas a int, float, bool, datetime o null según una muestra
+        column_types: Tipos forzados por columna (JSON, con los nombres ya renombrados)
+        column_spec: Columnas a conservar/descartar, renombres y columna del _id (JSON)
+        load_mode: insert, upsert por _id o replace atómico de la colección
+
+    Returns:
+        upload_id: ID de la subida (igual al task_id)
+        task_id: ID de la tarea para consultar progreso
+        streaming: True si la carga empieza antes de completar la subida
+    """
+    filename_lower = filename.lower()
+    if not any(filename_lower.endswith(ext) for ext in FileFormats.ALL_SUPPORTED):
+        raise HTTPException(status_code=400, detail=ErrorMessages.FILE_NOT_SUPPORTED)
+
+    if csv_engine and csv_engine not in CsvEngines.ALL:
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorMessages.CSV_ENGINE_NOT_SUPPORTED.format(engine=csv_engine)
+        )
+
+    coercion = _parse_coercion(coerce_types, column_types)
+    projection = _parse_column_spec(column_spec)
+    load_mode = _resolve_load_mode(load_mode)
+
+    # Subidas abandonadas: liberar disco y cerrar sus tareas
+    for expired_id in chunked_uploads.remove_expired():
+        await _fail_upload_task(expired_id, ErrorMessages.UPLOAD_IDLE_TIMEOUT.format(seconds=settings.UPLOAD_IDLE_TIMEOUT_SECONDS))
+
+    reservation_id = f"upload-{uuid.uuid4()}"
+    await _admit(reservation_id, 0)
+
+    try:
+        task_id = await task_processor.create_task(
+            client_id=client_id,
+            business_name=business_name,
+            filename=filename
+        )
+        await task_processor.update_task_status(task_id, "queued", 0, "Subida por partes iniciada, esperando partes")
+
+        # En modo queue otra réplica procesa la tarea: se encola al completar la subida
+        streaming = (
+            settings.UPLOAD_EARLY_START
+            and settings.WORKER_MODE != "queue"
+            and _is_streamable(filename, csv_engine)
+        )
+        profiled = profile or settings.PROFILING_ENABLED
+        chunked_uploads.create(task_id, {
+            "filename": filename,
+            "client_id": client_id,
+            "business_name": business_name,
+            "csv_engine": csv_engine,
+            "coercion": coercion.model_dump() if coercion else None,
+            "column_spec": projection.model_dump() if projection else None,
+            "load_mode": load_mode,
+            "profile": profiled,
+            "streaming": streaming
+        })
+
+        if streaming:
+            # La reserva se libera cuando termina process_upload_async
+            admission_controller.reassign(reservation_id, task_id)
+            process_args = (task_id, filename, client_id, business_name, coercion, projection, load_mode)
+            if profiled:
+                task_processor.submit(
+                    profiler_service.profile_task,
+                    task_id,
+                    task_processor.process_upload_async,
+                    *process_args
+                )
+            else:
+                task_processor.submit(task_processor.process_upload_async, *process_args)
+    finally:
+        admission_controller.release(reservation_id)
+
+    logger.info(f"📮 Subida por partes: {filename} (streaming={streaming})")
+    logger.info(f"👤 Cliente ID: {client_id}, Negocio: {business_name}")
+
+    response = {
+        "upload_id": task_id,
+        "task_id": task_id,
+        "status": "queued",
+        "streaming": streaming,
+        "parts_url": f"{router.prefix}/uploads/{task_id}/parts/{{part_number}}",
+        "max_part_size_mb": settings.UPLOAD_MAX_PART_SIZE_MB,
+        "max_size_mb": settings.UPLOAD_MAX_SIZE_MB if streaming else settings.MAX_FILE_SIZE_MB
+    }
+    if profiled:
+        response["profile_url"] = f"{router.prefix}/profile/{task_id}"
+    return response
+
+
+@router.put("/uploads/{upload_id}/parts/{part_number}")
+async def upload_part(upload_id: str, part_number: int, request: Request):
+    """
+    Subir una parte de una subida por partes
+
+    El cuerpo es el contenido binario de la parte; se escribe a disco a
+    medida que llega. Reenviar una parte con el mismo contenido es seguro.
+
+    Args:
+        upload_id: ID de la subida
+        part_number: Número de parte, desde 1
+
+    Returns:
+        part_number, size y sha256 de la parte guardada
+
+    Raises:
+        400: Número de parte inválido o tamaño excedido
+        404: Si la subida no existe o expiró
+        409: Si la subida ya se completó o la parte ya se procesó con otro contenido
+    """
+    with _upload_errors(upload_id):
+        part = await chunked_uploads.write_part(upload_id, part_number, request.stream())
+    return {"upload_id": upload_id, **part}
+
+
+@router.get("/uploads/{upload_id}")
+async def get_upload(upload_id: str):
+    """
+    Consultar qué partes llegaron, para reanudar una subida cortada
+
+    Args:
+        upload_id: ID de la subida
+
+    Returns:
+        Partes recibidas con su tamaño, bytes recibidos y partes ya procesadas
+
+    Raises:
+        404: Si la subida no existe, expiró o ya terminó de procesarse
+    """
+    with _upload_errors(upload_id):
+        return chunked_uploads.status(upload_id)
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_upload(
+    upload_id: str,
+    total_parts: int = Query(..., ge=1, description="Cantidad de partes del archivo")
+):
+    """
+    Completar una subida por partes
+
+    Verifica que estén las partes 1..total_parts. Si la subida se procesa en
+    streaming, la carga termina cuando se procesa la última parte; si no, el
+    archivo se procesa a partir de aquí.
+
+    Args:
+        upload_id: ID de la subida
+        total_parts: Cantidad de partes del archivo
+
+    Returns:
+        task_id, estado de la tarea y tamaño total
+
+    Raises:
+        400: Si faltan partes o hay partes posteriores a total_parts
+        404: Si la subida no existe o expiró
+        409: Si la subida ya se completó
+    """
+    with _upload_errors(upload_id):
+        meta = chunked_uploads.get_meta(upload_id)
+
+        if meta["streaming"]:
+            total_bytes = chunked_uploads.complete(upload_id, total_parts)
+            return {
+                "task_id": upload_id,
+                "total_bytes": total_bytes,
+                **(await task_processor.get_task_status(upload_id) or {})
+            }
+
+        coercion = CoercionSpec(**meta["coercion"]) if meta["coercion"] else None
+        projection = ColumnSpec(**meta["column_spec"]) if meta["column_spec"] else None
+        queued = settings.WORKER_MODE == "queue"
+
+        # En modo inprocess el archivo se lee entero en memoria: control de
+        # admisión como en /file. En modo queue solo cuenta la cola
+        reservation_id = f"upload-{uuid.uuid4()}"
+        await _admit(reservation_id, 0 if queued else sum(chunked_uploads.list_parts(upload_id).values()))
+
+        try:
+            total_bytes = chunked_uploads.complete(upload_id, total_parts)
+
+            if queued:
+                # Las partes se concatenan en el spool por bloques, sin pasar por memoria
+                await asyncio.to_thread(chunked_uploads.copy_to, upload_id, task_processor.spool_path(upload_id))
+                await task_processor.enqueue_spooled(
+                    upload_id, meta["filename"], meta["client_id"], meta["business_name"],
+                    meta["csv_engine"], coercion, projection, meta["load_mode"], profile=meta["profile"]
+                )
+            else:
+                file_content = await asyncio.to_thread(chunked_uploads.read_all, upload_id)
+                admission_controller.reserve(reservation_id, len(file_content))
+                process_args = (
+                    upload_id, file_content, meta["filename"], meta["client_id"], meta["business_name"],
+                    meta["csv_engine"], coercion, projection, meta["load_mode"]
+                )
+
+                admission_controller.reassign(reservation_id, upload_id)
+                if meta["profile"]:
+                    task_processor.submit(
+                        profiler_service.profile_task,
+                        upload_id,
+                        task_processor.process_file_async,
+                        *process_args
+                    )
+                else:
+                    task_processor.submit(task_processor.process_file_async, *process_args)
+        finally:
+            admission_controller.release(reservation_id)
+
+        # Las partes ya no hacen falta: el archivo está en memoria o en el spool
+        chunked_uploads.remove(upload_id)
+
+    return {
+        "task_id": upload_id,
+        "status": "queued",
+        "message": "Archivo recibido. Procesando en background.",
+        "total_bytes": total_bytes
+    }
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_upload(upload_id: str):
+    """
+    Cancelar una subida por partes y borrar sus partes
+
+    Si ya se estaba procesando en streaming, la tarea termina como fallida
+    (lo enviado hasta el momento queda en la colección, salvo en modo replace).
+
+    Args:
+        upload_id: ID de la subida
+
+    Raises:
+        404: Si la subida no existe o expiró
+    """
+    with _upload_errors(upload_id):
+        chunked_uploads.get_meta(upload_id)
+        chunked_uploads.remove(upload_id)
+
+    await _fail_upload_task(upload_id, ErrorMessages.UPLOAD_ABORTED)
+    return {"upload_id": upload_id, "status": "aborted"}
+
+
+def _search_url(client_id: str, business_name: str, document_id: str) -> str:
+    """URL de búsqueda por ID en ig-db-mongo"""
+    return (
+        f"{settings.IG_DB_MONGO_URL}/api/rest/v1/google-sheet/"
+        f"{client_id}/{business_name}/search?id={quote(document_id, safe='')}"
+    )
+
+
+async def _fetch_from_ig_db_mongo(url: str, client: Optional[httpx.AsyncClient] = None):
+    """
+    GET a ig-db-mongo; error HTTP si la respuesta no es 200
+
+    Con el circuito de ig-db-mongo abierto responde 503 sin intentar la llamada.
+
+    Args:
+        url: URL completa del endpoint
+        client: Cliente HTTP compartido (si no, se crea uno para esta llamada)
+
+    Returns:
+        Cuerpo JSON de la respuesta
+    """
+    try:
+        with mongo_breaker.call() as outcome:
+            if client is not None:
+                response = await client.get(url)
+            else:
+                async with httpx.AsyncClient(timeout=30) as new_client:
+                    response = await new_client.get(url)
+            outcome.failed = response.status_code >= 500
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=ErrorMessages.UPSTREAM_UNAVAILABLE,
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
+
+    if response.status_code == 200:
+        return response.json()
+
+    raise HTTPException(
+        status_code=response.status_code,
+        detail=f"Error consultando ig-db-mongo: {response.text}"
+    )
 
 
 @router.get("/{clientId}/{businessName}/search/{id}")
@@ -103,6 +678,11 @@ async def search_document(
     """
     Buscar un documento específico por su ID en una colección
 
+    Si LOCAL_INDEX_ENABLED, primero se busca en el índice local de las cargas
+    hechas por este servicio, con la misma forma de respuesta que ig-db-mongo.
+    Si no está, se consulta ig-db-mongo: las respuestas se cachean (TTL + LRU) y las
+    búsquedas concurrentes del mismo ID comparten una sola llamada.
+
     Args:
         clientId: ID del cliente
         businessName: Nombre del negocio
@@ -112,19 +692,19 @@ async def search_document(
         Documento encontrado o mensaje de no encontrado
     """
     try:
-        url = f"{settings.IG_DB_MONGO_URL}/api/rest/v1/google-sheet/{clientId}/{businessName}/search?id={id}"
+        document = local_index.lookup(clientId, businessName, id)
+        if document is not None:
+            return DataMapper.map_to_search_response(clientId, businessName, document)
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url)
+        url = _search_url(clientId, businessName, id)
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Error consultando ig-db-mongo: {response.text}"
-                )
+        return await response_cache.get_or_load(
+            ("search", clientId, businessName, id),
+            lambda: _fetch_from_ig_db_mongo(url)
+        )
 
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Timeout consultando ig-db-mongo")
     except Exception as e:
@@ -132,6 +712,77 @@ async def search_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{clientId}/{businessName}/search")
+async def bulk_search_documents(
+        clientId: str,
+        businessName: str,
+        request: BulkSearchRequest
+):
+    """
+    Buscar múltiples documentos por ID en una sola llamada
+
+    ig-db-mongo no expone una consulta masiva, así que los IDs se consultan
+    en paralelo (hasta BULK_SEARCH_CONCURRENCY a la vez) reutilizando un
+    cliente HTTP y el cache de búsquedas. Los resultados se devuelven como
+    NDJSON a medida que llegan (no necesariamente en el orden pedido).
+
+    Args:
+        clientId: ID del cliente
+        businessName: Nombre del negocio
+        request: Lista de IDs a buscar
+
+    Returns:
+        Stream NDJSON: una línea {"id", "status", "result" | "error"} por ID
+    """
+    ids = list(dict.fromkeys(request.ids))
+    if len(ids) > settings.BULK_SEARCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorMessages.BULK_SEARCH_TOO_MANY_IDS.format(
+                count=len(ids), max_ids=settings.BULK_SEARCH_MAX_IDS
+            )
+        )
+
+    logger.info(f"🔎 Búsqueda masiva de {len(ids)} IDs en {clientId}/{businessName}")
+
+    async def search_one(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, document_id: str):
+        document = local_index.lookup(clientId, businessName, document_id)
+        if document is not None:
+            result = DataMapper.map_to_search_response(clientId, businessName, document)
+            return {"id": document_id, "status": 200, "result": result}
+
+        async with semaphore:
+            try:
+                result = await response_cache.get_or_load(
+                    ("search", clientId, businessName, document_id),
+                    lambda: _fetch_from_ig_db_mongo(_search_url(clientId, businessName, document_id), client)
+                )
+                return {"id": document_id, "status": 200, "result": result}
+            except HTTPException as e:
+                return {"id": document_id, "status": e.status_code, "error": e.detail}
+            except httpx.TimeoutException:
+                return {"id": document_id, "status": 504, "error": "Timeout consultando ig-db-mongo"}
+            except Exception as e:
+                logger.error(f"❌ Error buscando documento {document_id}: {e}")
+                return {"id": document_id, "status": 500, "error": str(e)}
+
+    async def stream_results():
+        semaphore = asyncio.Semaphore(settings.BULK_SEARCH_CONCURRENCY)
+        limits = httpx.Limits(max_connections=settings.BULK_SEARCH_CONCURRENCY)
+
+        async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+            tasks = [asyncio.ensure_future(search_one(client, semaphore, document_id)) for document_id in ids]
+            try:
+                for next_result in asyncio.as_completed(tasks):
+                    yield json.dumps(await next_result, default=str) + "\n"
+            finally:
+                # Si el cliente corta el stream, no seguir consultando
+                for task in tasks:
+                    task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.get("/{clientId}/collections")
 async def list_collections(clientId: str):
     """
@@ -146,17 +797,13 @@ async def list_collections(clientId: str):
     try:
         url = f"{settings.IG_DB_MONGO_URL}/api/rest/v1/google-sheet/{clientId}/collections"
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.get(url)
-
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Error consultando ig-db-mongo: {response.text}"
-                )
+        return await response_cache.get_or_load(
+            ("collections", clientId),
+            lambda: _fetch_from_ig_db_mongo(url)
+        )
 
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Timeout consultando ig-db-mongo")
     except Exception as e:
@@ -177,7 +824,7 @@ async def get_task_status(task_id: str):
     Raises:
         404: Si el task_id no existe
     """
-    status = task_processor.get_task_status(task_id)
+    status = await task_processor.get_task_status(task_id)
 
     if status is None:
         raise HTTPException(
@@ -188,6 +835,94 @@ async def get_task_status(task_id: str):
     return status
 
 
+@router.get("/stats")
+async def get_task_stats(
+    client_id: Optional[str] = Query(None, description="Limitar a un cliente (por defecto todos)"),
+    since: Optional[datetime] = Query(None, description="Inicio de la ventana, ISO 8601 (por defecto until - STATS_DEFAULT_WINDOW_HOURS)"),
+    until: Optional[datetime] = Query(None, description="Fin de la ventana, ISO 8601 (por defecto ahora)"),
+    bucket_hours: float = Query(0, ge=0, description="Partir la ventana en tramos de estas horas (0 = un solo tramo)")
+):
+    """
+    Agregados de las tareas terminadas por client_id y ventana de tiempo
+
+    Para planificar capacidad y detectar regresiones: conteo por estado,
+    filas, bytes, reintentos y percentiles (p50/p95/p99) de filas/s,
+    duración y tiempos por etapa. Las fechas sin zona se toman como UTC.
+
+    Args:
+        client_id: ID del cliente
+        since: Inicio de la ventana
+        until: Fin de la ventana
+        bucket_hours: Largo de cada tramo en horas
+
+    Raises:
+        400: Si since no es anterior a until
+        404: Si el historial está deshabilitado
+    """
+    if not task_history.enabled:
+        raise HTTPException(status_code=404, detail=ErrorMessages.TASK_HISTORY_DISABLED)
+
+    until = until or datetime.now(timezone.utc)
+    until = until if until.tzinfo else until.replace(tzinfo=timezone.utc)
+    since = since or until - timedelta(hours=settings.STATS_DEFAULT_WINDOW_HOURS)
+    since = since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+    if since >= until:
+        raise HTTPException(status_code=400, detail=ErrorMessages.STATS_WINDOW_INVALID)
+
+    groups = await asyncio.to_thread(
+        task_history.stats, since.timestamp(), until.timestamp(), client_id, bucket_hours * 3600
+    )
+    return {
+        "since": since.isoformat(),
+        "until": until.isoformat(),
+        "bucket_hours": bucket_hours,
+        "groups": groups
+    }
+
+
+@router.get("/profile/{task_id}")
+async def get_task_profile(
+    task_id: str,
+    format: str = Query("pstats", description="pstats (binario) o text (reporte legible)"),
+    sort_by: str = Query("cumulative", description="Orden del reporte text: cumulative, tottime, calls"),
+    limit: int = Query(50, ge=1, le=1000, description="Funciones a mostrar en el reporte text")
+):
+    """
+    Descargar el profile de una tarea ejecutada con profiling
+
+    El archivo pstats se abre con `python -m pstats`, snakeviz, etc.
+
+    Args:
+        task_id: ID único de la tarea
+        format: pstats o text
+        sort_by: Criterio de orden para el formato text
+        limit: Cantidad de funciones para el formato text
+
+    Raises:
+        404: Si la tarea no existe o no tiene profile
+    """
+    if await task_processor.get_task_status(task_id) is None or profiler_service.get_profile(task_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No hay profile para el Task ID '{task_id}'"
+        )
+
+    if format == "text":
+        try:
+            return PlainTextResponse(profiler_service.render_text(task_id, sort_by=sort_by, limit=limit))
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"Criterio de orden inválido: {sort_by}")
+
+    if format != "pstats":
+        raise HTTPException(status_code=400, detail=f"Formato de profile no soportado: {format}")
+
+    return FileResponse(
+        profiler_service.get_profile(task_id),
+        media_type="application/octet-stream",
+        filename=f"{task_id}.pstats"
+    )
+
+
 @router.get("/health")
 async def health_check():
     """
@@ -199,10 +934,21 @@ async def health_check():
         status: Estado del servicio
         service: Nombre del servicio
         ig_db_mongo_url: URL del servicio externo
+        cache: Métricas del cache de búsquedas
+        local_index: Métricas del índice local
+        admission: Capacidad disponible (bytes en proceso, tareas en cola, RSS)
+        rate_limit: Límites de envío a ig-db-mongo y esperas por cliente
+        ig_db_mongo_circuit: Estado del circuit breaker hacia ig-db-mongo
     """
+    await admission_controller.refresh_queue_depth()
     return {
-        "status": "healthy",
+        "status": "draining" if admission_controller.draining else "healthy",
         "service": "ms-client-bulk-load",
         "ig_db_mongo_url": settings.IG_DB_MONGO_URL,
-        "version": settings.API_VERSION
+        "version": settings.API_VERSION,
+        "cache": response_cache.stats(),
+        "local_index": local_index.stats(),
+        "admission": admission_controller.headroom(),
+        "rate_limit": rate_limiter.stats(),
+        "ig_db_mongo_circuit": mongo_breaker.stats()
     }
\ No newline at end of file
@@ -8,9 +8,91 @@ class Settings(BaseSettings):
     # ig-db-mongo service
     IG_DB_MONGO_URL: str = "http://localhost:8087"
 
+    # Conexión directa a MongoDB (MongoService)
+    MONGODB_URI: str = "mongodb://localhost:27017"
+    MONGODB_DATABASE: str = "bulk_load"
+
     # Procesamiento
     BATCH_SIZE: int = 10000
     MAX_FILE_SIZE_MB: int = 100
+    CSV_ENGINE: str = "stdlib"  # stdlib | pandas-c | pyarrow
+    EXCEL_ENGINE: str = "stream"  # stream (.xlsx en streaming) | pandas
+    INTERN_MAX_VALUES: int = 1000  # Valores distintos por columna que se comparten (0 = sin interning)
+    LOAD_MODE: str = "insert"  # insert | upsert | replace
+    TYPE_COERCION_ENABLED: bool = False  # Inferir tipos por columna (si no, todo string)
+    TYPE_INFERENCE_SAMPLE_ROWS: int = 1000  # Filas del primer batch usadas para inferir
+
+    # Subidas por partes (/uploads): partes en disco, CSV/NDJSON se procesan a medida que llegan
+    UPLOAD_DIR: str = "/tmp/ms-client-bulk-load/uploads"
+    UPLOAD_MAX_SIZE_MB: int = 10240  # Total de una subida procesada en streaming
+    UPLOAD_MAX_PART_SIZE_MB: int = 64
+    UPLOAD_MAX_PARTS: int = 10000
+    UPLOAD_EARLY_START: bool = True  # Empezar a cargar CSV/NDJSON con las primeras partes
+    UPLOAD_IDLE_TIMEOUT_SECONDS: float = 3600.0  # Sin partes nuevas en este plazo, la subida expira
+
+    # Control de admisión (429/503 + Retry-After)
+    ADMISSION_MAX_INFLIGHT_MB: int = 1024  # Bytes de archivos retenidos en memoria
+    ADMISSION_MAX_QUEUED_TASKS: int = 50  # Tareas aceptadas sin terminar
+    ADMISSION_MAX_RSS_MB: int = 0  # RSS del proceso (0 = sin límite)
+    ADMISSION_RETRY_AFTER_SECONDS: int = 30
+
+    # Cache de búsquedas / colecciones
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: float = 30.0
+    CACHE_MAX_ENTRIES: int = 10000
+
+    # Búsqueda masiva de IDs
+    BULK_SEARCH_MAX_IDS: int = 10000
+    BULK_SEARCH_CONCURRENCY: int = 20
+
+    # Índice local de búsquedas por _id
+    LOCAL_INDEX_ENABLED: bool = False
+    LOCAL_INDEX_DIR: str = "/tmp/ms-client-bulk-load/index"
+    LOCAL_INDEX_MAX_SEGMENTS: int = 8  # Segmentos (cargas) por colección
+
+    # Modo de ejecución: inprocess (BackgroundTasks) | queue (multi-worker)
+    WORKER_MODE: str = "inprocess"
+    QUEUE_BACKEND: str = "sqlite"
+    QUEUE_DB_PATH: str = "/tmp/ms-client-bulk-load/queue.db"
+    SPOOL_DIR: str = "/tmp/ms-client-bulk-load/spool"
+    QUEUE_WORKER_CONCURRENCY: int = 1  # Tareas simultáneas por proceso
+    QUEUE_POLL_INTERVAL_SECONDS: float = 1.0
+    QUEUE_LEASE_SECONDS: float = 120.0  # Sin heartbeat en este plazo, otra réplica la retoma
+    QUEUE_MAX_ATTEMPTS: int = 3
+
+    # Circuit breaker y reintentos hacia ig-db-mongo
+    IG_DB_MONGO_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    CIRCUIT_WINDOW_SIZE: int = 20  # Últimas llamadas evaluadas
+    CIRCUIT_MIN_CALLS: int = 5  # Mínimo de llamadas en la ventana para abrir
+    CIRCUIT_FAILURE_RATE: float = 0.5  # Tasa de error (o lentitud) que abre el circuito
+    CIRCUIT_SLOW_CALL_SECONDS: float = 30.0  # Llamadas más lentas cuentan como error
+    CIRCUIT_OPEN_SECONDS: float = 5.0  # Primera apertura; se duplica en cada reapertura
+    CIRCUIT_MAX_OPEN_SECONDS: float = 30.0
+    CIRCUIT_MAX_PAUSE_SECONDS: float = 300.0  # Pausa máxima de una carga con el circuito abierto
+    BULK_IMPORT_MAX_RETRIES: int = 3
+    BULK_IMPORT_RETRY_BACKOFF_SECONDS: float = 1.0  # Base del backoff exponencial
+
+    # Rate limiting de bulk-import hacia ig-db-mongo (0 = sin límite)
+    RATE_LIMIT_CLIENT_ROWS_PER_SECOND: float = 0
+    RATE_LIMIT_CLIENT_MB_PER_SECOND: float = 0
+    RATE_LIMIT_GLOBAL_ROWS_PER_SECOND: float = 0
+    RATE_LIMIT_GLOBAL_MB_PER_SECOND: float = 0
+    RATE_LIMIT_BURST_SECONDS: float = 1.0  # Ráfaga permitida = límite * segundos
+
+    # Apagado ordenado
+    SHUTDOWN_DRAIN_SECONDS: float = 20.0  # Espera a que terminen las tareas en curso
+    SHUTDOWN_CHECKPOINT_GRACE_SECONDS: float = 5.0  # Espera al batch en vuelo antes de cancelar
+    CHECKPOINT_DIR: str = "/tmp/ms-client-bulk-load/checkpoints"
+
+    # Profiling
+    PROFILING_ENABLED: bool = False  # Perfilar todas las tareas
+    PROFILES_DIR: str = "/tmp/ms-client-bulk-load/profiles"
+
+    # Historial de tareas terminadas (GET /stats)
+    TASK_HISTORY_ENABLED: bool = True
+    TASK_HISTORY_DB_PATH: str = "/tmp/ms-client-bulk-load/history.db"
+    TASK_HISTORY_RETENTION_DAYS: int = 90  # 0 = conservar todo
+    STATS_DEFAULT_WINDOW_HOURS: float = 24.0
 
     # API
     API_VERSION: str = "v1"
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Literal, Optional
 
 
 class UploadRequest(BaseModel):
@@ -17,4 +17,35 @@ class UploadResponse(BaseModel):
     collection_name: str
     filename: str
     total_rows: int
-    processing_time_seconds: float
\ No newline at end of file
+    processing_time_seconds: float
+
+
+class BulkSearchRequest(BaseModel):
+    """Request para buscar múltiples documentos por ID"""
+    ids: List[str] = Field(..., min_length=1, description="IDs de los documentos a buscar")
+
+
+class CoercionSpec(BaseModel):
+    """Conversión de tipos por columna para una carga"""
+    infer: bool = Field(False, description="Inferir el tipo de cada columna a partir de una muestra")
+    column_types: Dict[str, Literal["string", "int", "float", "bool", "datetime"]] = Field(
+        default_factory=dict,
+        description="Tipos forzados por columna (tienen prioridad sobre la inferencia)"
+    )
+
+
+class ColumnSpec(BaseModel):
+    """Selección y renombrado de columnas aplicado al parsear"""
+    include: Optional[List[str]] = Field(None, description="Columnas a conservar (por defecto todas)")
+    exclude: List[str] = Field(default_factory=list, description="Columnas a descartar")
+    rename: Dict[str, str] = Field(default_factory=dict, description="Nombre original -> nombre en el documento")
+    id_column: Optional[str] = Field(None, description="Columna que se usa como _id (por defecto la primera)")
+
+    @field_validator("rename")
+    @classmethod
+    def validate_rename(cls, rename: Dict[str, str]) -> Dict[str, str]:
+        if "_id" in rename.values():
+            raise ValueError("no se puede renombrar a _id; use id_column")
+        if len(set(rename.values())) != len(rename):
+            raise ValueError("dos columnas no pueden renombrarse al mismo nombre")
+        return rename
@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 import logging
 import sys
 from app.api.routes import router
+from app.services.task_processor import task_processor
 from app.config.settings import get_settings
 
 # Logging a stdout (para evitar logs en rojo)
@@ -23,9 +24,14 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Iniciando MS Client Bulk Load")
     logger.info(f"🔗 ig-db-mongo URL: {settings.IG_DB_MONGO_URL}")
+    if settings.WORKER_MODE == "queue":
+        task_processor.start_queue_workers()
+    else:
+        task_processor.resume_checkpoints()
     yield
-    # Shutdown
+    # Shutdown: dejar de aceptar cargas, drenar y guardar checkpoints
     logger.info("🛑 Cerrando MS Client Bulk Load")
+    await task_processor.shutdown()
 
 
 app = FastAPI(
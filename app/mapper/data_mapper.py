@@ -1,8 +1,10 @@
 """
 Mapper para transformaciones de datos
 """
-from typing import Dict, Any, List
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 import logging
+from app.utils.constants import LoadModes
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,22 @@ class DataMapper:
             "data": documents
         }
 
+    @staticmethod
+    def to_extended_json(value: Any) -> Any:
+        """
+        Serializar valores no nativos de JSON (default de json.dumps)
+        Las fechas van como MongoDB Extended JSON: {"$date": "...Z"}
+
+        Args:
+            value: Valor que json no sabe serializar
+
+        Returns:
+            Representación serializable
+        """
+        if isinstance(value, datetime):
+            return {"$date": value.isoformat(timespec="milliseconds") + "Z"}
+        raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
     @staticmethod
     def build_collection_name(client_id: str, business_name: str) -> str:
         """
@@ -59,13 +77,45 @@ class DataMapper:
     def map_to_bulk_import_request(
             client_id: str,
             business_name: str,
-            documents: List[Dict[str, Any]]
+            documents: List[Dict[str, Any]],
+            load_mode: str = LoadModes.INSERT,
+            load_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Mapear datos al formato de BulkImportRequest
+        Un insert envía el payload de siempre; loadMode solo va en upsert/replace
+        y loadId identifica la colección en staging de una carga replace
         """
-        return {
+        request = {
             "clientId": client_id,
             "businessName": business_name,
             "data": documents
-        }
\ No newline at end of file
+        }
+        if load_mode != LoadModes.INSERT:
+            request["loadMode"] = load_mode
+        if load_id is not None:
+            request["loadId"] = load_id
+        return request
+
+    @staticmethod
+    def map_to_load_request(client_id: str, business_name: str, load_id: str) -> Dict[str, Any]:
+        """
+        Mapear la confirmación/cancelación de una carga replace
+        """
+        return {
+            "clientId": client_id,
+            "businessName": business_name,
+            "loadId": load_id
+        }
+
+    @staticmethod
+    def map_to_search_response(client_id: str, business_name: str, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Mapear un documento del índice local a la respuesta de búsqueda de ig-db-mongo
+        Así un ID resuelto localmente o en ig-db-mongo devuelve el mismo JSON
+        """
+        return {
+            "clientId": client_id,
+            "businessName": business_name,
+            "data": document
+        }
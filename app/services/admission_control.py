@@ -0,0 +1,163 @@
+"""
+Admission Control - Control de admisión de cargas según memoria y cola
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+from app.config.settings import get_settings
+from app.services.circuit_breaker import OPEN, mongo_breaker
+from app.utils.constants import ErrorMessages
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """
+    RSS actual del proceso en MB (Linux, /proc/self/statm)
+
+    Returns:
+        RSS en MB o None si no se puede leer
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class AdmissionController:
+    """
+    Lleva la cuenta de bytes en memoria y tareas pendientes, y decide si una
+    carga nueva se acepta o se rechaza con 429 / 503 + Retry-After
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.max_in_flight_bytes = self.settings.ADMISSION_MAX_INFLIGHT_MB * MB
+        self.max_queued_tasks = self.settings.ADMISSION_MAX_QUEUED_TASKS
+        self.max_rss_mb = self.settings.ADMISSION_MAX_RSS_MB
+        self.retry_after_seconds = self.settings.ADMISSION_RETRY_AFTER_SECONDS
+        # task_id -> bytes retenidos en memoria hasta que la tarea termina
+        self.reservations: Dict[str, int] = {}
+        # Modo queue: profundidad de la cola compartida, leída fuera del event loop
+        self.queue_depth_provider = None
+        self.queue_depth = 0
+        # Activado al apagar: no se admiten cargas nuevas mientras se drenan las actuales
+        self.draining = False
+
+    @property
+    def in_flight_bytes(self) -> int:
+        return sum(self.reservations.values())
+
+    async def refresh_queue_depth(self):
+        """Releer la profundidad de la cola compartida en un thread (modo queue)"""
+        if self.queue_depth_provider is not None:
+            self.queue_depth = await asyncio.to_thread(self.queue_depth_provider)
+
+    def queued_tasks(self) -> int:
+        """Tareas aceptadas y no terminadas (en modo queue, última profundidad leída de la cola)"""
+        if self.queue_depth_provider is not None:
+            return self.queue_depth
+        return len(self.reservations)
+
+    def check(self, incoming_bytes: int) -> Optional[Tuple[int, str]]:
+        """
+        Evaluar si se admite una carga nueva
+
+        Args:
+            incoming_bytes: Tamaño de la carga (0 si se desconoce, ej. streaming)
+
+        Returns:
+            None si se admite, o (status_code, motivo) si se rechaza
+        """
+        if self.draining:
+            return 503, ErrorMessages.SHUTTING_DOWN
+
+        # Con ig-db-mongo caído las cargas solo se acumularían en memoria
+        if mongo_breaker.state == OPEN:
+            return 503, ErrorMessages.UPSTREAM_UNAVAILABLE
+
+        if self.max_rss_mb > 0:
+            rss_mb = current_rss_mb()
+            if rss_mb is not None and rss_mb >= self.max_rss_mb:
+                return 503, ErrorMessages.ADMISSION_MEMORY.format(rss=rss_mb, limit=self.max_rss_mb)
+
+        if self.queued_tasks() >= self.max_queued_tasks:
+            return 429, ErrorMessages.ADMISSION_QUEUE_FULL.format(limit=self.max_queued_tasks)
+
+        if self.in_flight_bytes + incoming_bytes > self.max_in_flight_bytes:
+            return 429, ErrorMessages.ADMISSION_IN_FLIGHT.format(
+                limit=self.settings.ADMISSION_MAX_INFLIGHT_MB
+            )
+
+        return None
+
+    def try_admit(self, reservation_id: str, incoming_bytes: int) -> Optional[Tuple[int, str]]:
+        """
+        Evaluar y, si se admite, reservar en el mismo paso (sin awaits entre medio)
+
+        Args:
+            reservation_id: Clave de la reserva
+            incoming_bytes: Tamaño de la carga
+
+        Returns:
+            None si se admite, o (status_code, motivo) si se rechaza
+        """
+        rejection = self.check(incoming_bytes)
+        if rejection is None:
+            self.reserve(reservation_id, incoming_bytes)
+        return rejection
+
+    def reassign(self, old_id: str, new_id: str):
+        """
+        Mover una reserva a otra clave (ej. de la subida al task_id)
+
+        Args:
+            old_id: Clave actual
+            new_id: Clave nueva
+        """
+        if old_id in self.reservations:
+            self.reservations[new_id] = self.reservations.pop(old_id)
+
+    def reserve(self, task_id: str, nbytes: int):
+        """
+        Registrar los bytes que retiene una tarea aceptada
+
+        Args:
+            task_id: ID de la tarea
+            nbytes: Bytes retenidos en memoria
+        """
+        self.reservations[task_id] = nbytes
+
+    def release(self, task_id: str):
+        """
+        Liberar la reserva de una tarea (idempotente)
+
+        Args:
+            task_id: ID de la tarea
+        """
+        self.reservations.pop(task_id, None)
+
+    def headroom(self) -> Dict[str, Any]:
+        """Capacidad disponible para /health"""
+        rss_mb = current_rss_mb()
+        queued = self.queued_tasks()
+
+        return {
+            "accepting": self.check(0) is None,
+            "draining": self.draining,
+            "in_flight_mb": round(self.in_flight_bytes / MB, 2),
+            "max_in_flight_mb": self.settings.ADMISSION_MAX_INFLIGHT_MB,
+            "queued_tasks": queued,
+            "max_queued_tasks": self.max_queued_tasks,
+            "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+            "max_rss_mb": self.max_rss_mb or None
+        }
+
+
+# Instancia global
+admission_controller = AdmissionController()
@@ -0,0 +1,148 @@
+"""
+Cache Service - Cache TTL + LRU con coalescing de requests concurrentes
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Cache en memoria para respuestas de ig-db-mongo
+
+    Es por proceso: invalidate_collection solo limpia el cache del worker
+    que terminó la carga; en los demás las entradas viven hasta su TTL.
+
+    - TTL por entrada y desalojo LRU al superar max_entries
+    - Single-flight: lookups concurrentes de la misma clave comparten una
+      sola llamada upstream
+    - Solo se cachean cargas exitosas; las excepciones se propagan a todos
+      los que esperaban esa clave
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[Hashable, ...], asyncio.Task] = {}
+        # Se incrementa en cada invalidación: cargas iniciadas antes no se guardan
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_load(
+            self,
+            key: Tuple[Hashable, ...],
+            loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Obtener un valor del cache o cargarlo una sola vez
+
+        Args:
+            key: Clave (tupla; el prefijo se usa para invalidar)
+            loader: Función asíncrona que obtiene el valor upstream
+
+        Returns:
+            Valor cacheado o recién cargado
+        """
+        if not self.enabled:
+            return await loader()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            # La generación se toma al pedir la carga: la tarea puede empezar después de una invalidación
+            task = asyncio.ensure_future(self._load(key, loader, self._generation))
+            self._in_flight[key] = task
+        else:
+            self.coalesced += 1
+
+        # shield: si un cliente se desconecta, la carga compartida sigue
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await loader()
+            if generation == self._generation:
+                self._store(key, value)
+            return value
+        finally:
+            if self._in_flight.get(key) is asyncio.current_task():
+                del self._in_flight[key]
+
+    def _store(self, key: Tuple[Hashable, ...], value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_prefix(self, prefix: Tuple[Hashable, ...]) -> int:
+        """
+        Invalidar todas las entradas cuya clave empieza con prefix
+
+        Args:
+            prefix: Prefijo de la clave
+
+        Returns:
+            Cantidad de entradas eliminadas
+        """
+        self._generation += 1
+
+        keys = [key for key in self._entries if key[:len(prefix)] == prefix]
+        for key in keys:
+            del self._entries[key]
+
+        # Las cargas en curso ya no se comparten con requests nuevas
+        for key in [key for key in self._in_flight if key[:len(prefix)] == prefix]:
+            del self._in_flight[key]
+
+        return len(keys)
+
+    def invalidate_collection(self, client_id: str, business_name: str):
+        """
+        Invalidar lo cacheado de una colección tras una carga
+
+        Args:
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+        """
+        removed = self.invalidate_prefix(("search", client_id, business_name))
+        removed += self.invalidate_prefix(("collections", client_id))
+        logger.info(f"🧹 Cache invalidado para {client_id}/{business_name} ({removed} entradas)")
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del cache"""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced
+        }
+
+
+_settings = get_settings()
+
+# Instancia global
+response_cache = ResponseCache(
+    ttl_seconds=_settings.CACHE_TTL_SECONDS,
+    max_entries=_settings.CACHE_MAX_ENTRIES,
+    enabled=_settings.CACHE_ENABLED
+)
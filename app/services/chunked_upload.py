@@ -0,0 +1,366 @@
+"""
+Chunked Upload - Subidas por partes reanudables
+
+Cada subida vive en un directorio propio:
+
+    <UPLOAD_DIR>/<upload_id>/upload.json     metadatos (cliente, archivo, opciones)
+    <UPLOAD_DIR>/<upload_id>/000001.part     partes numeradas, escritas de forma atómica
+    <UPLOAD_DIR>/<upload_id>/complete.json   total de partes, al completar
+
+Una parte se escribe en un temporal y se renombra al terminar, así una
+conexión cortada no deja partes a medias: el cliente consulta qué partes
+llegaron y reenvía solo las que faltan. iter_parts lee las partes en orden
+a medida que aparecen, para procesar el archivo antes de que termine la subida.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.config.settings import get_settings
+from app.utils.constants import ErrorMessages
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+META_FILE = "upload.json"
+COMPLETE_FILE = "complete.json"
+# Bloques de lectura de las partes: csv_stream parsea más rápido con bloques de cientos de KB que de varios MB
+READ_CHUNK_SIZE = 256 * 1024
+# Revisión del disco mientras se espera una parte (otra réplica puede escribirla)
+PART_POLL_SECONDS = 1.0
+
+
+class UploadNotFoundError(LookupError):
+    """La subida no existe, expiró o fue cancelada"""
+
+
+class UploadConflictError(Exception):
+    """La operación no es válida en el estado actual de la subida"""
+
+
+def _part_name(part_number: int) -> str:
+    return f"{part_number:06d}.part"
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+class ChunkedUploadService:
+    """Partes de subidas en disco y lectura en orden para el procesamiento"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.upload_dir = Path(self.settings.UPLOAD_DIR)
+        self.max_part_bytes = self.settings.UPLOAD_MAX_PART_SIZE_MB * MB
+        # upload_id -> evento para despertar a iter_parts al llegar una parte
+        self._signals: Dict[str, asyncio.Event] = {}
+        # upload_id -> última parte entregada por iter_parts
+        self._consumed: Dict[str, int] = {}
+
+    def _dir(self, upload_id: str) -> Path:
+        """Directorio de una subida; el ID debe ser un UUID (viene de la URL)"""
+        try:
+            uuid.UUID(upload_id)
+        except ValueError:
+            raise UploadNotFoundError(upload_id)
+        return self.upload_dir / upload_id
+
+    def _signal(self, upload_id: str):
+        event = self._signals.get(upload_id)
+        if event is not None:
+            event.set()
+
+    def create(self, upload_id: str, meta: Dict[str, Any]):
+        """
+        Registrar una subida nueva
+
+        Args:
+            upload_id: ID de la subida (el task_id de la carga)
+            meta: Cliente, archivo y opciones de la carga
+        """
+        upload_dir = self._dir(upload_id)
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(upload_dir / META_FILE, {**meta, "created_at": time.time()})
+        logger.info(f"📮 Subida por partes creada: {upload_id} ({meta.get('filename')})")
+
+    def get_meta(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Metadatos de una subida
+
+        Raises:
+            UploadNotFoundError: Si la subida no existe
+        """
+        try:
+            return json.loads((self._dir(upload_id) / META_FILE).read_text())
+        except (OSError, ValueError):
+            raise UploadNotFoundError(upload_id)
+
+    def list_parts(self, upload_id: str) -> Dict[int, int]:
+        """
+        Partes recibidas y su tamaño
+
+        Returns:
+            Número de parte -> bytes
+        """
+        return {
+            int(path.stem): path.stat().st_size
+            for path in self._dir(upload_id).glob("*.part")
+        }
+
+    def total_parts(self, upload_id: str) -> Optional[int]:
+        """Total de partes si la subida se completó, si no None"""
+        try:
+            return json.loads((self._dir(upload_id) / COMPLETE_FILE).read_text())["total_parts"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def status(self, upload_id: str) -> Dict[str, Any]:
+        """
+        Estado de una subida para reanudarla
+
+        Raises:
+            UploadNotFoundError: Si la subida no existe
+        """
+        meta = self.get_meta(upload_id)
+        parts = self.list_parts(upload_id)
+        return {
+            "upload_id": upload_id,
+            "filename": meta["filename"],
+            "streaming": meta["streaming"],
+            "parts": [{"part_number": n, "size": parts[n]} for n in sorted(parts)],
+            "received_bytes": sum(parts.values()),
+            "total_parts": self.total_parts(upload_id),
+            "processed_parts": self._consumed.get(upload_id, 0)
+        }
+
+    async def write_part(self, upload_id: str, part_number: int, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """
+        Guardar una parte a medida que llega
+
+        Reenviar una parte ya guardada con el mismo contenido no hace nada;
+        con otro contenido la reemplaza, salvo que ya se haya procesado.
+
+        Args:
+            upload_id: ID de la subida
+            part_number: Número de parte (desde 1)
+            chunks: Cuerpo de la request
+
+        Returns:
+            part_number, size y sha256 de la parte guardada
+
+        Raises:
+            UploadNotFoundError: Si la subida no existe
+            UploadConflictError: Si la subida ya se completó o la parte ya se procesó
+            ValueError: Si el número o el tamaño de la parte no son válidos
+        """
+        meta = self.get_meta(upload_id)
+        if self.total_parts(upload_id) is not None:
+            raise UploadConflictError(ErrorMessages.UPLOAD_ALREADY_COMPLETED)
+
+        max_parts = self.settings.UPLOAD_MAX_PARTS
+        if not 1 <= part_number <= max_parts:
+            raise ValueError(ErrorMessages.UPLOAD_PART_NUMBER_INVALID.format(part_number=part_number, max_parts=max_parts))
+
+        upload_dir = self._dir(upload_id)
+        part_path = upload_dir / _part_name(part_number)
+        # Temporal propio por request: un reintento concurrente no pisa al otro
+        tmp_path = upload_dir / f"{_part_name(part_number)}.{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            try:
+                f = open(tmp_path, "wb")
+            except FileNotFoundError:
+                # Cancelada o expirada después de leer los metadatos
+                raise UploadNotFoundError(upload_id)
+
+            with f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_part_bytes:
+                        raise ValueError(ErrorMessages.UPLOAD_PART_TOO_LARGE.format(max_size=self.settings.UPLOAD_MAX_PART_SIZE_MB))
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            other_parts = sum(s for n, s in self.list_parts(upload_id).items() if n != part_number)
+            max_size_mb = self.settings.UPLOAD_MAX_SIZE_MB if meta["streaming"] else self.settings.MAX_FILE_SIZE_MB
+            if other_parts + size > max_size_mb * MB:
+                raise ValueError(ErrorMessages.UPLOAD_TOO_LARGE.format(max_size=max_size_mb))
+
+            sha256 = digest.hexdigest()
+            if part_path.exists():
+                if await asyncio.to_thread(self._file_sha256, part_path) == sha256:
+                    # Reintento de una parte que ya había llegado completa
+                    return {"part_number": part_number, "size": size, "sha256": sha256}
+                if self._consumed.get(upload_id, 0) >= part_number:
+                    raise UploadConflictError(ErrorMessages.UPLOAD_PART_CONFLICT.format(part_number=part_number))
+
+            os.replace(tmp_path, part_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        self._signal(upload_id)
+        logger.info(f"🧩 Subida {upload_id}: parte {part_number} ({size / MB:.2f}MB)")
+        return {"part_number": part_number, "size": size, "sha256": sha256}
+
+    @staticmethod
+    def _file_sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def complete(self, upload_id: str, total_parts: int) -> int:
+        """
+        Marcar la subida como completa
+
+        Args:
+            upload_id: ID de la subida
+            total_parts: Cantidad de partes del archivo (1..total_parts)
+
+        Returns:
+            Tamaño total del archivo en bytes
+
+        Raises:
+            UploadNotFoundError: Si la subida no existe
+            UploadConflictError: Si la subida ya se completó
+            ValueError: Si faltan partes o sobran partes posteriores a total_parts
+        """
+        self.get_meta(upload_id)
+        if self.total_parts(upload_id) is not None:
+            raise UploadConflictError(ErrorMessages.UPLOAD_ALREADY_COMPLETED)
+
+        parts = self.list_parts(upload_id)
+        missing = [n for n in range(1, total_parts + 1) if n not in parts]
+        if missing or total_parts < 1:
+            raise ValueError(ErrorMessages.UPLOAD_PARTS_MISSING.format(parts=missing[:20] or [1]))
+        extra = sorted(n for n in parts if n > total_parts)
+        if extra:
+            raise ValueError(ErrorMessages.UPLOAD_PARTS_EXTRA.format(total_parts=total_parts, parts=extra[:20]))
+
+        _write_json(self._dir(upload_id) / COMPLETE_FILE, {"total_parts": total_parts})
+        self._signal(upload_id)
+        total_bytes = sum(parts.values())
+        logger.info(f"📬 Subida {upload_id} completa: {total_parts} partes, {total_bytes / MB:.2f}MB")
+        return total_bytes
+
+    async def iter_parts(self, upload_id: str) -> AsyncIterator[bytes]:
+        """
+        Leer las partes en orden a medida que llegan, hasta la última
+
+        Args:
+            upload_id: ID de la subida
+
+        Yields:
+            Bloques de hasta READ_CHUNK_SIZE bytes
+
+        Raises:
+            ValueError: Si la subida se cancela o pasa UPLOAD_IDLE_TIMEOUT_SECONDS sin partes nuevas
+        """
+        upload_dir = self._dir(upload_id)
+        event = self._signals.setdefault(upload_id, asyncio.Event())
+        idle_timeout = self.settings.UPLOAD_IDLE_TIMEOUT_SECONDS
+        part_number = 1
+
+        try:
+            while True:
+                total_parts = self.total_parts(upload_id)
+                if total_parts is not None and part_number > total_parts:
+                    return
+
+                part_path = upload_dir / _part_name(part_number)
+                waited = 0.0
+                while not part_path.exists():
+                    if not upload_dir.exists():
+                        raise ValueError(ErrorMessages.UPLOAD_ABORTED)
+                    if waited >= idle_timeout:
+                        raise ValueError(ErrorMessages.UPLOAD_IDLE_TIMEOUT.format(seconds=idle_timeout))
+                    event.clear()
+                    try:
+                        await asyncio.wait_for(event.wait(), PART_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        waited += PART_POLL_SECONDS
+                    # complete.json pudo llegar mientras se esperaba
+                    total_parts = self.total_parts(upload_id)
+                    if total_parts is not None and part_number > total_parts:
+                        return
+
+                # Desde aquí la parte no se puede reemplazar con otro contenido
+                self._consumed[upload_id] = part_number
+                with open(part_path, "rb") as f:
+                    while True:
+                        block = await asyncio.to_thread(f.read, READ_CHUNK_SIZE)
+                        if not block:
+                            break
+                        yield block
+
+                part_number += 1
+        finally:
+            self._signals.pop(upload_id, None)
+
+    def read_all(self, upload_id: str) -> bytes:
+        """Leer el archivo completo (formatos que no se procesan en streaming)"""
+        upload_dir = self._dir(upload_id)
+        total_parts = self.total_parts(upload_id) or 0
+        return b"".join(
+            (upload_dir / _part_name(n)).read_bytes() for n in range(1, total_parts + 1)
+        )
+
+    def copy_to(self, upload_id: str, destination: Path):
+        """Concatenar las partes en un archivo sin cargarlas en memoria"""
+        upload_dir = self._dir(upload_id)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with open(destination, "wb") as out:
+            for n in range(1, (self.total_parts(upload_id) or 0) + 1):
+                with open(upload_dir / _part_name(n), "rb") as part:
+                    shutil.copyfileobj(part, out, READ_CHUNK_SIZE)
+
+    def remove(self, upload_id: str):
+        """Borrar la subida y sus partes (despierta a un iter_parts en espera)"""
+        shutil.rmtree(self._dir(upload_id), ignore_errors=True)
+        self._consumed.pop(upload_id, None)
+        self._signal(upload_id)
+
+    def remove_expired(self) -> List[str]:
+        """
+        Borrar las subidas sin actividad en UPLOAD_IDLE_TIMEOUT_SECONDS
+
+        Las que se están procesando en este proceso expiran solas en iter_parts.
+
+        Returns:
+            IDs de las subidas borradas
+        """
+        if not self.upload_dir.is_dir():
+            return []
+
+        cutoff = time.time() - self.settings.UPLOAD_IDLE_TIMEOUT_SECONDS
+        expired = []
+        for upload_dir in self.upload_dir.iterdir():
+            if upload_dir.name in self._signals or not upload_dir.is_dir():
+                continue
+            try:
+                last_activity = max(p.stat().st_mtime for p in [upload_dir, *upload_dir.iterdir()])
+            except OSError:
+                continue
+            if last_activity < cutoff:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+                expired.append(upload_dir.name)
+
+        if expired:
+            logger.info(f"🧹 {len(expired)} subidas por partes expiradas eliminadas")
+        return expired
+
+
+# Instancia global
+chunked_uploads = ChunkedUploadService()
@@ -0,0 +1,193 @@
+"""
+Circuit Breaker - Corta las llamadas a un servicio caído y las retoma con sondeos
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto: la llamada se rechaza sin intentarla"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} no disponible (circuito abierto)")
+        self.retry_after = retry_after
+
+
+class CallOutcome:
+    """Resultado de una llamada protegida; failed=True cuenta como error (ej. HTTP 5xx)"""
+
+    def __init__(self):
+        self.failed = False
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por tasa de error y latencia
+
+    - closed: deja pasar todo; si en la ventana de las últimas llamadas la tasa
+      de error (incluidas las lentas) supera el umbral, abre el circuito.
+    - open: rechaza al instante durante un tiempo que se duplica en cada
+      apertura consecutiva (hasta CIRCUIT_MAX_OPEN_SECONDS).
+    - half_open: deja pasar una sola llamada de sondeo; si va bien cierra,
+      si falla vuelve a abrir.
+    """
+
+    def __init__(self, name: str):
+        self.settings = get_settings()
+        self.name = name
+        self.min_calls = self.settings.CIRCUIT_MIN_CALLS
+        self.failure_rate = self.settings.CIRCUIT_FAILURE_RATE
+        self.slow_call_seconds = self.settings.CIRCUIT_SLOW_CALL_SECONDS
+        # Últimas llamadas: True = error o lenta
+        self.window = deque(maxlen=self.settings.CIRCUIT_WINDOW_SIZE)
+        self.opened_at = 0.0
+        self.open_until = 0.0
+        self.consecutive_opens = 0
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self._is_open = False
+
+    @property
+    def state(self) -> str:
+        if not self._is_open:
+            return CLOSED
+        if time.monotonic() < self.open_until:
+            return OPEN
+        return HALF_OPEN
+
+    @property
+    def is_closed(self) -> bool:
+        return not self._is_open
+
+    def retry_after(self) -> float:
+        """Segundos hasta el próximo sondeo (0 si ya se puede intentar)"""
+        return max(0.0, self.open_until - time.monotonic()) if self._is_open else 0.0
+
+    def allow_request(self) -> Optional[bool]:
+        """
+        Decidir si una llamada puede intentarse; en half_open reserva el sondeo
+
+        Returns:
+            None si se rechaza, False si es una llamada normal, True si es el sondeo
+        """
+        state = self.state
+        if state == CLOSED:
+            return False
+        if state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return None
+
+    @contextmanager
+    def call(self) -> Iterator[CallOutcome]:
+        """
+        Proteger una llamada: rechaza si el circuito está abierto y registra el resultado
+
+        Una excepción dentro del bloque cuenta como error; para marcar como
+        error una respuesta recibida, asignar outcome.failed = True.
+
+        Raises:
+            CircuitOpenError: Si el circuito no admite la llamada
+        """
+        is_probe = self.allow_request()
+        if is_probe is None:
+            raise CircuitOpenError(self.name, self.retry_after())
+
+        outcome = CallOutcome()
+        start = time.perf_counter()
+        try:
+            yield outcome
+        except Exception:
+            self._record(failed=True, is_probe=is_probe)
+            raise
+        except BaseException:
+            # Cancelación: no dice nada de la salud del servicio, solo liberar el sondeo
+            if is_probe:
+                self.probe_in_flight = False
+            raise
+
+        latency = time.perf_counter() - start
+        self._record(failed=outcome.failed or latency >= self.slow_call_seconds, is_probe=is_probe)
+
+    def _record(self, failed: bool, is_probe: bool):
+        """Registrar el resultado de una llamada y transicionar de estado"""
+        if is_probe:
+            self.probe_in_flight = False
+            if failed:
+                self._open()
+            else:
+                logger.info(f"🟢 Circuito {self.name}: cerrado tras sondeo exitoso")
+                self._is_open = False
+                self.consecutive_opens = 0
+                self.window.clear()
+            return
+
+        if self._is_open:
+            # Llamada iniciada antes de abrir: no cambia el estado
+            return
+
+        self.window.append(failed)
+        if len(self.window) >= self.min_calls and sum(self.window) / len(self.window) >= self.failure_rate:
+            self._open()
+
+    def _open(self):
+        """Abrir el circuito con espera exponencial"""
+        self.consecutive_opens += 1
+        self.times_opened += 1
+        open_seconds = min(
+            self.settings.CIRCUIT_OPEN_SECONDS * 2 ** (self.consecutive_opens - 1),
+            self.settings.CIRCUIT_MAX_OPEN_SECONDS
+        )
+        self._is_open = True
+        self.opened_at = time.monotonic()
+        self.open_until = self.opened_at + open_seconds
+        self.window.clear()
+        logger.warning(f"🔴 Circuito {self.name}: abierto por {open_seconds:.1f}s")
+
+    async def wait_until_available(self, max_wait: float) -> bool:
+        """
+        Pausar hasta que el circuito admita llamadas (cerrado o sondeo libre)
+
+        Args:
+            max_wait: Espera máxima en segundos
+
+        Returns:
+            True si se puede intentar la llamada, False si se agotó la espera
+        """
+        deadline = time.monotonic() + max_wait
+        while True:
+            state = self.state
+            if state == CLOSED or (state == HALF_OPEN and not self.probe_in_flight):
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Con el sondeo en curso se consulta seguido para seguir en cuanto cierre
+            step = self.retry_after() if state == OPEN else 0.2
+            await asyncio.sleep(min(max(step, 0.05), remaining))
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado del circuito para /health"""
+        return {
+            "state": self.state,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "recent_failure_rate": round(sum(self.window) / len(self.window), 2) if self.window else 0.0,
+            "recent_calls": len(self.window),
+            "times_opened": self.times_opened
+        }
+
+
+# Instancia global
+mongo_breaker = CircuitBreaker("ig-db-mongo")
@@ -0,0 +1,85 @@
+"""
+Column Projection - Columnas a leer, renombrar y usar como _id en una carga
+"""
+from typing import Any, Dict, List, Optional
+from app.dto.schemas import ColumnSpec
+from app.utils.constants import ErrorMessages
+
+
+class ColumnProjection:
+    """
+    ColumnSpec resuelto contra los headers de un archivo
+
+    Los parsers leen solo read_columns, en ese orden: primero las columnas
+    del documento y, si no está entre ellas, al final la columna del _id.
+    Así las columnas descartadas no se limpian, no se guardan en memoria ni
+    se serializan. Sin spec el resultado es el de siempre: todas las
+    columnas y _id = primera columna.
+
+    Con headers repetidos gana la última columna, como en csv.DictReader:
+    todos los motores leen por posición con read_indices.
+    """
+
+    def __init__(self, headers: List[str], spec: Optional[ColumnSpec] = None):
+        spec = spec or ColumnSpec()
+        self.spec = spec
+
+        referenced = set(spec.include or []) | set(spec.exclude) | set(spec.rename)
+        if spec.id_column:
+            referenced.add(spec.id_column)
+        unknown = sorted(referenced - set(headers))
+        if unknown:
+            raise ValueError(ErrorMessages.COLUMN_SPEC_UNKNOWN.format(columns=", ".join(unknown)))
+
+        excluded = set(spec.exclude)
+        selected = headers if spec.include is None else [h for h in headers if h in set(spec.include)]
+        self.columns = [c for c in dict.fromkeys(selected) if c not in excluded]
+        self.output_names = [spec.rename.get(c, c) for c in self.columns]
+        self.id_column = spec.id_column or (headers[0] if headers else None)
+
+        self.read_columns = list(self.columns)
+        if self.id_column is not None and self.id_column not in self.columns:
+            self.read_columns.append(self.id_column)
+        self.id_position = self.read_columns.index(self.id_column) if self.id_column is not None else None
+
+        positions = {name: i for i, name in enumerate(headers)}
+        self.read_indices = [positions[name] for name in self.read_columns]
+        self.duplicated_headers = len(positions) < len(headers)
+
+    def to_document(self, values: List[Any]) -> Dict[str, Any]:
+        """
+        Armar un documento a partir de los valores de read_columns
+
+        Args:
+            values: Valores limpios en el orden de read_columns
+
+        Returns:
+            Documento con _id y las columnas proyectadas
+        """
+        return {
+            "_id": values[self.id_position] if self.id_position is not None else "",
+            **dict(zip(self.output_names, values))
+        }
+
+    @staticmethod
+    def project_mapping(row: Dict[str, Any], spec: Optional[ColumnSpec]) -> Dict[str, Any]:
+        """
+        Proyectar un objeto sin esquema fijo (NDJSON), por nombre de clave
+
+        Args:
+            row: Objeto original
+            spec: Especificación de columnas
+
+        Returns:
+            Objeto con las claves seleccionadas y renombradas
+        """
+        if spec is None:
+            return row
+
+        if spec.include is not None:
+            items = [(key, row[key]) for key in spec.include if key in row]
+        else:
+            items = list(row.items())
+
+        excluded = set(spec.exclude)
+        return {spec.rename.get(key, key): value for key, value in items if key not in excluded}
@@ -0,0 +1,104 @@
+"""
+CSV Stream - Filas de un CSV a partir de bloques de bytes sin alinear
+
+Permite parsear un CSV a medida que llega (subidas por partes, flujos) con
+csv.reader, sin tener el archivo completo en memoria. Cada bloque devuelve
+solo los registros completos; un campo entre comillas con saltos de línea
+que queda cortado al final del bloque se completa con el bloque siguiente.
+"""
+import codecs
+import csv
+import io
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+class CsvChunkReader:
+    """
+    Convierte bloques de bytes de un CSV en filas completas
+
+    El encoding se decide con el primer bloque, como en el parseo del archivo
+    completo: UTF-8 (con o sin BOM) o latin-1. Si un bloque posterior no es
+    UTF-8 válido, el resto se decodifica como latin-1.
+    """
+
+    def __init__(self, filename: str):
+        """
+        Args:
+            filename: Nombre del archivo (para logs)
+        """
+        self.filename = filename
+        self.decoder = None
+        # Texto después del último registro completo
+        self.pending = ""
+
+    def feed(self, chunk: bytes) -> List[List[str]]:
+        """
+        Agregar un bloque de bytes
+
+        Args:
+            chunk: Bytes siguientes del archivo (pueden cortar líneas y caracteres)
+
+        Returns:
+            Registros completados con este bloque
+        """
+        self.pending += self._decode(chunk)
+
+        cut = self.pending.rfind("\n") + 1
+        if not cut:
+            return []
+
+        lines = io.StringIO(self.pending[:cut]).readlines()
+        self.pending = self.pending[cut:]
+
+        # Línea vacía centinela: fuera de comillas produce una fila [] al final;
+        # dentro de un campo entre comillas se absorbe y la última fila queda a medias
+        rows = list(csv.reader(lines + ["\n"]))
+        if rows.pop():
+            # El último registro sigue abierto: sus líneas vuelven al buffer para el próximo bloque
+            start = self._last_record_line(lines)
+            self.pending = "".join(lines[start:]) + self.pending
+        return rows
+
+    def close(self) -> List[List[str]]:
+        """
+        Terminar el archivo
+
+        Returns:
+            Registros restantes (el último puede no terminar en salto de línea)
+        """
+        text = self.pending + self._decode(b"", final=True)
+        self.pending = ""
+        return list(csv.reader(io.StringIO(text)))
+
+    def _decode(self, chunk: bytes, final: bool = False) -> str:
+        if self.decoder is None:
+            self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            try:
+                return self.decoder.decode(chunk, final)
+            except UnicodeDecodeError:
+                logger.info(f"Usando encoding latin-1 para {self.filename}")
+                self.decoder = codecs.getincrementaldecoder("latin-1")()
+                return self.decoder.decode(chunk, final)
+
+        try:
+            return self.decoder.decode(chunk, final)
+        except UnicodeDecodeError:
+            # Los bytes de un carácter cortado en el bloque anterior siguen en el decoder
+            buffered = self.decoder.getstate()[0]
+            logger.warning(f"⚠️ {self.filename}: bytes no UTF-8 a mitad del archivo, el resto se lee como latin-1")
+            self.decoder = codecs.getincrementaldecoder("latin-1")()
+            return self.decoder.decode(buffered + chunk, final)
+
+    @staticmethod
+    def _last_record_line(lines: List[str]) -> int:
+        """Índice de la línea donde empieza el último registro"""
+        reader = csv.reader(lines)
+        start = 0
+        while True:
+            line_num = reader.line_num
+            if next(reader, None) is None:
+                return start
+            start = line_num
@@ -1,16 +1,27 @@
 import csv
 import io
+import json
+import re
 import string
-import pandas as pd
-from typing import List, Dict, Any, AsyncGenerator
+from typing import List, Dict, Any, AsyncGenerator, AsyncIterator, Iterable, Optional
 import logging
 from app.config.settings import get_settings
+from app.dto.schemas import ColumnSpec
+from app.services.column_projection import ColumnProjection
+from app.services.csv_stream import CsvChunkReader
+from app.services.value_interner import ColumnInterner
+from app.services.xlsx_reader import XlsxFormatError, XlsxStreamReader
+from app.utils.constants import CsvEngines, ErrorMessages, ExcelEngines, FileFormats
 
 logger = logging.getLogger(__name__)
 
+# Línea con solo espacios: csv.reader la lee como una fila con un valor vacío,
+# pandas la descarta como línea en blanco
+WHITESPACE_LINE = re.compile(rb"(?m)^[ \t]+\r?$")
+
 
 class FileProcessor:
-    """Servicio para procesar archivos CSV y Excel"""
+    """Servicio para procesar archivos CSV, Excel, Parquet, Arrow IPC y NDJSON"""
 
     def __init__(self):
         self.settings = get_settings()
@@ -36,17 +47,111 @@ class FileProcessor:
 
         return cleaned
 
+    def _interner(self, columns: int) -> ColumnInterner:
+        """Interning por columna para los parsers fila a fila (uno por archivo)"""
+        return ColumnInterner(columns, self.clean_value, self.settings.INTERN_MAX_VALUES)
+
     async def process_csv(
             self,
             file_content: bytes,
-            filename: str
+            filename: str,
+            engine: Optional[str] = None,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar archivo CSV en batches con el motor de parseo indicado
+
+        Todos los motores producen los mismos batches: valores como string,
+        misma limpieza, _id = primera columna y fallback a latin-1.
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            engine: Motor de parseo (stdlib, pandas-c, pyarrow). Por defecto CSV_ENGINE
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        engine = engine or self.settings.CSV_ENGINE
+        engines = {
+            CsvEngines.STDLIB: self._process_csv_stdlib,
+            CsvEngines.PANDAS_C: self._process_csv_pandas,
+            CsvEngines.PYARROW: self._process_csv_pyarrow,
+        }
+
+        if engine not in engines:
+            raise ValueError(ErrorMessages.CSV_ENGINE_NOT_SUPPORTED.format(engine=engine))
+
+        logger.info(f"⚙️ Motor CSV: {engine}")
+        async for batch in engines[engine](file_content, filename, column_spec):
+            yield batch
+
+    def _detect_csv_encoding(self, file_content: bytes, filename: str) -> str:
+        """
+        Detectar el encoding de un CSV: UTF-8 (con o sin BOM) o latin-1
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+
+        Returns:
+            Nombre del encoding
+        """
+        try:
+            file_content.decode('utf-8-sig')
+            return 'utf-8-sig'
+        except UnicodeDecodeError:
+            logger.info(f"Usando encoding latin-1 para {filename}")
+            return 'latin-1'
+
+    def _read_csv_headers(self, file_content: bytes, encoding: str) -> List[str]:
+        """
+        Leer solo el registro de headers de un CSV
+
+        csv.reader pide líneas hasta cerrar el registro, así un header entre
+        comillas con saltos de línea se lee completo sin decodificar el resto
+        del archivo.
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            encoding: Encoding del archivo
+
+        Returns:
+            Nombres de las columnas
+        """
+        def lines():
+            start = 0
+            while start < len(file_content):
+                end = file_content.find(b"\n", start)
+                end = len(file_content) if end == -1 else end + 1
+                yield file_content[start:end].decode(encoding)
+                start = end
+
+        headers = next(csv.reader(lines()), [])
+        if not headers:
+            raise ValueError("El archivo CSV no tiene headers")
+        return headers
+
+    async def _process_csv_stdlib(
+            self,
+            file_content: bytes,
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None,
+            start_row: int = 0
     ) -> AsyncGenerator[List[Dict[str, Any]], None]:
         """
-        Procesar archivo CSV en batches
+        Procesar CSV con csv.reader (Python puro)
+
+        Es la referencia de los demás motores: solo se limpian las columnas
+        proyectadas, las filas cortas se completan con "" y los campos de
+        más se ignoran (como csv.DictReader), y las líneas vacías se saltan.
 
         Args:
             file_content: Contenido del archivo en bytes
             filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+            start_row: Filas de datos a saltar (ya producidas por otro motor)
 
         Yields:
             Batches de documentos con _id = primera columna
@@ -60,32 +165,37 @@ class FileProcessor:
             logger.info(f"Usando encoding latin-1 para {filename}")
 
         csv_file = io.StringIO(content_str)
-        csv_reader = csv.DictReader(csv_file)
+        csv_reader = csv.reader(csv_file)
 
-        # Obtener headers y primera columna
-        headers = csv_reader.fieldnames
+        # Obtener headers y columnas a leer
+        headers = next(csv_reader, None)
         if not headers or len(headers) == 0:
             raise ValueError("El archivo CSV no tiene headers")
 
-        first_column = headers[0]
-        logger.info(f"📋 Primera columna (será _id): {first_column}")
+        projection = ColumnProjection(headers, column_spec)
+        logger.info(f"📋 Columna _id: {projection.id_column} ({len(projection.columns)}/{len(headers)} columnas)")
+
+        indices = projection.read_indices
+        width = len(headers)
+        interner = self._interner(len(indices))
 
         batch = []
         row_count = 0
 
         for row in csv_reader:
+            # csv.DictReader ignora las filas vacías
+            if not row:
+                continue
             row_count += 1
+            if row_count <= start_row:
+                continue
 
-            # Limpiar todos los valores
-            clean_row = {k: self.clean_value(v) for k, v in row.items()}
-
-            # Usar primera columna como _id
-            document = {
-                "_id": clean_row.get(first_column, ""),
-                **clean_row
-            }
+            if len(row) < width:
+                row += [""] * (width - len(row))
 
-            batch.append(document)
+            # Limpiar solo los valores proyectados
+            values = interner.clean_row(row, indices)
+            batch.append(projection.to_document(values))
 
             if len(batch) >= self.batch_size:
                 logger.info(f"📦 Batch de {len(batch)} filas listo")
@@ -97,45 +207,405 @@ class FileProcessor:
             logger.info(f"📦 Último batch de {len(batch)} filas")
             yield batch
 
+        logger.info(f"✅ Total procesado: {row_count} filas ({interner.interned_columns} columnas internadas)")
+
+    async def process_csv_stream(
+            self,
+            chunks: AsyncIterator[bytes],
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar un CSV en batches a medida que llegan los bytes (motor stdlib)
+
+        Produce los mismos batches que _process_csv_stdlib sobre el archivo
+        completo. El encoding se decide con el primer bloque.
+
+        Args:
+            chunks: Iterador asíncrono de bloques de bytes (sin alinear a líneas)
+            filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        reader = CsvChunkReader(filename)
+        projection = None
+        indices = []
+        width = 0
+        interner = None
+        batch = []
+        row_count = 0
+
+        async def row_blocks():
+            async for chunk in chunks:
+                yield reader.feed(chunk)
+            yield reader.close()
+
+        async for rows in row_blocks():
+            for row in rows:
+                if projection is None:
+                    # Primera fila: headers y columnas a leer
+                    if not row:
+                        raise ValueError("El archivo CSV no tiene headers")
+                    projection = ColumnProjection(row, column_spec)
+                    logger.info(f"📋 Columna _id: {projection.id_column} ({len(projection.columns)}/{len(row)} columnas)")
+                    indices = projection.read_indices
+                    width = len(row)
+                    interner = self._interner(len(indices))
+                    continue
+
+                if not row:
+                    continue
+                row_count += 1
+
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+
+                batch.append(projection.to_document(interner.clean_row(row, indices)))
+
+                if len(batch) >= self.batch_size:
+                    logger.info(f"📦 Batch de {len(batch)} filas listo")
+                    yield batch
+                    batch = []
+
+        if projection is None:
+            raise ValueError("El archivo CSV no tiene headers")
+
+        # Último batch
+        if batch:
+            logger.info(f"📦 Último batch de {len(batch)} filas")
+            yield batch
+
+        logger.info(f"✅ Total procesado: {row_count} filas ({interner.interned_columns} columnas internadas)")
+
+    async def _process_csv_pandas(
+            self,
+            file_content: bytes,
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar CSV con el motor C de pandas, leyendo por chunks de BATCH_SIZE
+
+        Las columnas se leen por posición, así los headers repetidos se
+        resuelven como en stdlib. Los casos que pandas lee distinto (filas
+        con más campos que headers después de la primera, líneas con solo
+        espacios) se procesan con stdlib.
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        import pandas as pd
+
+        encoding = self._detect_csv_encoding(file_content, filename)
+        headers = self._read_csv_headers(file_content, encoding)
+        projection = ColumnProjection(headers, column_spec)
+
+        if WHITESPACE_LINE.search(file_content):
+            logger.warning(f"⚠️ {filename} tiene líneas con solo espacios. Usando stdlib")
+            async for batch in self._process_csv_stdlib(file_content, filename, column_spec):
+                yield batch
+            return
+
+        logger.info(f"📋 Columna _id: {projection.id_column} ({len(projection.columns)}/{len(headers)} columnas)")
+
+        indices = projection.read_indices
+        row_count = 0
+
+        try:
+            reader = pd.read_csv(
+                io.BytesIO(file_content),
+                engine='c',
+                encoding=encoding,
+                dtype=str,
+                keep_default_na=False,
+                na_filter=False,
+                # Columnas nombradas por posición; sin índice implícito, los campos
+                # de más se descartan en vez de correr los valores a la izquierda
+                header=0,
+                names=list(range(len(headers))),
+                index_col=False,
+                # El parser C no convierte las columnas que no se usan
+                usecols=indices,
+                chunksize=self.batch_size
+            )
+
+            with reader:
+                for chunk in reader:
+                    if chunk.empty:
+                        continue
+
+                    # Limpieza vectorizada de los valores distintos de cada columna (mismo
+                    # resultado que clean_value); filas con menos campos que headers quedan como NaN.
+                    # take() reparte el mismo objeto a todas las celdas con ese valor
+                    columns = []
+                    for position in indices:
+                        codes, uniques = pd.factorize(chunk[position].fillna(""))
+                        cleaned = uniques.str.strip().str.rstrip(string.punctuation + string.whitespace)
+                        columns.append(cleaned.to_numpy(dtype=object).take(codes).tolist())
+
+                    batch = [projection.to_document(values) for values in zip(*columns)]
+
+                    row_count += len(batch)
+                    logger.info(f"📦 Batch de {len(batch)} filas listo")
+                    yield batch
+
+        except pd.errors.EmptyDataError:
+            raise ValueError("El archivo CSV no tiene headers")
+        except pd.errors.ParserError as e:
+            # Una fila con más campos que headers: stdlib sigue desde la primera fila no enviada
+            logger.warning(f"⚠️ pandas no pudo parsear {filename} ({e}). Usando stdlib desde la fila {row_count + 1}")
+            async for batch in self._process_csv_stdlib(file_content, filename, column_spec, start_row=row_count):
+                yield batch
+            return
+
         logger.info(f"✅ Total procesado: {row_count} filas")
 
+    async def _process_csv_pyarrow(
+            self,
+            file_content: bytes,
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar CSV con pyarrow.csv (lectura multihilo por bloques)
+
+        Todas las columnas se leen como string para no inferir tipos y
+        producir los mismos valores que csv.DictReader.
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        encoding = self._detect_csv_encoding(file_content, filename)
+
+        # Leer solo la línea de headers para fijar todas las columnas como string
+        headers = self._read_csv_headers(file_content, encoding)
+        projection = ColumnProjection(headers, column_spec)
+
+        # Columnas nombradas por posición: con headers repetidos gana la última, como en stdlib
+        names = [str(i) for i in range(len(headers))]
+        read_names = [names[i] for i in projection.read_indices]
+
+        try:
+            table = pa_csv.read_csv(
+                pa.BufferReader(file_content),
+                read_options=pa_csv.ReadOptions(encoding=encoding, use_threads=True, column_names=names),
+                # Sin comillas no puede haber saltos de línea dentro de un valor
+                parse_options=pa_csv.ParseOptions(newlines_in_values=b'"' in file_content),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={name: pa.string() for name in read_names},
+                    # Las columnas no incluidas no se convierten ni se guardan
+                    include_columns=read_names,
+                    strings_can_be_null=False,
+                    quoted_strings_can_be_null=False
+                )
+            )
+            # La fila de headers se leyó como datos
+            table = table.slice(1).rename_columns(projection.read_columns)
+        except pa.ArrowInvalid as e:
+            # pyarrow rechaza filas con distinta cantidad de campos; csv.DictReader
+            # las acepta, así que se reprocesa con stdlib para mantener el resultado
+            logger.warning(f"⚠️ pyarrow no pudo parsear {filename} ({e}). Usando stdlib")
+            async for batch in self._process_csv_stdlib(file_content, filename, column_spec):
+                yield batch
+            return
+
+        logger.info(f"📋 Columna _id: {projection.id_column} ({len(projection.columns)}/{len(headers)} columnas)")
+
+        async for batch in self._process_record_batches(table.to_batches(), filename, projection):
+            yield batch
+
     async def process_excel(
             self,
             file_content: bytes,
-            filename: str
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None,
+            engine: Optional[str] = None
     ) -> AsyncGenerator[List[Dict[str, Any]], None]:
         """
-        Procesar archivo Excel en batches
+        Procesar archivo Excel en batches con el motor indicado
+
+        El motor stream solo lee .xlsx; los .xls y los .xlsx que no puede
+        abrir se leen con pandas.
 
         Args:
             file_content: Contenido del archivo en bytes
             filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+            engine: Motor de lectura (stream, pandas). Por defecto EXCEL_ENGINE
 
         Yields:
             Batches de documentos con _id = primera columna
         """
+        engine = engine or self.settings.EXCEL_ENGINE
+        if engine not in ExcelEngines.ALL:
+            raise ValueError(ErrorMessages.EXCEL_ENGINE_NOT_SUPPORTED.format(engine=engine))
+
+        if engine == ExcelEngines.STREAM and filename.lower().endswith(".xlsx"):
+            try:
+                reader = XlsxStreamReader(file_content)
+            except XlsxFormatError as e:
+                logger.warning(f"⚠️ {filename} no se pudo leer en streaming ({e}); usando pandas")
+            else:
+                logger.info(f"⚙️ Motor Excel: {engine}")
+                async for batch in self._process_excel_stream(reader, column_spec):
+                    yield batch
+                return
+
+        logger.info(f"⚙️ Motor Excel: {ExcelEngines.PANDAS}")
+        async for batch in self._process_excel_pandas(file_content, filename, column_spec):
+            yield batch
+
+    @staticmethod
+    def _excel_headers(row: List[Any]) -> List[str]:
+        """
+        Nombres de columna de la primera fila de la hoja
+
+        Las celdas vacías se llaman "Unnamed: N", como en pandas.read_excel.
+        Los repetidos quedan tal cual: gana la última columna, como en CSV.
+
+        Args:
+            row: Primera fila de la hoja
+
+        Returns:
+            Nombres de las columnas
+        """
+        return [f"Unnamed: {i}" if name is None or name == "" else str(name) for i, name in enumerate(row)]
+
+    @staticmethod
+    def _excel_numeric_column(column: Any) -> Any:
+        """
+        Convertir a número una columna de pandas si todos sus valores lo son
+
+        Args:
+            column: Columna leída con header=None (dtype object)
+
+        Returns:
+            La columna numérica, o la original si algún valor no es número
+        """
+        import pandas as pd
+
         try:
-            # Leer Excel con pandas
-            df = pd.read_excel(io.BytesIO(file_content), engine='openpyxl')
+            return pd.to_numeric(column)
+        except (ValueError, TypeError):
+            return column
+
+    async def _process_excel_stream(
+            self,
+            reader: XlsxStreamReader,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar la primera hoja de un .xlsx fila a fila, sin DataFrame
+
+        Igual que el motor stdlib de CSV: solo se limpian las columnas
+        proyectadas y los batches salen mientras se descomprime la hoja.
+
+        Args:
+            reader: Lector de la hoja
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        rows = reader.iter_rows()
+        first_row = next(rows, None)
+        if not first_row:
+            raise ValueError("El archivo Excel no tiene headers")
+
+        headers = self._excel_headers(first_row)
+        projection = ColumnProjection(headers, column_spec)
+        logger.info(f"📋 Columna _id: {projection.id_column} ({len(projection.columns)}/{len(headers)} columnas)")
+
+        indices = projection.read_indices
+        width = len(headers)
+        interner = self._interner(len(indices))
+
+        batch = []
+        row_count = 0
+
+        for row in rows:
+            # Fila con valores solo a la derecha de la última columna con header: vacía, como en pandas
+            if not any(row[:width]):
+                continue
+            row_count += 1
+
+            if len(row) < width:
+                row += [None] * (width - len(row))
+
+            values = interner.clean_row(row, indices)
+            batch.append(projection.to_document(values))
+
+            if len(batch) >= self.batch_size:
+                logger.info(f"📦 Batch de {len(batch)} filas listo")
+                yield batch
+                batch = []
+
+        if batch:
+            logger.info(f"📦 Último batch de {len(batch)} filas")
+            yield batch
+
+        logger.info(f"✅ Total procesado: {row_count} filas ({interner.interned_columns} columnas internadas)")
+
+    async def _process_excel_pandas(
+            self,
+            file_content: bytes,
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar archivo Excel con pandas.read_excel (carga la hoja completa)
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        import pandas as pd
+
+        try:
+            # Leer Excel con pandas una sola vez, sin header: la primera fila da los
+            # headers sin el sufijo que pandas agrega a los repetidos
+            sheet = pd.read_excel(io.BytesIO(file_content), engine='openpyxl', header=None)
+            if sheet.empty:
+                raise ValueError("El archivo Excel no tiene headers")
+            # Sin la fila de headers, cada columna se convierte como con header=0:
+            # las que son todas numéricas pasan a número ("1" -> "1.0")
+            df = sheet.iloc[1:].apply(self._excel_numeric_column)
+
+            # Proyectar antes de limpiar: las columnas descartadas no se procesan
+            headers = self._excel_headers([None if pd.isna(v) else v for v in sheet.iloc[0].tolist()])
+            projection = ColumnProjection(headers, column_spec)
+            df = df.iloc[:, projection.read_indices]
+            logger.info(f"📋 Columna _id: {projection.id_column} ({len(projection.columns)} columnas)")
 
             # Reemplazar NaN con string vacío
             df = df.fillna("")
 
-            # Primera columna como _id
-            first_column = df.columns[0]
-            logger.info(f"📋 Primera columna (será _id): {first_column}")
-
             # Convertir a lista de diccionarios con _id y limpieza
+            interner = self._interner(len(projection.read_columns))
             records = []
             for _, row in df.iterrows():
                 # Limpiar todos los valores
-                clean_row = {k: self.clean_value(v) for k, v in row.to_dict().items()}
-
-                document = {
-                    "_id": clean_row.get(first_column, ""),
-                    **clean_row
-                }
-                records.append(document)
+                values = interner.clean_values(row.tolist())
+                records.append(projection.to_document(values))
 
             total = len(records)
             logger.info(f"📊 Excel leído: {total} filas")
@@ -150,10 +620,405 @@ class FileProcessor:
             logger.error(f"❌ Error procesando Excel: {e}")
             raise
 
+    def _clean_arrow_column(self, column: Any) -> List[Any]:
+        """
+        Limpiar una columna de Arrow con el mismo resultado que clean_value
+
+        La columna se codifica como diccionario y solo se limpian sus valores
+        distintos; take() reparte el mismo objeto a todas las celdas con ese
+        valor. Las listas, structs y maps se conservan como objetos, igual
+        que los valores anidados de NDJSON.
+
+        Args:
+            column: pyarrow.Array
+
+        Returns:
+            Lista de strings limpios (u objetos, si la columna es anidada)
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if pa.types.is_nested(column.type):
+            return [self._nested_value(v) if v is not None else "" for v in column.to_pylist()]
+
+        try:
+            encoded = column if pa.types.is_dictionary(column.type) else pc.dictionary_encode(column)
+        except pa.ArrowNotImplementedError:
+            return [self.clean_value(v) for v in column.to_pylist()]
+
+        # Los nulos apuntan a un "" agregado al final del diccionario
+        dictionary = np.append(self._clean_arrow_values(encoded.dictionary), "")
+        indices = pc.fill_null(encoded.indices, len(dictionary) - 1).to_numpy()
+        return dictionary.take(indices).tolist()
+
+    def _nested_value(self, value: Any) -> Any:
+        """
+        Valor de una columna anidada de Arrow listo para serializar a JSON
+
+        La estructura se conserva sin limpiar, como en NDJSON; los escalares
+        que JSON no representa (fechas, decimales, bytes) pasan a string,
+        igual que en las columnas escalares.
+
+        Args:
+            value: Valor de to_pylist() (lista, dict, lista de pares de un map o escalar)
+
+        Returns:
+            Valor con solo tipos nativos de JSON
+        """
+        if isinstance(value, dict):
+            return {key: self._nested_value(v) for key, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._nested_value(v) for v in value]
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        return str(value)
+
+    def _clean_arrow_values(self, values: Any) -> Any:
+        """
+        Limpiar un pyarrow.Array sin nulos repetidos (el diccionario de una columna)
+
+        Args:
+            values: pyarrow.Array
+
+        Returns:
+            numpy array (dtype object) de strings limpios
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if pa.types.is_string(values.type) or pa.types.is_large_string(values.type):
+            values = pc.utf8_trim_whitespace(pc.fill_null(values, ""))
+            values = pc.utf8_rtrim(values, characters=string.punctuation + string.whitespace)
+            return values.to_numpy(zero_copy_only=False)
+
+        return np.array([self.clean_value(v) for v in values.to_pylist()], dtype=object)
+
+    def _record_batches_to_documents(
+            self,
+            record_batches: List[Any],
+            projection: ColumnProjection
+    ) -> List[Dict[str, Any]]:
+        """
+        Convertir slices de Arrow a documentos
+
+        Es el único punto donde los datos columnares se materializan como
+        diccionarios, justo antes de serializar el batch.
+
+        Args:
+            record_batches: Slices (pyarrow.RecordBatch) que forman un batch
+            projection: Columnas a leer/renombrar y columna del _id
+
+        Returns:
+            Lista de documentos con _id = primera columna
+        """
+        documents = []
+
+        for record_batch in record_batches:
+            if record_batch.schema.names != projection.read_columns:
+                # select() es zero-copy: las columnas descartadas no se limpian.
+                # Con headers repetidos se elige por posición (gana la última)
+                record_batch = record_batch.select(
+                    projection.read_indices if projection.duplicated_headers else projection.read_columns
+                )
+            columns = [self._clean_arrow_column(column) for column in record_batch.columns]
+
+            documents.extend(projection.to_document(values) for values in zip(*columns))
+
+        return documents
+
+    async def _process_record_batches(
+            self,
+            record_batches: Iterable[Any],
+            filename: str,
+            projection: ColumnProjection
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Agrupar RecordBatches de Arrow en batches de BATCH_SIZE filas
+
+        Los RecordBatches se cortan con slice() (zero-copy), de modo que la
+        memoria queda acotada al tamaño del row group / batch de origen.
+
+        Args:
+            record_batches: Iterable de pyarrow.RecordBatch
+            filename: Nombre del archivo
+            projection: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        pending = []
+        pending_rows = 0
+        row_count = 0
+
+        for record_batch in record_batches:
+            if record_batch.num_columns == 0:
+                raise ValueError(f"El archivo {filename} no tiene columnas")
+
+            offset = 0
+            while offset < record_batch.num_rows:
+                length = min(self.batch_size - pending_rows, record_batch.num_rows - offset)
+                pending.append(record_batch.slice(offset, length))
+                pending_rows += length
+                offset += length
+
+                if pending_rows >= self.batch_size:
+                    row_count += pending_rows
+                    logger.info(f"📦 Batch de {pending_rows} filas listo")
+                    yield self._record_batches_to_documents(pending, projection)
+                    pending = []
+                    pending_rows = 0
+
+        # Último batch
+        if pending_rows:
+            row_count += pending_rows
+            logger.info(f"📦 Último batch de {pending_rows} filas")
+            yield self._record_batches_to_documents(pending, projection)
+
+        logger.info(f"✅ Total procesado: {row_count} filas")
+
+    async def process_parquet(
+            self,
+            file_content: bytes,
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar archivo Parquet en batches, un row group a la vez
+
+        Solo se leen y descomprimen las columnas proyectadas.
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(pa.BufferReader(file_content))
+        if not parquet_file.schema_arrow.names:
+            raise ValueError("El archivo Parquet no tiene columnas")
+
+        projection = ColumnProjection(parquet_file.schema_arrow.names, column_spec)
+        logger.info(
+            f"📋 Columna _id: {projection.id_column} "
+            f"({len(projection.columns)} columnas, {parquet_file.num_row_groups} row groups)"
+        )
+
+        def record_batches():
+            for i in range(parquet_file.num_row_groups):
+                # Con headers repetidos la selección por nombre es ambigua: se leen todas
+                columns = None if projection.duplicated_headers else projection.read_columns
+                yield from parquet_file.read_row_group(i, columns=columns).to_batches()
+
+        async for batch in self._process_record_batches(record_batches(), filename, projection):
+            yield batch
+
+    async def process_arrow(
+            self,
+            file_content: bytes,
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar archivo Arrow IPC (formato file/Feather v2 o stream) en batches
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos con _id = primera columna
+        """
+        import pyarrow as pa
+
+        try:
+            reader = pa.ipc.open_file(pa.BufferReader(file_content))
+            record_batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            # No es formato file: intentar formato stream
+            reader = pa.ipc.open_stream(pa.BufferReader(file_content))
+            record_batches = iter(reader)
+
+        if not reader.schema.names:
+            raise ValueError("El archivo Arrow no tiene columnas")
+
+        projection = ColumnProjection(reader.schema.names, column_spec)
+        logger.info(f"📋 Columna _id: {projection.id_column} ({len(projection.columns)} columnas)")
+
+        async for batch in self._process_record_batches(record_batches, filename, projection):
+            yield batch
+
+    def _parse_json_line(self, line: bytes, line_number: int) -> Dict[str, Any]:
+        """
+        Parsear una línea NDJSON
+
+        Args:
+            line: Línea en bytes (sin salto de línea)
+            line_number: Número de línea (para mensajes de error)
+
+        Returns:
+            Objeto JSON de la línea
+        """
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise ValueError(ErrorMessages.NDJSON_INVALID_LINE.format(line=line_number))
+
+        if not isinstance(row, dict):
+            raise ValueError(ErrorMessages.NDJSON_INVALID_LINE.format(line=line_number))
+
+        return row
+
+    def _clean_json_value(self, value: Any) -> Any:
+        """
+        Limpiar un valor NDJSON
+
+        Los valores escalares se limpian igual que en CSV/Excel; los objetos y
+        listas anidados se conservan tal cual.
+        """
+        return value if isinstance(value, (dict, list)) else self.clean_value(value)
+
+    async def process_ndjson_stream(
+            self,
+            chunks: AsyncIterator[bytes],
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar un flujo NDJSON (JSON Lines) en batches a medida que llegan los bytes
+
+        Si el documento trae "_id" se respeta; si no, se usa la primera clave
+        del primer objeto como _id (equivalente a la primera columna en CSV).
+        column_spec.id_column tiene prioridad sobre ambos. Como no hay esquema
+        fijo, la proyección se aplica por nombre de clave en cada objeto.
+
+        Args:
+            chunks: Iterador asíncrono de bloques de bytes (sin alinear a líneas)
+            filename: Nombre del archivo o flujo
+            column_spec: Claves a conservar/renombrar y clave del _id
+
+        Yields:
+            Batches de documentos
+        """
+        buffer = b""
+        batch = []
+        row_count = 0
+        line_number = 0
+        first_column = None
+        id_column = column_spec.id_column if column_spec is not None else None
+
+        async def lines():
+            nonlocal buffer
+            async for chunk in chunks:
+                buffer += chunk
+                *complete, buffer = buffer.split(b"\n")
+                for line in complete:
+                    yield line
+            if buffer:
+                yield buffer
+
+        async for line in lines():
+            line_number += 1
+            if not line.strip():
+                continue
+
+            row = self._parse_json_line(line, line_number)
+            row_count += 1
+
+            if first_column is None:
+                if id_column:
+                    first_column = id_column
+                else:
+                    first_column = "_id" if "_id" in row else next(iter(row), "_id")
+                logger.info(f"📋 Primera columna (será _id): {first_column}")
+
+            # Limpiar solo las claves proyectadas
+            projected = ColumnProjection.project_mapping(row, column_spec)
+            clean_row = {k: self._clean_json_value(v) for k, v in projected.items()}
+            if id_column:
+                # El _id viene de id_column aunque el objeto traiga su propio "_id"
+                clean_row.pop("_id", None)
+
+            document = {
+                "_id": self._clean_json_value(row.get(first_column, "")),
+                **clean_row
+            }
+
+            batch.append(document)
+
+            if len(batch) >= self.batch_size:
+                logger.info(f"📦 Batch de {len(batch)} filas listo")
+                yield batch
+                batch = []
+
+        # Último batch
+        if batch:
+            logger.info(f"📦 Último batch de {len(batch)} filas")
+            yield batch
+
+        logger.info(f"✅ Total procesado: {row_count} filas de {filename}")
+
+    async def process_ndjson(
+            self,
+            file_content: bytes,
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar archivo NDJSON (JSON Lines) en batches
+
+        Args:
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            column_spec: Claves a conservar/renombrar y clave del _id
+
+        Yields:
+            Batches de documentos
+        """
+        async def single_chunk():
+            yield file_content
+
+        async for batch in self.process_ndjson_stream(single_chunk(), filename, column_spec):
+            yield batch
+
+    async def process_stream(
+            self,
+            chunks: AsyncIterator[bytes],
+            filename: str,
+            column_spec: Optional[ColumnSpec] = None
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """
+        Procesar un flujo de bytes a medida que llega: CSV por extensión, si no NDJSON
+
+        Args:
+            chunks: Iterador asíncrono de bloques de bytes
+            filename: Nombre del archivo o flujo
+            column_spec: Columnas a leer/renombrar y columna del _id
+
+        Yields:
+            Batches de documentos
+        """
+        if filename.lower().endswith(tuple(FileFormats.CSV)):
+            batches = self.process_csv_stream(chunks, filename, column_spec)
+        else:
+            batches = self.process_ndjson_stream(chunks, filename, column_spec)
+
+        async for batch in batches:
+            yield batch
+
     async def process_file(
             self,
             file_content: bytes,
-            filename: str
+            filename: str,
+            csv_engine: Optional[str] = None,
+            column_spec: Optional[ColumnSpec] = None
     ) -> AsyncGenerator[List[Dict[str, Any]], None]:
         """
         Procesar archivo según su tipo
@@ -161,18 +1026,32 @@ class FileProcessor:
         Args:
             file_content: Contenido del archivo
             filename: Nombre del archivo
+            csv_engine: Motor de parseo para CSV (por defecto CSV_ENGINE)
+            column_spec: Columnas a leer/renombrar y columna del _id
 
         Yields:
             Batches de documentos
         """
         filename_lower = filename.lower()
 
-        if filename_lower.endswith('.csv'):
-            async for batch in self.process_csv(file_content, filename):
+        if filename_lower.endswith(tuple(FileFormats.CSV)):
+            async for batch in self.process_csv(file_content, filename, engine=csv_engine, column_spec=column_spec):
+                yield batch
+
+        elif filename_lower.endswith(tuple(FileFormats.EXCEL)):
+            async for batch in self.process_excel(file_content, filename, column_spec):
+                yield batch
+
+        elif filename_lower.endswith(tuple(FileFormats.PARQUET)):
+            async for batch in self.process_parquet(file_content, filename, column_spec):
+                yield batch
+
+        elif filename_lower.endswith(tuple(FileFormats.ARROW)):
+            async for batch in self.process_arrow(file_content, filename, column_spec):
                 yield batch
 
-        elif filename_lower.endswith(('.xlsx', '.xls')):
-            async for batch in self.process_excel(file_content, filename):
+        elif filename_lower.endswith(tuple(FileFormats.NDJSON)):
+            async for batch in self.process_ndjson(file_content, filename, column_spec):
                 yield batch
 
         else:
@@ -0,0 +1,283 @@
+"""
+Local Index - Snapshot local de las colecciones cargadas para búsquedas por ID
+
+Cada carga terminada publica un segmento por colección:
+
+    <LOCAL_INDEX_DIR>/<colección>/<segmento>/rows.jsonl   documentos, uno por línea
+    <LOCAL_INDEX_DIR>/<colección>/<segmento>/index.bin    pares (hash64(_id), offset)
+                                                          ordenados, uint64 nativos
+
+Ambos archivos se leen con mmap: una búsqueda es una búsqueda binaria sobre
+el índice más la lectura de una línea, sin red y con la memoria residente
+gestionada por el page cache del sistema operativo.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+from app.config.settings import get_settings
+from app.mapper.data_mapper import DataMapper
+
+logger = logging.getLogger(__name__)
+
+ROWS_FILE = "rows.jsonl"
+INDEX_FILE = "index.bin"
+
+
+def hash_id(document_id: Any) -> int:
+    """Hash estable de 64 bits para un _id"""
+    digest = hashlib.blake2b(str(document_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class LocalIndexWriter:
+    """Escribe el segmento de una carga; se publica solo al hacer commit"""
+
+    def __init__(self, collection_dir: Path, task_id: str, max_segments: int):
+        self.collection_dir = collection_dir
+        self.max_segments = max_segments
+        self.segment_name = f"{time.time_ns()}_{task_id}"
+        self.staging_dir = collection_dir / f".staging_{self.segment_name}"
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self.rows_file = open(self.staging_dir / ROWS_FILE, "wb")
+        self.hashes = array("Q")
+        self.offsets = array("Q")
+        self.offset = 0
+
+    def add_batch(self, documents: List[Dict[str, Any]]):
+        """
+        Agregar un batch ya guardado en ig-db-mongo
+        Hace I/O bloqueante: llamar desde un thread (asyncio.to_thread)
+
+        Args:
+            documents: Documentos del batch
+        """
+        lines = []
+        for document in documents:
+            line = json.dumps(document, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+            self.hashes.append(hash_id(document.get("_id", "")))
+            self.offsets.append(self.offset)
+            self.offset += len(line) + 1
+            lines.append(line)
+
+        self.rows_file.write(b"\n".join(lines) + b"\n")
+
+    def commit(self, replace_existing: bool = False) -> Optional[Path]:
+        """
+        Ordenar el índice y publicar el segmento de forma atómica
+        Hace I/O bloqueante: llamar desde un thread (asyncio.to_thread)
+
+        Args:
+            replace_existing: Eliminar los demás segmentos (carga replace)
+
+        Returns:
+            Ruta del segmento publicado o None si no había filas
+        """
+        if not self.hashes:
+            self.abort()
+            if replace_existing:
+                self._drop_other_segments()
+            return None
+
+        self.rows_file.close()
+
+        import numpy as np
+
+        # Orden estable por hash: los offsets ya son crecientes, así que ante
+        # _id repetidos gana la primera fila
+        hashes = np.frombuffer(self.hashes, dtype=np.uint64)
+        order = np.argsort(hashes, kind="stable")
+        index = np.empty((len(order), 2), dtype=np.uint64)
+        index[:, 0] = hashes[order]
+        index[:, 1] = np.frombuffer(self.offsets, dtype=np.uint64)[order]
+
+        with open(self.staging_dir / INDEX_FILE, "wb") as f:
+            index.tofile(f)
+
+        segment_dir = self.collection_dir / self.segment_name
+        os.rename(self.staging_dir, segment_dir)
+        logger.info(f"🗂️ Índice local publicado: {segment_dir} ({len(self.hashes)} filas)")
+
+        if replace_existing:
+            # Los segmentos anteriores describen una colección que ya no existe
+            self._drop_other_segments()
+        else:
+            self._prune_segments()
+        return segment_dir
+
+    def abort(self):
+        """Descartar el segmento en construcción"""
+        self.rows_file.close()
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+    def _prune_segments(self):
+        segments = sorted(p for p in self.collection_dir.iterdir() if not p.name.startswith("."))
+        for old_segment in segments[:-self.max_segments]:
+            shutil.rmtree(old_segment, ignore_errors=True)
+
+    def _drop_other_segments(self):
+        for segment in self.collection_dir.iterdir():
+            if not segment.name.startswith(".") and segment.name != self.segment_name:
+                shutil.rmtree(segment, ignore_errors=True)
+
+
+class LocalIndexSegment:
+    """Segmento publicado abierto con mmap"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path / INDEX_FILE, "rb") as f:
+            self.index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(path / ROWS_FILE, "rb") as f:
+            self.rows_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = memoryview(self.index_map).cast("Q")
+        self.size = len(self.index) // 2
+
+    def lookup(self, document_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Buscar un documento por _id
+
+        Args:
+            document_id: Valor del _id
+
+        Returns:
+            Documento o None si no está en el segmento
+        """
+        target = hash_id(document_id)
+
+        # Búsqueda binaria del primer par con hash >= target
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self.index[2 * middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        # Recorrer hashes iguales (colisiones o _id repetidos)
+        while low < self.size and self.index[2 * low] == target:
+            document = self._read_row(self.index[2 * low + 1])
+            if str(document.get("_id")) == str(document_id):
+                return document
+            low += 1
+
+        return None
+
+    def _read_row(self, offset: int) -> Dict[str, Any]:
+        end = self.rows_map.find(b"\n", offset)
+        return json.loads(self.rows_map[offset:end])
+
+    def close(self):
+        self.index.release()
+        self.index_map.close()
+        self.rows_map.close()
+
+
+class LocalIndex:
+    """Índice local de búsquedas por _id para colecciones cargadas por este servicio"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.LOCAL_INDEX_ENABLED
+        self.base_dir = Path(self.settings.LOCAL_INDEX_DIR)
+        self.mapper = DataMapper()
+        self._segments: Dict[Path, LocalIndexSegment] = {}
+        self._listings: Dict[Path, Tuple[int, List[LocalIndexSegment]]] = {}
+
+    def _collection_dir(self, client_id: str, business_name: str) -> Path:
+        collection_name = self.mapper.build_collection_name(client_id=client_id, business_name=business_name)
+        return self.base_dir / quote(collection_name, safe="")
+
+    def open_writer(self, client_id: str, business_name: str, task_id: str) -> Optional[LocalIndexWriter]:
+        """
+        Abrir un writer para la carga de una tarea
+
+        Args:
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            task_id: ID de la tarea
+
+        Returns:
+            Writer o None si el índice local está deshabilitado
+        """
+        if not self.enabled:
+            return None
+
+        return LocalIndexWriter(
+            self._collection_dir(client_id, business_name),
+            task_id,
+            self.settings.LOCAL_INDEX_MAX_SEGMENTS
+        )
+
+    def _open_segments(self, collection_dir: Path) -> List[LocalIndexSegment]:
+        # La lista de segmentos solo cambia al publicar/podar (cambia el mtime del directorio)
+        try:
+            mtime = collection_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        cached = self._listings.get(collection_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        paths = sorted(
+            (p for p in collection_dir.iterdir() if not p.name.startswith(".")),
+            reverse=True
+        )
+
+        # Cerrar segmentos eliminados por el pruning
+        for stale in [p for p in self._segments if p.parent == collection_dir and p not in paths]:
+            self._segments.pop(stale).close()
+
+        segments = []
+        for path in paths:
+            if path not in self._segments:
+                try:
+                    self._segments[path] = LocalIndexSegment(path)
+                except FileNotFoundError:
+                    continue
+            segments.append(self._segments[path])
+
+        self._listings[collection_dir] = (mtime, segments)
+        return segments
+
+    def lookup(self, client_id: str, business_name: str, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Buscar un documento en el índice local (segmento más reciente primero)
+
+        Args:
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            document_id: Valor del _id
+
+        Returns:
+            Documento o None si no está indexado localmente
+        """
+        if not self.enabled:
+            return None
+
+        for segment in self._open_segments(self._collection_dir(client_id, business_name)):
+            document = segment.lookup(document_id)
+            if document is not None:
+                return document
+
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del índice local"""
+        return {
+            "enabled": self.enabled,
+            "open_segments": len(self._segments),
+            "indexed_rows": sum(segment.size for segment in self._segments.values())
+        }
+
+
+# Instancia global
+local_index = LocalIndex()
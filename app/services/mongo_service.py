@@ -1,7 +1,6 @@
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo import InsertOne
 from typing import List, Dict, Any
 from app.config.settings import get_settings
+from app.utils.constants import LoadModes
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,11 +11,14 @@ class MongoService:
     
     def __init__(self):
         self.settings = get_settings()
-        self.client: AsyncIOMotorClient = None
-        self.db: AsyncIOMotorDatabase = None
+        # motor se importa al conectar: el servicio arranca sin cargarlo
+        self.client = None  # AsyncIOMotorClient
+        self.db = None  # AsyncIOMotorDatabase
     
     async def connect(self):
         """Conectar a MongoDB Atlas"""
+        from motor.motor_asyncio import AsyncIOMotorClient
+
         try:
             self.client = AsyncIOMotorClient(
                 self.settings.MONGODB_URI,
@@ -46,35 +48,87 @@ class MongoService:
         """
         return f"client_{client_id}_file_{file_id}"
     
+    def get_staging_collection_name(self, collection_name: str, load_id: str) -> str:
+        """
+        Nombre de la colección en staging de una carga replace
+        Formato: {collection_name}__staging_{load_id}
+        """
+        return f"{collection_name}__staging_{load_id}"
+    
     async def bulk_insert_documents(
         self, 
         collection_name: str, 
-        documents: List[Dict[str, Any]]
+        documents: List[Dict[str, Any]],
+        load_mode: str = LoadModes.INSERT
     ) -> int:
         """
-        Insertar múltiples documentos en una colección
+        Escribir múltiples documentos en una colección
+        
+        insert usa InsertOne: un _id existente falla con duplicate key.
+        upsert y replace usan ReplaceOne por _id con upsert, así que reenviar
+        un batch (reintento o reanudación) no duplica ni falla. En replace la
+        colección recibida es la de staging.
         
         Args:
             collection_name: Nombre de la colección
-            documents: Lista de documentos a insertar
+            documents: Lista de documentos a escribir
+            load_mode: insert | upsert | replace
             
         Returns:
-            Número de documentos insertados
+            Número de documentos insertados o reemplazados
         """
+        from pymongo import InsertOne, ReplaceOne
+
         try:
             collection = self.db[collection_name]
             
             # Usar bulk_write para mejor rendimiento
-            operations = [InsertOne(doc) for doc in documents]
+            if load_mode == LoadModes.INSERT:
+                operations = [InsertOne(doc) for doc in documents]
+            else:
+                operations = [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in documents]
             result = await collection.bulk_write(operations, ordered=False)
             
-            logger.info(f"✅ Insertados {result.inserted_count} documentos en {collection_name}")
-            return result.inserted_count
+            written = result.inserted_count + result.upserted_count + result.matched_count
+            logger.info(f"✅ Escritos {written} documentos en {collection_name} ({load_mode})")
+            return written
             
         except Exception as e:
             logger.error(f"❌ Error en bulk insert: {e}")
             raise
     
+    async def swap_staging_collection(self, collection_name: str, load_id: str):
+        """
+        Reemplazar una colección por su staging de forma atómica
+        
+        renameCollection con dropTarget: los lectores ven la colección
+        anterior completa o la nueva completa, nunca una a medio cargar.
+        Los índices son los de la colección en staging.
+        
+        Args:
+            collection_name: Colección destino
+            load_id: ID de la carga replace
+        """
+        staging_name = self.get_staging_collection_name(collection_name, load_id)
+        try:
+            await self.db[staging_name].rename(collection_name, dropTarget=True)
+            logger.info(f"🔀 Colección {collection_name} reemplazada por {staging_name}")
+        except Exception as e:
+            logger.error(f"❌ Error intercambiando {staging_name}: {e}")
+            raise
+    
+    async def drop_staging_collection(self, collection_name: str, load_id: str):
+        """
+        Descartar la colección en staging de una carga replace fallida
+        
+        Args:
+            collection_name: Colección destino
+            load_id: ID de la carga replace
+        """
+        staging_name = self.get_staging_collection_name(collection_name, load_id)
+        await self.db.drop_collection(staging_name)
+        logger.info(f"🗑️ Staging {staging_name} descartado")
+    
     async def create_indexes(self, collection_name: str):
         """
         Crear índices para optimizar consultas
@@ -0,0 +1,114 @@
+"""
+Profiler Service - Profiling opcional por tarea
+"""
+import cProfile
+import io
+import logging
+import pstats
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerService:
+    """Servicio para perfilar tareas individuales con cProfile"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.profiles_dir = Path(self.settings.PROFILES_DIR)
+        # cProfile admite un solo profiler activo por hilo
+        self._active_task_id: Optional[str] = None
+
+    def get_profile_path(self, task_id: str) -> Path:
+        """
+        Ruta del archivo pstats de una tarea
+
+        Args:
+            task_id: ID de la tarea
+
+        Returns:
+            Ruta del archivo .pstats
+        """
+        return self.profiles_dir / f"{task_id}.pstats"
+
+    async def profile_task(
+            self,
+            task_id: str,
+            func: Callable[..., Awaitable[Any]],
+            *args,
+            **kwargs
+    ):
+        """
+        Ejecutar una tarea asíncrona bajo cProfile y guardar el resultado
+
+        El profiler mide el hilo del event loop mientras la tarea corre, por lo
+        que también registra otras corrutinas que se intercalen con ella. Si ya
+        hay otra tarea perfilándose, la tarea se ejecuta sin profiling.
+
+        Args:
+            task_id: ID de la tarea
+            func: Función asíncrona a ejecutar (ej. process_file_async)
+            *args: Argumentos posicionales de func
+            **kwargs: Argumentos nombrados de func
+        """
+        if self._active_task_id is not None:
+            logger.warning(
+                f"⚠️ Task {task_id}: profiling omitido, "
+                f"ya se está perfilando {self._active_task_id}"
+            )
+            await func(*args, **kwargs)
+            return
+
+        profiler = cProfile.Profile()
+        self._active_task_id = task_id
+        profiler.enable()
+
+        try:
+            await func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            self._active_task_id = None
+
+            self.profiles_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(self.get_profile_path(task_id)))
+            logger.info(f"🔬 Task {task_id}: profile guardado en {self.get_profile_path(task_id)}")
+
+    def get_profile(self, task_id: str) -> Optional[Path]:
+        """
+        Obtener el archivo pstats de una tarea
+
+        Args:
+            task_id: ID de la tarea
+
+        Returns:
+            Ruta del archivo o None si no existe
+        """
+        path = self.get_profile_path(task_id)
+        return path if path.is_file() else None
+
+    def render_text(self, task_id: str, sort_by: str = "cumulative", limit: int = 50) -> Optional[str]:
+        """
+        Renderizar el profile de una tarea como texto legible
+
+        Args:
+            task_id: ID de la tarea
+            sort_by: Criterio de orden de pstats (cumulative, tottime, calls...)
+            limit: Cantidad de funciones a mostrar
+
+        Returns:
+            Reporte en texto o None si no existe el profile
+        """
+        path = self.get_profile(task_id)
+        if path is None:
+            return None
+
+        output = io.StringIO()
+        stats = pstats.Stats(str(path), stream=output)
+        stats.strip_dirs().sort_stats(sort_by).print_stats(limit)
+        return output.getvalue()
+
+
+# Instancia global
+profiler_service = ProfilerService()
@@ -0,0 +1,167 @@
+"""
+Rate Limiter - Token buckets para el tráfico de bulk-import hacia ig-db-mongo
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+# Cada cuánto se descartan los buckets de clientes inactivos (ya repuestos)
+PRUNE_INTERVAL_SECONDS = 60.0
+# Clientes con esperas acumuladas publicados en /health (los que más esperaron)
+MAX_THROTTLED_CLIENTS = 100
+
+
+class TokenBucket:
+    """
+    Token bucket con reserva anticipada
+
+    Cada acquire descuenta sus tokens al momento (el saldo puede quedar
+    negativo) y duerme lo necesario hasta que la deuda se repone. Así las
+    peticiones se sirven en orden de llegada sin locks y una petición mayor
+    que la capacidad no queda bloqueada para siempre.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Descontar tokens y calcular la espera necesaria
+
+        Args:
+            amount: Tokens a consumir
+
+        Returns:
+            Segundos a esperar antes de usar los tokens
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+    def is_full(self, now: float) -> bool:
+        """True si ya se repuso por completo: equivale a un bucket nuevo"""
+        return self.tokens + (now - self.updated_at) * self.rate >= self.capacity
+
+
+class RateLimiter:
+    """
+    Limita filas/s y bytes/s enviados a ig-db-mongo, por client_id y global
+
+    Un límite en 0 lo desactiva. La ráfaga permitida es el límite por
+    RATE_LIMIT_BURST_SECONDS. Primero se espera el turno del cliente y recién
+    después se toman tokens globales: un cliente frenado por su propio límite
+    no deja en deuda al bucket global que comparten los demás.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.burst_seconds = self.settings.RATE_LIMIT_BURST_SECONDS
+        self.client_limits = (
+            self.settings.RATE_LIMIT_CLIENT_ROWS_PER_SECOND,
+            self.settings.RATE_LIMIT_CLIENT_MB_PER_SECOND * MB
+        )
+        self.global_buckets = self._new_buckets(
+            self.settings.RATE_LIMIT_GLOBAL_ROWS_PER_SECOND,
+            self.settings.RATE_LIMIT_GLOBAL_MB_PER_SECOND * MB
+        )
+        # client_id -> (bucket de filas, bucket de bytes)
+        self.client_buckets: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        # client_id -> segundos acumulados esperando por el límite (hasta MAX_THROTTLED_CLIENTS)
+        self.throttled_seconds: Dict[str, float] = {}
+        self._last_prune = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return any(self.client_limits) or any(self.global_buckets)
+
+    def _new_buckets(
+            self,
+            rows_per_second: float,
+            bytes_per_second: float
+    ) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        """Crear el par de buckets (filas, bytes); None donde no hay límite"""
+        return tuple(
+            TokenBucket(rate, rate * self.burst_seconds) if rate > 0 else None
+            for rate in (rows_per_second, bytes_per_second)
+        )
+
+    async def acquire(self, client_id: str, rows: int, nbytes: int) -> float:
+        """
+        Esperar hasta que el envío de un batch entre en los límites
+
+        Args:
+            client_id: ID del cliente
+            rows: Documentos del batch
+            nbytes: Tamaño del payload serializado
+
+        Returns:
+            Segundos esperados
+        """
+        if not self.enabled:
+            return 0.0
+
+        self._prune_idle_clients()
+        if client_id not in self.client_buckets:
+            self.client_buckets[client_id] = self._new_buckets(*self.client_limits)
+
+        # Primero el límite del cliente; los tokens globales se toman al enviar
+        wait = 0.0
+        for buckets in (self.client_buckets[client_id], self.global_buckets):
+            step = max(
+                (bucket.reserve(amount) for bucket, amount in zip(buckets, (rows, nbytes)) if bucket is not None),
+                default=0.0
+            )
+            if step > 0:
+                logger.debug(f"🚰 Cliente {client_id}: esperando {step:.2f}s por rate limit")
+                await asyncio.sleep(step)
+                wait += step
+
+        if wait > 0:
+            self._add_throttled(client_id, wait)
+
+        return wait
+
+    def _prune_idle_clients(self):
+        """Descartar los buckets de clientes ya repuestos (se recrean iguales al volver)"""
+        now = time.monotonic()
+        if now - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+
+        self._last_prune = now
+        for client_id, buckets in list(self.client_buckets.items()):
+            if all(bucket is None or bucket.is_full(now) for bucket in buckets):
+                del self.client_buckets[client_id]
+
+    def _add_throttled(self, client_id: str, seconds: float):
+        """Acumular la espera de un cliente; al superar el tope se descarta el que menos esperó"""
+        if client_id not in self.throttled_seconds and len(self.throttled_seconds) >= MAX_THROTTLED_CLIENTS:
+            del self.throttled_seconds[min(self.throttled_seconds, key=self.throttled_seconds.get)]
+        self.throttled_seconds[client_id] = self.throttled_seconds.get(client_id, 0.0) + seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Configuración y esperas acumuladas para /health"""
+        return {
+            "enabled": self.enabled,
+            "client_rows_per_second": self.settings.RATE_LIMIT_CLIENT_ROWS_PER_SECOND or None,
+            "client_mb_per_second": self.settings.RATE_LIMIT_CLIENT_MB_PER_SECOND or None,
+            "global_rows_per_second": self.settings.RATE_LIMIT_GLOBAL_ROWS_PER_SECOND or None,
+            "global_mb_per_second": self.settings.RATE_LIMIT_GLOBAL_MB_PER_SECOND or None,
+            "throttled_seconds": {
+                client_id: round(seconds, 2)
+                for client_id, seconds in self.throttled_seconds.items()
+            }
+        }
+
+
+# Instancia global
+rate_limiter = RateLimiter()
@@ -0,0 +1,213 @@
+"""
+Task History - Historial persistente de cargas terminadas
+
+El task_store solo guarda el estado vivo de cada tarea (en memoria en modo
+inprocess). Aquí cada tarea terminada deja una fila con sus métricas en una
+tabla SQLite de solo inserción, para responder a lo largo del tiempo cuánto
+tardan las cargas y qué cliente consume más capacidad de ingesta.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import get_settings
+from app.services.task_store import connect_sqlite
+from app.utils.metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+# Estados finales que se registran (interrupted se retoma y termina después)
+FINAL_STATUSES = ("completed", "completed_with_errors", "failed")
+
+# Columnas de la tabla en el orden de inserción
+COLUMNS = (
+    "task_id", "client_id", "business_name", "filename", "status", "load_mode",
+    "finished_at", "processing_seconds", "parse_seconds", "ship_seconds",
+    "total_rows", "rows_per_second", "file_bytes", "bytes_sent",
+    "total_batches", "failed_batches", "retries", "batch_p50_ms", "batch_p99_ms"
+)
+
+# Métricas por tarea resumidas con percentiles en /stats
+PERCENTILE_FIELDS = (
+    "rows_per_second", "processing_seconds", "parse_seconds", "ship_seconds", "batch_p99_ms"
+)
+PERCENTILES = (50, 95, 99)
+
+# Cada cuánto se borran las filas más viejas que la retención
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+class TaskHistory:
+    """Registro de solo inserción de tareas terminadas y sus agregados"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.enabled = self.settings.TASK_HISTORY_ENABLED
+        self.lock = threading.Lock()
+        self._conn = None
+        self._last_prune = 0.0
+
+    @property
+    def conn(self):
+        """Conexión abierta en el primer uso (no retrasa el arranque)"""
+        if self._conn is None:
+            conn = connect_sqlite(self.settings.TASK_HISTORY_DB_PATH)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS task_history ("
+                " task_id TEXT NOT NULL, client_id TEXT NOT NULL, business_name TEXT,"
+                " filename TEXT, status TEXT NOT NULL, load_mode TEXT,"
+                " finished_at REAL NOT NULL, processing_seconds REAL, parse_seconds REAL,"
+                " ship_seconds REAL, total_rows INTEGER, rows_per_second REAL,"
+                " file_bytes INTEGER, bytes_sent INTEGER, total_batches INTEGER,"
+                " failed_batches INTEGER, retries INTEGER, batch_p50_ms REAL, batch_p99_ms REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS task_history_client_time"
+                " ON task_history (client_id, finished_at)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS task_history_time ON task_history (finished_at)")
+            self._conn = conn
+        return self._conn
+
+    def record(self, task_id: str, status: Dict[str, Any]):
+        """
+        Registrar una tarea terminada
+
+        Los errores se registran en el log y no afectan a la tarea. Escribe
+        en SQLite: el task_processor lo llama en un hilo.
+
+        Args:
+            task_id: ID de la tarea
+            status: Estado final de la tarea (el mismo que devuelve /status)
+        """
+        if not self.enabled or status.get("status") not in FINAL_STATUSES:
+            return
+
+        stage_timings = status.get("stage_timings") or {}
+        batch_latency = status.get("batch_latency_ms") or {}
+        row = (
+            task_id,
+            status.get("client_id") or "",
+            status.get("business_name"),
+            status.get("filename"),
+            status["status"],
+            status.get("load_mode"),
+            time.time(),
+            status.get("processing_time_seconds"),
+            stage_timings.get("parse_seconds"),
+            stage_timings.get("ship_seconds"),
+            status.get("total_rows"),
+            status.get("rows_per_second"),
+            status.get("file_bytes"),
+            status.get("bytes_sent"),
+            status.get("total_batches"),
+            status.get("failed_batches"),
+            status.get("retries"),
+            batch_latency.get("p50"),
+            batch_latency.get("p99")
+        )
+
+        try:
+            with self.lock:
+                self.conn.execute(
+                    f"INSERT INTO task_history ({', '.join(COLUMNS)})"
+                    f" VALUES ({', '.join('?' * len(COLUMNS))})",
+                    row
+                )
+                self._prune()
+        except Exception as e:
+            logger.error(f"❌ Task {task_id}: Error registrando historial - {e}")
+
+    def _prune(self):
+        """Borrar lo que supera TASK_HISTORY_RETENTION_DAYS (como máximo una vez por hora)"""
+        retention_days = self.settings.TASK_HISTORY_RETENTION_DAYS
+        now = time.time()
+        if retention_days <= 0 or now - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return
+
+        self._last_prune = now
+        deleted = self.conn.execute(
+            "DELETE FROM task_history WHERE finished_at < ?", (now - retention_days * 86400,)
+        ).rowcount
+        if deleted:
+            logger.info(f"🧹 Historial de tareas: {deleted} filas con más de {retention_days} días eliminadas")
+
+    def stats(
+            self,
+            since: float,
+            until: float,
+            client_id: Optional[str] = None,
+            bucket_seconds: float = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Agregados por client_id y ventana de tiempo
+
+        Args:
+            since: Inicio de la ventana (epoch, inclusive)
+            until: Fin de la ventana (epoch, exclusivo)
+            client_id: Limitar a un cliente (None = todos)
+            bucket_seconds: Partir la ventana en tramos de este largo (0 = un solo tramo)
+
+        Returns:
+            Un grupo por (client_id, tramo) con conteos, totales y percentiles
+        """
+        query = f"SELECT {', '.join(COLUMNS)} FROM task_history WHERE finished_at >= ? AND finished_at < ?"
+        params: Tuple[Any, ...] = (since, until)
+        if client_id is not None:
+            query += " AND client_id = ?"
+            params += (client_id,)
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        # Los tramos se alinean a múltiplos de bucket_seconds (ej. horas en punto)
+        # y se recortan a la ventana pedida
+        groups: Dict[Tuple[str, float], List[Dict[str, Any]]] = defaultdict(list)
+        for values in rows:
+            task = dict(zip(COLUMNS, values))
+            bucket = task["finished_at"] // bucket_seconds * bucket_seconds if bucket_seconds > 0 else since
+            groups[(task["client_id"], bucket)].append(task)
+
+        summaries = []
+        for (group_client, bucket), tasks in sorted(groups.items()):
+            start = max(bucket, since)
+            end = min(bucket + bucket_seconds, until) if bucket_seconds > 0 else until
+            summaries.append(self._summarize(group_client, start, end, tasks))
+        return summaries
+
+    @staticmethod
+    def _summarize(client_id: str, start: float, end: float, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Resumir las tareas de un grupo"""
+        def total(field):
+            return sum(task[field] or 0 for task in tasks)
+
+        summary = {
+            "client_id": client_id,
+            "window_start": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+            "window_end": datetime.fromtimestamp(end, timezone.utc).isoformat(),
+            "tasks": len(tasks),
+            "by_status": {
+                status: sum(1 for task in tasks if task["status"] == status)
+                for status in FINAL_STATUSES
+            },
+            "total_rows": total("total_rows"),
+            "file_bytes": total("file_bytes"),
+            "bytes_sent": total("bytes_sent"),
+            "processing_seconds": round(total("processing_seconds"), 3),
+            "failed_batches": total("failed_batches"),
+            "retries": total("retries"),
+        }
+
+        # Tareas fallidas no tienen filas/s: solo cuentan en las métricas que sí registraron
+        summary["percentiles"] = {}
+        for field in PERCENTILE_FIELDS:
+            values = [task[field] for task in tasks if task[field] is not None]
+            summary["percentiles"][field] = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+
+        return summary
+
+
+# Instancia global
+task_history = TaskHistory()
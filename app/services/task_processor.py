@@ -1,28 +1,75 @@
 """
 Task Processor Service - Manejo de tareas en background
 """
+import asyncio
+import json
+import os
+import socket
 import time
 import logging
 import uuid
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator, Callable, List, Optional, Set, Tuple
 from app.services.file_processor import file_processor
 from app.client.mongo_client import mongo_client
+from app.services.admission_control import admission_controller
+from app.services.cache_service import response_cache
+from app.services.chunked_upload import chunked_uploads
+from app.services.circuit_breaker import mongo_breaker
+from app.services.local_index import local_index
+from app.services.profiler_service import profiler_service
+from app.services.task_history import task_history
+from app.services.task_queue import create_task_queue
+from app.services.task_store import create_task_store
+from app.services.type_coercion import TypeCoercer
+from app.dto.schemas import CoercionSpec, ColumnSpec
 from app.mapper.data_mapper import DataMapper
 from app.config.settings import get_settings
+from app.utils.metrics import percentile
+from app.utils.constants import ErrorMessages, LoadModes
 
 logger = logging.getLogger(__name__)
 
 
+class TaskInterrupted(Exception):
+    """La tarea se detuvo entre batches por apagado del servicio"""
+
+
 class TaskProcessor:
     """Servicio para procesar tareas en background"""
 
     def __init__(self):
         self.settings = get_settings()
         self.mapper = DataMapper()
-        # Almacenamiento en memoria (después reemplazar con Redis/DB)
-        self.task_store: Dict[str, Dict[str, Any]] = {}
+        # Estado en memoria (inprocess) o compartido entre workers (queue)
+        self.task_store = create_task_store()
+        self.task_queue = create_task_queue()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._queue_workers: List[asyncio.Task] = []
+        # task_id -> worker_id del loop que la tiene reclamada (modo queue)
+        self._leases: Dict[str, str] = {}
+        # Tareas cuyo reclamo venció y tomó otro worker: se dejan de tocar
+        self._lost_leases: Set[str] = set()
+
+        # Apagado ordenado
+        self.accepting = True
+        self._interrupt_requested = False
+        self._submitted: Set[asyncio.Task] = set()
+        # task_id -> (asyncio.Task que la ejecuta, evento de fin) mientras se ingiere
+        self._running: Dict[str, Tuple[asyncio.Task, asyncio.Event]] = {}
+        # task_id -> evento de fin mientras publica índice, cache e historial (no se cancela)
+        self._finishing: Dict[str, asyncio.Event] = {}
+
+        if self.task_queue is not None:
+            admission_controller.queue_depth_provider = self.task_queue.depth
 
-    def create_task(self, client_id: str, business_name: str, filename: str) -> str:
+    async def _store_call(self, func: Callable, *args):
+        """Ejecutar una operación del store; si hace I/O (SQLite) va en un thread"""
+        if self.task_store.blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def create_task(self, client_id: str, business_name: str, filename: str) -> str:
         """
         Crear una nueva tarea y retornar su ID
 
@@ -36,7 +83,7 @@ class TaskProcessor:
         """
         task_id = str(uuid.uuid4())
 
-        self.task_store[task_id] = {
+        await self._store_call(self.task_store.create, task_id, {
             "status": "queued",
             "progress": 0,
             "message": "Archivo recibido, en cola para procesamiento",
@@ -45,14 +92,14 @@ class TaskProcessor:
             "client_id": client_id,
             "business_name": business_name,
             "filename": filename
-        }
+        })
 
         logger.info(f"🆔 Task creado: {task_id}")
         print(f"🎫 [SOCKET] Task {task_id}: Creado y en cola")
 
         return task_id
 
-    def get_task_status(self, task_id: str) -> Dict[str, Any]:
+    async def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """
         Obtener el estado de una tarea
 
@@ -62,9 +109,9 @@ class TaskProcessor:
         Returns:
             Estado de la tarea o None si no existe
         """
-        return self.task_store.get(task_id)
+        return await self._store_call(self.task_store.get, task_id)
 
-    def update_task_status(
+    async def update_task_status(
             self,
             task_id: str,
             status: str,
@@ -75,39 +122,490 @@ class TaskProcessor:
         """
         Actualizar el estado de una tarea
 
+        No tiene efecto si la tarea la retomó otro worker (lease perdido).
+
         Args:100
             task_id: ID de la tarea
-            status: Estado actual (queued, processing, completed, failed)
+            status: Estado actual (queued, processing, completed, interrupted, failed)
             progress: Progreso en porcentaje (0-100)
             message: Mensaje descriptivo
             **kwargs: Campos adicionales
         """
-        if task_id in self.task_store:
-            self.task_store[task_id].update({
-                "status": status,
-                "progress": progress,
-                "message": message,
-                **kwargs
-            })
+        if task_id in self._lost_leases:
+            return
+
+        updated = await self._store_call(self.task_store.update, task_id, {
+            "status": status,
+            "progress": progress,
+            "message": message,
+            **kwargs
+        })
 
+        if updated:
             # Log para simular WebSocket
             emoji = {
                 "queued": "🎫",
                 "processing": "🔄",
                 "completed": "✅",
                 "completed_with_errors": "⚠️",
+                "interrupted": "⏸️",
                 "failed": "❌"
             }.get(status, "📊")
 
             print(f"{emoji} [SOCKET] Task {task_id}: {message}")
 
+    @staticmethod
+    def _build_metrics(
+            total_rows: int,
+            processing_time: float,
+            parse_seconds: float,
+            ship_seconds: float,
+            batch_latencies: List[float],
+            file_bytes: Optional[int],
+            transfer: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """
+        Construir las métricas de rendimiento de una tarea terminada
+
+        Args:
+            total_rows: Filas procesadas
+            processing_time: Tiempo total en segundos
+            parse_seconds: Tiempo esperando al parser
+            ship_seconds: Tiempo enviando batches a ig-db-mongo
+            batch_latencies: Latencia de cada bulk_import en segundos
+            file_bytes: Tamaño del archivo recibido (None en flujos)
+            transfer: Bytes enviados a ig-db-mongo y reintentos
+
+        Returns:
+            Campos de métricas para el estado de la tarea
+        """
+        def to_ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "rows_per_second": round(total_rows / processing_time, 1) if processing_time > 0 else 0,
+            "stage_timings": {
+                "parse_seconds": round(parse_seconds, 3),
+                "ship_seconds": round(ship_seconds, 3)
+            },
+            "batch_latency_ms": {
+                "p50": to_ms(percentile(batch_latencies, 50)),
+                "p99": to_ms(percentile(batch_latencies, 99)),
+                "max": to_ms(max(batch_latencies, default=None))
+            },
+            "file_bytes": file_bytes,
+            "bytes_sent": transfer["bytes_sent"],
+            "retries": transfer["retries"]
+        }
+
+    async def enqueue_file(
+            self,
+            task_id: str,
+            file_content: bytes,
+            filename: str,
+            client_id: str,
+            business_name: str,
+            csv_engine: Optional[str] = None,
+            coercion: Optional[CoercionSpec] = None,
+            column_spec: Optional[ColumnSpec] = None,
+            load_mode: Optional[str] = None,
+            profile: bool = False
+    ):
+        """
+        Guardar el archivo en el spool compartido y encolar la tarea (modo queue)
+
+        Cualquier worker/réplica con acceso a SPOOL_DIR y a la cola puede
+        reclamarla.
+
+        Args:
+            task_id: ID de la tarea
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            csv_engine: Motor de parseo CSV
+            coercion: Conversión de tipos por columna
+            column_spec: Columnas a leer/renombrar y columna del _id
+            load_mode: insert | upsert | replace
+            profile: Perfilar la tarea con cProfile
+        """
+        spool_path = self.spool_path(task_id)
+        spool_path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(spool_path.write_bytes, file_content)
+
+        await self.enqueue_spooled(
+            task_id, filename, client_id, business_name, csv_engine, coercion, column_spec, load_mode, profile
+        )
+
+    def spool_path(self, task_id: str) -> Path:
+        """Archivo de una tarea en el spool compartido (SPOOL_DIR)"""
+        return Path(self.settings.SPOOL_DIR) / task_id
+
+    async def enqueue_spooled(
+            self,
+            task_id: str,
+            filename: str,
+            client_id: str,
+            business_name: str,
+            csv_engine: Optional[str] = None,
+            coercion: Optional[CoercionSpec] = None,
+            column_spec: Optional[ColumnSpec] = None,
+            load_mode: Optional[str] = None,
+            profile: bool = False
+    ):
+        """
+        Encolar una tarea cuyo archivo ya está en spool_path(task_id) (modo queue)
+
+        Args:
+            task_id: ID de la tarea
+            filename: Nombre del archivo
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            csv_engine: Motor de parseo CSV
+            coercion: Conversión de tipos por columna
+            column_spec: Columnas a leer/renombrar y columna del _id
+            load_mode: insert | upsert | replace
+            profile: Perfilar la tarea con cProfile
+        """
+        spool_path = self.spool_path(task_id)
+        await asyncio.to_thread(self.task_queue.enqueue, task_id, {
+            "spool_path": str(spool_path),
+            "filename": filename,
+            "client_id": client_id,
+            "business_name": business_name,
+            "csv_engine": csv_engine,
+            "coercion": coercion.model_dump() if coercion else None,
+            "column_spec": column_spec.model_dump() if column_spec else None,
+            "load_mode": load_mode,
+            "profile": profile,
+            "skip_rows": 0
+        })
+        logger.info(f"📥 Task {task_id}: encolado ({spool_path})")
+
+    def submit(self, func: Callable, *args) -> asyncio.Task:
+        """
+        Lanzar una tarea en background desacoplada de la request (modo inprocess)
+
+        A diferencia de BackgroundTasks, la conexión HTTP se cierra al responder,
+        así uvicorn no bloquea el apagado y el drenaje queda en manos de shutdown().
+
+        Args:
+            func: Corrutina a ejecutar
+            *args: Argumentos de la corrutina
+
+        Returns:
+            asyncio.Task creada
+        """
+        task = asyncio.create_task(func(*args))
+        self._submitted.add(task)
+        task.add_done_callback(self._submitted.discard)
+        return task
+
+    async def shutdown(self):
+        """
+        Apagado ordenado
+
+        1. Deja de aceptar cargas (503) y de reclamar tareas de la cola.
+        2. Espera hasta SHUTDOWN_DRAIN_SECONDS a que terminen las tareas en curso.
+        3. Pide a las restantes que paren tras su batch actual y guarden un
+           checkpoint; espera hasta SHUTDOWN_CHECKPOINT_GRACE_SECONDS.
+        4. Cancela lo que siga en vuelo y espera a que guarde el checkpoint del
+           último batch confirmado. Las tareas que ya terminaron de enviar no se
+           cancelan: se espera a que publiquen el índice local y el historial.
+        """
+        self.accepting = False
+        admission_controller.draining = True
+
+        if self._running:
+            logger.info(
+                f"🛑 Drenando {len(self._running)} tareas en curso "
+                f"(máx {self.settings.SHUTDOWN_DRAIN_SECONDS}s)"
+            )
+            await self._wait_running(self.settings.SHUTDOWN_DRAIN_SECONDS)
+
+        if self._running:
+            logger.warning(f"⏸️ {len(self._running)} tareas sin terminar: checkpoint tras el batch actual")
+            self._interrupt_requested = True
+            await self._wait_running(self.settings.SHUTDOWN_CHECKPOINT_GRACE_SECONDS)
+
+        for task_id, (task, _) in list(self._running.items()):
+            logger.warning(f"⏹️ Task {task_id}: cancelada con el batch en vuelo")
+            task.cancel()
+        # Las canceladas ya no envían nada: solo falta que escriban su checkpoint
+        await self._wait_running(None)
+
+        await self.stop_queue_workers()
+
+    async def _wait_running(self, timeout: Optional[float]):
+        """Esperar a que terminen las tareas en curso, como máximo timeout segundos (None = sin límite)"""
+        events = [done for _, done in self._running.values()] + list(self._finishing.values())
+        waiters = [asyncio.create_task(done.wait()) for done in events]
+        if not waiters:
+            return
+        _, pending = await asyncio.wait(waiters, timeout=timeout)
+        for waiter in pending:
+            waiter.cancel()
+
+    def _save_checkpoint(
+            self,
+            task_id: str,
+            file_content: bytes,
+            filename: str,
+            client_id: str,
+            business_name: str,
+            csv_engine: Optional[str],
+            coercion: Optional[CoercionSpec],
+            column_spec: Optional[ColumnSpec],
+            load_mode: Optional[str],
+            skip_rows: int
+    ):
+        """
+        Guardar lo necesario para retomar una tarea interrumpida
+
+        En modo queue se reencola apuntando al archivo ya guardado en el spool;
+        en modo inprocess se escriben el archivo y sus metadatos en CHECKPOINT_DIR.
+
+        Args:
+            task_id: ID de la tarea
+            file_content: Contenido del archivo en bytes
+            filename: Nombre del archivo
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            csv_engine: Motor de parseo CSV
+            coercion: Conversión de tipos por columna
+            column_spec: Columnas a leer/renombrar y columna del _id
+            load_mode: insert | upsert | replace
+            skip_rows: Filas ya enviadas que se saltan al retomar
+        """
+        meta = {
+            "filename": filename,
+            "client_id": client_id,
+            "business_name": business_name,
+            "csv_engine": csv_engine,
+            "coercion": coercion.model_dump() if coercion else None,
+            "column_spec": column_spec.model_dump() if column_spec else None,
+            "load_mode": load_mode,
+            "skip_rows": skip_rows
+        }
+
+        if self.task_queue is not None:
+            spool_path = self.spool_path(task_id)
+            payload = {"spool_path": str(spool_path), "profile": False, **meta}
+            if not self.task_queue.requeue(task_id, self._leases.get(task_id), payload):
+                # Otro worker ya la reclamó: el checkpoint es suyo
+                self._lost_leases.add(task_id)
+                logger.warning(f"⚠️ Task {task_id}: lease perdido, no se reencola")
+                return
+            logger.info(f"💾 Task {task_id}: reencolado desde la fila {skip_rows}")
+            return
+
+        checkpoint_dir = Path(self.settings.CHECKPOINT_DIR)
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        # Primero el archivo; el .json es lo que marca el checkpoint como completo
+        (checkpoint_dir / f"{task_id}.bin").write_bytes(file_content)
+        meta_path = checkpoint_dir / f"{task_id}.json"
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, meta_path)
+        logger.info(f"💾 Task {task_id}: checkpoint en {meta_path} (fila {skip_rows})")
+
+    def resume_checkpoints(self) -> int:
+        """
+        Retomar las tareas interrumpidas en el apagado anterior (modo inprocess)
+
+        Returns:
+            Número de tareas retomadas
+        """
+        checkpoint_dir = Path(self.settings.CHECKPOINT_DIR)
+        if not checkpoint_dir.is_dir():
+            return 0
+
+        resumed = 0
+        for meta_path in sorted(checkpoint_dir.glob("*.json")):
+            task_id = meta_path.stem
+            try:
+                meta = json.loads(meta_path.read_text())
+                file_content = (checkpoint_dir / f"{task_id}.bin").read_bytes()
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Checkpoint {meta_path} ilegible: {e}")
+                continue
+
+            self.task_store.create(task_id, {
+                "status": "queued",
+                "progress": 0,
+                "message": f"Retomando desde la fila {meta['skip_rows']}",
+                "total_rows": meta["skip_rows"],
+                "processed_rows": meta["skip_rows"],
+                "client_id": meta["client_id"],
+                "business_name": meta["business_name"],
+                "filename": meta["filename"]
+            })
+            admission_controller.reserve(task_id, len(file_content))
+            self.submit(self._resume_checkpoint, task_id, file_content, meta)
+            resumed += 1
+
+        if resumed:
+            logger.info(f"▶️ {resumed} tareas retomadas desde checkpoint")
+        return resumed
+
+    async def _resume_checkpoint(self, task_id: str, file_content: bytes, meta: Dict[str, Any]):
+        """Procesar una tarea desde su checkpoint y borrarlo si no vuelve a interrumpirse"""
+        await self.process_file_async(
+            task_id,
+            file_content,
+            meta["filename"],
+            meta["client_id"],
+            meta["business_name"],
+            meta.get("csv_engine"),
+            CoercionSpec(**meta["coercion"]) if meta.get("coercion") else None,
+            ColumnSpec(**meta["column_spec"]) if meta.get("column_spec") else None,
+            meta.get("load_mode"),
+            skip_rows=meta["skip_rows"]
+        )
+
+        if (await self.get_task_status(task_id) or {}).get("status") != "interrupted":
+            checkpoint_dir = Path(self.settings.CHECKPOINT_DIR)
+            (checkpoint_dir / f"{task_id}.json").unlink(missing_ok=True)
+            (checkpoint_dir / f"{task_id}.bin").unlink(missing_ok=True)
+
+    def start_queue_workers(self):
+        """Arrancar los loops que reclaman tareas de la cola (modo queue)"""
+        if self.task_queue is None or self._queue_workers:
+            return
+
+        # Un worker_id por loop: el reclamo de una tarea es de un solo loop
+        for n in range(self.settings.QUEUE_WORKER_CONCURRENCY):
+            worker_id = f"{self.worker_id}/{n}"
+            self._queue_workers.append(asyncio.create_task(self._queue_worker_loop(worker_id)))
+
+        logger.info(f"👷 {len(self._queue_workers)} workers de cola iniciados ({self.worker_id})")
+
+    async def stop_queue_workers(self):
+        """Detener los loops de la cola; las tareas a medias se retoman al vencer su lease"""
+        for worker in self._queue_workers:
+            worker.cancel()
+        await asyncio.gather(*self._queue_workers, return_exceptions=True)
+        self._queue_workers = []
+
+    async def _queue_worker_loop(self, worker_id: str):
+        """
+        Reclamar y procesar tareas de la cola hasta el apagado
+
+        Args:
+            worker_id: Identificador de este loop en la cola
+        """
+        while self.accepting:
+            try:
+                for dead_task_id in await asyncio.to_thread(self.task_queue.reap_dead):
+                    await self.update_task_status(
+                        task_id=dead_task_id,
+                        status="failed",
+                        progress=0,
+                        message="Error: la tarea agotó sus intentos de procesamiento",
+                        error_detail="max_attempts"
+                    )
+                    await asyncio.to_thread(task_history.record, dead_task_id, await self.get_task_status(dead_task_id) or {})
+
+                claimed = await asyncio.to_thread(self.task_queue.claim, worker_id)
+            except Exception as e:
+                logger.error(f"❌ Error consultando la cola de tareas: {e}")
+                claimed = None
+
+            if claimed is None:
+                await asyncio.sleep(self.settings.QUEUE_POLL_INTERVAL_SECONDS)
+                continue
+
+            await self._run_claimed_task(*claimed, worker_id)
+
+    async def _run_claimed_task(self, task_id: str, payload: Dict[str, Any], worker_id: str):
+        """
+        Procesar una tarea reclamada de la cola
+
+        Si el reclamo vence y otra réplica retoma la tarea, esta se detiene tras
+        el batch en curso sin tocar el estado, la fila de la cola ni el spool.
+
+        Args:
+            task_id: ID de la tarea
+            payload: Datos encolados por enqueue_file
+            worker_id: Loop que la reclamó
+        """
+        logger.info(f"👷 Task {task_id}: reclamado por {worker_id}")
+        spool_path = Path(payload["spool_path"])
+        self._leases[task_id] = worker_id
+        heartbeat = asyncio.create_task(self._heartbeat_loop(task_id, worker_id))
+
+        try:
+            file_content = await asyncio.to_thread(spool_path.read_bytes)
+            process_args = (
+                task_id,
+                file_content,
+                payload["filename"],
+                payload["client_id"],
+                payload["business_name"],
+                payload.get("csv_engine"),
+                CoercionSpec(**payload["coercion"]) if payload.get("coercion") else None,
+                ColumnSpec(**payload["column_spec"]) if payload.get("column_spec") else None,
+                payload.get("load_mode"),
+                payload.get("skip_rows", 0)
+            )
+
+            if payload.get("profile"):
+                await profiler_service.profile_task(task_id, self.process_file_async, *process_args)
+            else:
+                await self.process_file_async(*process_args)
+
+            if task_id in self._lost_leases:
+                # La retomó otro worker: la fila de cola y el spool son suyos
+                return
+            if (await self.get_task_status(task_id) or {}).get("status") == "interrupted":
+                # Reencolada con su checkpoint: conservar fila de cola y spool
+                return
+
+        except FileNotFoundError:
+            await self.update_task_status(
+                task_id=task_id,
+                status="failed",
+                progress=0,
+                message="Error: archivo no encontrado en el spool",
+                error_detail=str(spool_path)
+            )
+            await asyncio.to_thread(task_history.record, task_id, await self.get_task_status(task_id) or {})
+        finally:
+            heartbeat.cancel()
+            self._leases.pop(task_id, None)
+            self._lost_leases.discard(task_id)
+
+        if await asyncio.to_thread(self.task_queue.complete, task_id, worker_id):
+            spool_path.unlink(missing_ok=True)
+
+    async def _heartbeat_loop(self, task_id: str, worker_id: str):
+        """Renovar el lease de una tarea mientras se procesa; marcarlo perdido si otro worker la tomó"""
+        interval = self.settings.QUEUE_LEASE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                owned = await asyncio.to_thread(self.task_queue.heartbeat, task_id, worker_id)
+            except Exception as e:
+                logger.error(f"❌ Task {task_id}: error renovando lease - {e}")
+                continue
+
+            if not owned:
+                self._lost_leases.add(task_id)
+                logger.warning(f"⚠️ Task {task_id}: lease perdido, se detiene tras el batch actual")
+                return
+
     async def process_file_async(
             self,
             task_id: str,
             file_content: bytes,
             filename: str,
             client_id: str,
-            business_name: str
+            business_name: str,
+            csv_engine: Optional[str] = None,
+            coercion: Optional[CoercionSpec] = None,
+            column_spec: Optional[ColumnSpec] = None,
+            load_mode: Optional[str] = None,
+            skip_rows: int = 0
     ):
         """
         Procesar archivo en background y actualizar estado
@@ -116,14 +614,171 @@ class TaskProcessor:
             task_id: ID de la tarea
             file_content: Contenido del archivo en bytes
             filename: Nombre del archivo
-            cliente: Nombre del cliente
-            numero_cliente: ID del cliente
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            csv_engine: Motor de parseo CSV (por defecto CSV_ENGINE)
+            coercion: Conversión de tipos por columna (None = todo string)
+            column_spec: Columnas a leer/renombrar y columna del _id (None = todas)
+            load_mode: insert | upsert | replace (por defecto LOAD_MODE)
+            skip_rows: Filas ya enviadas en una ejecución anterior (checkpoint)
+        """
+        def on_interrupt(rows_done: int):
+            self._save_checkpoint(
+                task_id, file_content, filename, client_id, business_name,
+                csv_engine, coercion, column_spec, load_mode, rows_done
+            )
+
+        try:
+            await self._ingest_batches(
+                task_id=task_id,
+                batches=file_processor.process_file(
+                    file_content, filename, csv_engine=csv_engine, column_spec=column_spec
+                ),
+                client_id=client_id,
+                business_name=business_name,
+                coercion=coercion,
+                load_mode=load_mode,
+                skip_rows=skip_rows,
+                on_interrupt=on_interrupt,
+                file_bytes=len(file_content)
+            )
+        finally:
+            # El contenido del archivo deja de estar retenido
+            admission_controller.release(task_id)
+
+    async def process_stream_async(
+            self,
+            task_id: str,
+            chunks: AsyncIterator[bytes],
+            filename: str,
+            client_id: str,
+            business_name: str,
+            coercion: Optional[CoercionSpec] = None,
+            column_spec: Optional[ColumnSpec] = None,
+            load_mode: Optional[str] = None
+    ):
+        """
+        Procesar un flujo NDJSON (o CSV, según filename) a medida que llega y actualizar estado
+
+        Los batches se envían a ig-db-mongo mientras el cuerpo de la request
+        todavía se está recibiendo.
+
+        Args:
+            task_id: ID de la tarea
+            chunks: Iterador asíncrono con los bytes del cuerpo de la request
+            filename: Nombre lógico del flujo
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            coercion: Conversión de tipos por columna (None = sin conversión)
+            column_spec: Claves a conservar/renombrar y clave del _id (None = todas)
+            load_mode: insert | upsert | replace (por defecto LOAD_MODE)
+        """
+        await self._ingest_batches(
+            task_id=task_id,
+            batches=file_processor.process_stream(chunks, filename, column_spec),
+            client_id=client_id,
+            business_name=business_name,
+            coercion=coercion,
+            load_mode=load_mode
+        )
+
+    async def process_upload_async(
+            self,
+            task_id: str,
+            filename: str,
+            client_id: str,
+            business_name: str,
+            coercion: Optional[CoercionSpec] = None,
+            column_spec: Optional[ColumnSpec] = None,
+            load_mode: Optional[str] = None
+    ):
+        """
+        Procesar una subida por partes (CSV/NDJSON) mientras se reciben las partes
+
+        Cada parte se parsea y envía en cuanto llegan todas las anteriores.
+        Al terminar, con éxito o no, se borran las partes.
+
+        Args:
+            task_id: ID de la tarea (el mismo que el de la subida)
+            filename: Nombre del archivo
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            coercion: Conversión de tipos por columna (None = sin conversión)
+            column_spec: Columnas a leer/renombrar y columna del _id (None = todas)
+            load_mode: insert | upsert | replace (por defecto LOAD_MODE)
+        """
+        try:
+            await self.process_stream_async(
+                task_id,
+                chunked_uploads.iter_parts(task_id),
+                filename,
+                client_id,
+                business_name,
+                coercion,
+                column_spec,
+                load_mode
+            )
+        finally:
+            admission_controller.release(task_id)
+            chunked_uploads.remove(task_id)
+
+    async def _ingest_batches(
+            self,
+            task_id: str,
+            batches: AsyncIterator[List[Dict[str, Any]]],
+            client_id: str,
+            business_name: str,
+            coercion: Optional[CoercionSpec] = None,
+            load_mode: Optional[str] = None,
+            skip_rows: int = 0,
+            on_interrupt: Optional[Callable[[int], None]] = None,
+            file_bytes: Optional[int] = None
+    ):
+        """
+        Enviar batches a ig-db-mongo y actualizar el estado de la tarea
+
+        Si el servicio se apaga a mitad, la tarea se detiene entre batches y
+        on_interrupt recibe las filas ya enviadas para guardar un checkpoint.
+
+        En modo replace los batches van a una colección en staging (loadId =
+        task_id, la misma al retomar) que solo reemplaza a la destino si
+        todos los batches se guardaron; si no, el staging se descarta.
+
+        Args:
+            task_id: ID de la tarea
+            batches: Iterador asíncrono de batches de documentos
+            client_id: ID del cliente
+            business_name: Nombre del negocio
+            coercion: Conversión de tipos aplicada a cada batch tras el parseo
+            load_mode: insert | upsert | replace (por defecto LOAD_MODE)
+            skip_rows: Filas iniciales a saltar (ya enviadas antes del checkpoint)
+            on_interrupt: Callback para guardar el checkpoint (None = no retomable)
+            file_bytes: Tamaño del archivo (para el historial; None en flujos)
         """
         start_time = time.time()
+        # Bytes enviados a ig-db-mongo y reintentos, acumulados por mongo_client
+        transfer = {"bytes_sent": 0, "retries": 0}
+        index_writer = None
+        load_mode = load_mode or self.settings.LOAD_MODE
+        load_id = task_id if load_mode == LoadModes.REPLACE else None
+        # Replace: True cuando la colección en staging ya reemplazó a la destino
+        replaced = False
+        # Filas cuyo batch ya terminó de enviarse (punto de reanudación)
+        rows_done = skip_rows
+        done = asyncio.Event()
+        self._running[task_id] = (asyncio.current_task(), done)
+
+        # La conversión va antes del salto de filas: al retomar se infiere el mismo esquema
+        coercer = TypeCoercer(coercion) if coercion is not None else None
+        if coercer is not None:
+            batches = coercer.coerce_batches(batches)
 
         try:
+            # Índice local opcional con los batches guardados con éxito
+            index_writer = local_index.open_writer(client_id, business_name, task_id)
+
             # Estado: iniciando procesamiento
-            self.update_task_status(
+            await self.update_task_status(
                 task_id=task_id,
                 status="processing",
                 progress=0,
@@ -134,10 +789,34 @@ class TaskProcessor:
 
             # Procesar archivo en batches
             total_rows = 0
+            rows_skipped = 0
             batch_count = 0
             failed_batches = 0
 
-            async for batch in file_processor.process_file(file_content, filename):
+            # Tiempos por etapa: parseo (espera del siguiente batch) y envío
+            parse_seconds = 0.0
+            ship_seconds = 0.0
+            batch_latencies = []
+            parse_start = time.perf_counter()
+
+            async for batch in batches:
+                parse_seconds += time.perf_counter() - parse_start
+
+                # Un batch vacío no se envía (ig-db-mongo recibiría un request sin datos)
+                if not batch:
+                    parse_start = time.perf_counter()
+                    continue
+
+                # Reanudación: descartar lo enviado antes del checkpoint
+                if rows_skipped < skip_rows:
+                    drop = min(len(batch), skip_rows - rows_skipped)
+                    rows_skipped += drop
+                    total_rows += drop
+                    batch = batch[drop:]
+                    if not batch:
+                        parse_start = time.perf_counter()
+                        continue
+
                 batch_count += 1
                 batch_size = len(batch)
                 total_rows += batch_size
@@ -146,7 +825,7 @@ class TaskProcessor:
                 progress = min(int((total_rows / 100000) * 100), 99)
 
                 # Actualizar estado
-                self.update_task_status(
+                await self.update_task_status(
                     task_id=task_id,
                     status="processing",
                     progress=progress,
@@ -158,24 +837,65 @@ class TaskProcessor:
 
                 logger.info(f"📦 Task {task_id}: Batch {batch_count} ({batch_size} docs)")
 
-                # Enviar batch a ig-db-mongo
+                if not mongo_breaker.is_closed:
+                    await self.update_task_status(
+                        task_id=task_id,
+                        status="processing",
+                        progress=progress,
+                        message=f"En pausa: ig-db-mongo no disponible (batch {batch_count})",
+                        total_rows=total_rows,
+                        processed_rows=total_rows,
+                        current_batch=batch_count
+                    )
+
+                # Enviar batch a ig-db-mongo (espera si el circuito está abierto)
+                ship_start = time.perf_counter()
                 success = await mongo_client.bulk_import(
                     business_name=business_name,
                     client_id=client_id,
-                    all_documents=batch
+                    all_documents=batch,
+                    load_mode=load_mode,
+                    load_id=load_id,
+                    transfer=transfer
                 )
+                batch_latency = time.perf_counter() - ship_start
+                ship_seconds += batch_latency
+                batch_latencies.append(batch_latency)
 
+                if not success and load_id is not None:
+                    # Un replace parcial no debe publicarse: no tiene sentido seguir
+                    raise RuntimeError(ErrorMessages.REPLACE_BATCH_FAILED.format(batch=batch_count))
                 if not success:
                     failed_batches += 1
                     logger.error(f"❌ Task {task_id}: Falló batch {batch_count}")
+                elif index_writer is not None:
+                    await asyncio.to_thread(index_writer.add_batch, batch)
+
+                rows_done = total_rows
+                if self._interrupt_requested or task_id in self._lost_leases:
+                    raise TaskInterrupted()
+
+                parse_start = time.perf_counter()
+
+            if load_id is not None:
+                if not await mongo_client.commit_replace(client_id, business_name, load_id):
+                    raise RuntimeError(ErrorMessages.REPLACE_COMMIT_FAILED)
+                replaced = True
 
             # Calcular tiempo de procesamiento
             processing_time = time.time() - start_time
             collection_name = self.mapper.build_collection_name(business_name, client_id)
+            metrics = self._build_metrics(
+                total_rows, processing_time, parse_seconds, ship_seconds, batch_latencies,
+                file_bytes, transfer
+            )
+            if coercer is not None:
+                metrics["column_types"] = coercer.schema or {}
+                metrics["coercion_errors"] = coercer.errors
 
             # Estado final
             if failed_batches == 0:
-                self.update_task_status(
+                await self.update_task_status(
                     task_id=task_id,
                     status="completed",
                     progress=100,
@@ -185,12 +905,14 @@ class TaskProcessor:
                     collection_name=collection_name,
                     processing_time_seconds=round(processing_time, 2),
                     total_batches=batch_count,
-                    failed_batches=0
+                    failed_batches=0,
+                    load_mode=load_mode,
+                    **metrics
                 )
                 logger.info(f"✅ Task {task_id}: Completado - {total_rows} docs en {processing_time:.2f}s")
 
             else:
-                self.update_task_status(
+                await self.update_task_status(
                     task_id=task_id,
                     status="completed_with_errors",
                     progress=100,
@@ -200,23 +922,116 @@ class TaskProcessor:
                     collection_name=collection_name,
                     processing_time_seconds=round(processing_time, 2),
                     total_batches=batch_count,
-                    failed_batches=failed_batches
+                    failed_batches=failed_batches,
+                    load_mode=load_mode,
+                    **metrics
                 )
                 logger.warning(f"⚠️ Task {task_id}: Completado con {failed_batches} errores")
 
+        except TaskInterrupted:
+            await self._mark_interrupted(task_id, rows_done, on_interrupt)
+
+        except asyncio.CancelledError:
+            # Cancelada con un batch en vuelo: se retoma desde el último confirmado
+            await self._mark_interrupted(task_id, rows_done, on_interrupt)
+            raise
+
         except Exception as e:
+            # La colección destino queda como estaba; el staging se descarta antes de informar el fallo
+            if load_id is not None and not replaced:
+                await mongo_client.abort_replace(client_id, business_name, load_id)
+
             # Estado de error
-            self.update_task_status(
+            await self.update_task_status(
                 task_id=task_id,
                 status="failed",
                 progress=0,
                 message=f"Error: {str(e)}",
                 total_rows=0,
                 processed_rows=0,
-                error_detail=str(e)
+                error_detail=str(e),
+                processing_time_seconds=round(time.time() - start_time, 2),
+                load_mode=load_mode,
+                file_bytes=file_bytes,
+                **transfer
             )
             logger.error(f"❌ Task {task_id}: Error - {e}", exc_info=True)
 
+        finally:
+            # Fuera de _running el apagado ya no la cancela, pero espera a que termine de publicar
+            self._running.pop(task_id, None)
+            self._finishing[task_id] = done
+
+            try:
+                # Publicar en el índice local lo que sí llegó a ig-db-mongo
+                if index_writer is not None and load_id is not None and not replaced:
+                    # Replace sin terminar: la colección visible no cambió
+                    try:
+                        await asyncio.to_thread(index_writer.abort)
+                    except Exception as e:
+                        logger.error(f"❌ Task {task_id}: Error descartando índice local - {e}")
+                elif index_writer is not None:
+                    try:
+                        await asyncio.to_thread(index_writer.commit, replaced)
+                    except Exception as e:
+                        logger.error(f"❌ Task {task_id}: Error publicando índice local - {e}")
+                        try:
+                            await asyncio.to_thread(index_writer.abort)
+                        except Exception as e:
+                            logger.error(f"❌ Task {task_id}: Error descartando índice local - {e}")
+
+                # La colección cambió (aunque sea parcialmente): descartar lo cacheado
+                response_cache.invalidate_collection(client_id, business_name)
+
+                # Solo los estados finales quedan en el historial (interrupted se retoma)
+                if task_id not in self._lost_leases:
+                    await asyncio.to_thread(task_history.record, task_id, await self.get_task_status(task_id) or {})
+            finally:
+                self._finishing.pop(task_id, None)
+                done.set()
+
+    async def _mark_interrupted(
+            self,
+            task_id: str,
+            rows_done: int,
+            on_interrupt: Optional[Callable[[int], None]]
+    ):
+        """
+        Marcar una tarea como interrumpida y guardar su checkpoint
+
+        Args:
+            task_id: ID de la tarea
+            rows_done: Filas enviadas por completo
+            on_interrupt: Callback que guarda el checkpoint (None = no retomable)
+        """
+        if task_id in self._lost_leases:
+            logger.warning(f"⏸️ Task {task_id}: detenida tras {rows_done} filas, la retoma otro worker")
+            return
+
+        resumable = False
+        if on_interrupt is not None:
+            try:
+                await asyncio.to_thread(on_interrupt, rows_done)
+                resumable = True
+            except Exception as e:
+                logger.error(f"❌ Task {task_id}: Error guardando checkpoint - {e}", exc_info=True)
+
+        message = (
+            f"Interrumpido por apagado del servicio. Se retomará desde la fila {rows_done}."
+            if resumable else
+            f"Interrumpido por apagado del servicio tras {rows_done} filas."
+        )
+        await self.update_task_status(
+            task_id=task_id,
+            status="interrupted",
+            progress=min(int((rows_done / 100000) * 100), 99),
+            message=message,
+            total_rows=rows_done,
+            processed_rows=rows_done,
+            resumable=resumable
+        )
+        logger.warning(f"⏸️ Task {task_id}: {message}")
+
 
 # Instancia global
 task_processor = TaskProcessor()
\ No newline at end of file
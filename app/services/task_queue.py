@@ -0,0 +1,164 @@
+"""
+Task Queue - Cola compartida de tareas para el modo multi-worker
+"""
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from app.config.settings import get_settings
+from app.services.task_store import connect_sqlite, immediate_transaction
+
+logger = logging.getLogger(__name__)
+
+
+class TaskQueue(ABC):
+    """
+    Interfaz de cola de tareas
+
+    Las implementaciones deben garantizar que una tarea encolada sea
+    reclamada por un solo worker a la vez, y que los reclamos sin heartbeat
+    dentro de QUEUE_LEASE_SECONDS vuelvan a estar disponibles. Las operaciones
+    sobre una tarea reclamada solo tienen efecto si el reclamo sigue siendo
+    del worker que las pide.
+
+    Los métodos hacen I/O bloqueante: llamarlos desde un thread (asyncio.to_thread).
+    """
+
+    @abstractmethod
+    def enqueue(self, task_id: str, payload: Dict[str, Any]):
+        """Encolar una tarea"""
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Reclamar la siguiente tarea disponible; None si no hay"""
+
+    @abstractmethod
+    def heartbeat(self, task_id: str, worker_id: str) -> bool:
+        """Renovar el reclamo de una tarea en curso; False si ya no es de worker_id"""
+
+    @abstractmethod
+    def requeue(self, task_id: str, worker_id: str, payload: Dict[str, Any]) -> bool:
+        """Devolver a la cola una tarea reclamada (checkpoint); False si ya no es de worker_id"""
+
+    @abstractmethod
+    def complete(self, task_id: str, worker_id: str) -> bool:
+        """Quitar una tarea terminada de la cola; False si ya no es de worker_id"""
+
+    @abstractmethod
+    def reap_dead(self) -> List[str]:
+        """Retirar tareas que agotaron sus intentos; devuelve sus IDs"""
+
+    @abstractmethod
+    def depth(self) -> int:
+        """Cantidad de tareas pendientes o en curso"""
+
+
+class SqliteTaskQueue(TaskQueue):
+    """Cola en SQLite: sirve para varios workers en el mismo host o volumen compartido"""
+
+    def __init__(self, db_path: str, lease_seconds: float, max_attempts: int):
+        self.conn = connect_sqlite(db_path)
+        self.lock = threading.Lock()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_queue ("
+            " task_id TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " worker_id TEXT,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " enqueued_at REAL NOT NULL,"
+            " heartbeat_at REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_task_queue_state ON task_queue (state, enqueued_at)")
+
+    def enqueue(self, task_id: str, payload: Dict[str, Any]):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO task_queue (task_id, payload, state, attempts, enqueued_at)"
+                " VALUES (?, ?, 'queued', 0, ?)",
+                (task_id, json.dumps(payload), time.time())
+            )
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        now = time.time()
+        with immediate_transaction(self.conn, self.lock):
+            row = self.conn.execute(
+                "SELECT task_id, payload FROM task_queue"
+                " WHERE attempts < ? AND (state = 'queued' OR (state = 'claimed' AND heartbeat_at < ?))"
+                " ORDER BY enqueued_at LIMIT 1",
+                (self.max_attempts, now - self.lease_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self.conn.execute(
+                "UPDATE task_queue SET state = 'claimed', worker_id = ?, heartbeat_at = ?,"
+                " attempts = attempts + 1 WHERE task_id = ?",
+                (worker_id, now, row[0])
+            )
+
+        return row[0], json.loads(row[1])
+
+    def heartbeat(self, task_id: str, worker_id: str) -> bool:
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE task_queue SET heartbeat_at = ? WHERE task_id = ? AND worker_id = ?",
+                (time.time(), task_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def requeue(self, task_id: str, worker_id: str, payload: Dict[str, Any]) -> bool:
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE task_queue SET payload = ?, state = 'queued', worker_id = NULL, heartbeat_at = NULL,"
+                " attempts = 0, enqueued_at = ? WHERE task_id = ? AND worker_id = ?",
+                (json.dumps(payload), time.time(), task_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, task_id: str, worker_id: str) -> bool:
+        with self.lock:
+            cursor = self.conn.execute(
+                "DELETE FROM task_queue WHERE task_id = ? AND worker_id = ?",
+                (task_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def reap_dead(self) -> List[str]:
+        with immediate_transaction(self.conn, self.lock):
+            rows = self.conn.execute(
+                "SELECT task_id FROM task_queue"
+                " WHERE state = 'claimed' AND heartbeat_at < ? AND attempts >= ?",
+                (time.time() - self.lease_seconds, self.max_attempts)
+            ).fetchall()
+            self.conn.executemany("DELETE FROM task_queue WHERE task_id = ?", rows)
+        return [row[0] for row in rows]
+
+    def depth(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM task_queue").fetchone()[0]
+
+
+def create_task_queue() -> Optional[TaskQueue]:
+    """
+    Crear la cola según WORKER_MODE / QUEUE_BACKEND
+
+    Returns:
+        Cola de tareas o None en modo inprocess
+    """
+    settings = get_settings()
+    if settings.WORKER_MODE != "queue":
+        return None
+
+    if settings.QUEUE_BACKEND == "sqlite":
+        return SqliteTaskQueue(
+            settings.QUEUE_DB_PATH,
+            lease_seconds=settings.QUEUE_LEASE_SECONDS,
+            max_attempts=settings.QUEUE_MAX_ATTEMPTS
+        )
+
+    raise ValueError(f"QUEUE_BACKEND no soportado: {settings.QUEUE_BACKEND}")
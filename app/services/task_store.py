@@ -0,0 +1,143 @@
+"""
+Task Store - Almacenamiento del estado de las tareas
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def connect_sqlite(db_path: str) -> sqlite3.Connection:
+    """
+    Abrir una conexión SQLite apta para varios procesos (WAL)
+
+    Los procesos deben estar en el mismo host y la base en un disco local:
+    WAL usa memoria compartida y no funciona sobre sistemas de archivos de red.
+
+    Args:
+        db_path: Ruta del archivo de base de datos
+
+    Returns:
+        Conexión en modo autocommit
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextmanager
+def immediate_transaction(conn: sqlite3.Connection, lock: threading.Lock):
+    """Transacción con lock de escritura tomado al inicio (BEGIN IMMEDIATE)"""
+    with lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+class TaskStore(ABC):
+    """Interfaz de almacenamiento de estado de tareas"""
+
+    # True si las operaciones hacen I/O y deben ir fuera del event loop
+    blocking = True
+
+    @abstractmethod
+    def create(self, task_id: str, data: Dict[str, Any]):
+        """Registrar una tarea nueva"""
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Obtener el estado de una tarea o None si no existe"""
+
+    @abstractmethod
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        """Actualizar campos de una tarea; False si no existe"""
+
+
+class InMemoryTaskStore(TaskStore):
+    """Estado en memoria del proceso (un solo worker)"""
+
+    blocking = False
+
+    def __init__(self):
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+
+    def create(self, task_id: str, data: Dict[str, Any]):
+        self.tasks[task_id] = dict(data)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self.tasks.get(task_id)
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        if task_id not in self.tasks:
+            return False
+        self.tasks[task_id].update(fields)
+        return True
+
+
+class SqliteTaskStore(TaskStore):
+    """Estado compartido entre workers/procesos en un archivo SQLite"""
+
+    def __init__(self, db_path: str):
+        self.conn = connect_sqlite(db_path)
+        self.lock = threading.Lock()
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " task_id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+
+    def create(self, task_id: str, data: Dict[str, Any]):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, data, updated_at) VALUES (?, ?, ?)",
+                (task_id, json.dumps(data, default=str), time.time())
+            )
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        with immediate_transaction(self.conn, self.lock):
+            row = self.conn.execute("SELECT data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            if row is None:
+                return False
+
+            data = json.loads(row[0])
+            data.update(fields)
+            self.conn.execute(
+                "UPDATE tasks SET data = ?, updated_at = ? WHERE task_id = ?",
+                (json.dumps(data, default=str), time.time(), task_id)
+            )
+        return True
+
+
+def create_task_store() -> TaskStore:
+    """
+    Crear el store según WORKER_MODE
+
+    inprocess usa memoria; queue comparte el estado en QUEUE_DB_PATH para que
+    cualquier worker o réplica pueda responder /status.
+    """
+    settings = get_settings()
+    if settings.WORKER_MODE == "queue":
+        logger.info(f"🗄️ Estado de tareas en SQLite: {settings.QUEUE_DB_PATH} (pid {os.getpid()})")
+        return SqliteTaskStore(settings.QUEUE_DB_PATH)
+    return InMemoryTaskStore()
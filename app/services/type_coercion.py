@@ -0,0 +1,292 @@
+"""
+Type Coercion - Inferencia y conversión de tipos por columna
+"""
+import logging
+import math
+import re
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from app.config.settings import get_settings
+from app.dto.schemas import CoercionSpec
+from app.utils.constants import ColumnTypes
+
+logger = logging.getLogger(__name__)
+
+# Patrones de inferencia. Enteros con ceros a la izquierda ("00123") o de más de
+# 18 dígitos se dejan como string: suelen ser códigos y no caben en int64.
+INT_PATTERN = r"^-?(0|[1-9]\d{0,17})$"
+FLOAT_PATTERN = r"^-?(0|[1-9]\d*)(\.\d+)?([eE][-+]?\d{1,3})?$"
+# Patrones de conversión, más permisivos: el tipo ya fue inferido o forzado
+COERCE_INT_PATTERN = r"^[-+]?\d{1,18}$"
+COERCE_FLOAT_PATTERN = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d{1,3})?$"
+DATETIME_PATTERN = r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?(Z|[+-]\d{2}:?\d{2})?)?$"
+TRUE_VALUES = ["true", "verdadero", "si", "sí", "yes"]
+FALSE_VALUES = ["false", "falso", "no"]
+# Una columna solo se infiere bool con true/false: "si"/"no" sueltos suelen ser texto.
+# Las demás formas se aceptan cuando la columna se fuerza a bool en column_types.
+INFER_TRUE_VALUES = ["true"]
+INFER_FALSE_VALUES = ["false"]
+
+_INT_RE = re.compile(COERCE_INT_PATTERN)
+_FLOAT_RE = re.compile(COERCE_FLOAT_PATTERN)
+_DATETIME_RE = re.compile(DATETIME_PATTERN)
+
+
+def _parse_int(value: str) -> int:
+    if not _INT_RE.match(value):
+        raise ValueError(value)
+    return int(value)
+
+
+def _parse_float(value: str) -> float:
+    if not _FLOAT_RE.match(value):
+        raise ValueError(value)
+    parsed = float(value)
+    # "1e400" es inf: JSON no lo admite, queda como string
+    if not math.isfinite(parsed):
+        raise ValueError(value)
+    return parsed
+
+
+def _parse_bool(value: str, true_values: List[str] = TRUE_VALUES, false_values: List[str] = FALSE_VALUES) -> bool:
+    lowered = value.lower()
+    if lowered in true_values:
+        return True
+    if lowered in false_values:
+        return False
+    raise ValueError(value)
+
+
+def _parse_datetime(value: str) -> datetime:
+    if not _DATETIME_RE.match(value):
+        raise ValueError(value)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+# Conversión valor a valor, para los batches que no pasan la conversión vectorizada
+SCALAR_PARSERS: Dict[str, Callable[[str], Any]] = {
+    ColumnTypes.INT: _parse_int,
+    ColumnTypes.FLOAT: _parse_float,
+    ColumnTypes.BOOL: _parse_bool,
+    ColumnTypes.DATETIME: _parse_datetime
+}
+
+
+class TypeCoercer:
+    """
+    Convierte las columnas string de cada batch a int, float, bool, datetime o null
+
+    El esquema se infiere con una muestra del primer batch (si spec.infer) y
+    los tipos de spec.column_types lo sobrescriben. La conversión es por
+    columna con kernels de pyarrow; si un batch trae valores que no encajan
+    con el tipo, esa columna se convierte valor a valor y los valores
+    inválidos quedan como string (contados en errors). Las celdas vacías de
+    columnas no string pasan a null. El _id no se infiere: solo cambia si se
+    fuerza en column_types. Las columnas bool inferidas solo aceptan
+    true/false; las forzadas aceptan también si/no, yes y verdadero/falso.
+    """
+
+    def __init__(self, spec: CoercionSpec):
+        self.settings = get_settings()
+        self.spec = spec
+        self.schema: Optional[Dict[str, str]] = None
+        self.errors = 0
+
+    def infer_schema(self, documents: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Inferir el tipo de cada columna a partir de una muestra
+
+        Args:
+            documents: Documentos de muestra
+
+        Returns:
+            Columna -> tipo (solo columnas con un tipo distinto de string)
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        sample = documents[:self.settings.TYPE_INFERENCE_SAMPLE_ROWS]
+        columns = {key for document in sample for key in document} - {"_id"}
+        schema = {}
+
+        for column in columns:
+            values = [document.get(column) for document in sample]
+            # Solo columnas de texto; las anidadas o ya tipadas (NDJSON) se dejan igual
+            if not all(value is None or isinstance(value, str) for value in values):
+                continue
+
+            array = pa.array([value for value in values if value], type=pa.string())
+            if len(array) == 0:
+                continue
+
+            if pc.all(pc.match_substring_regex(array, INT_PATTERN)).as_py():
+                schema[column] = ColumnTypes.INT
+            elif pc.all(pc.match_substring_regex(array, FLOAT_PATTERN)).as_py():
+                schema[column] = ColumnTypes.FLOAT
+            elif pc.all(pc.is_in(pc.utf8_lower(array), pa.array(INFER_TRUE_VALUES + INFER_FALSE_VALUES))).as_py():
+                schema[column] = ColumnTypes.BOOL
+            elif pc.all(pc.match_substring_regex(array, DATETIME_PATTERN)).as_py():
+                schema[column] = ColumnTypes.DATETIME
+
+        return schema
+
+    def _bool_values(self, column: str) -> Tuple[List[str], List[str]]:
+        """Formas aceptadas como true/false: todas si la columna se forzó a bool"""
+        if column in self.spec.column_types:
+            return TRUE_VALUES, FALSE_VALUES
+        return INFER_TRUE_VALUES, INFER_FALSE_VALUES
+
+    def _coerce_column(
+            self,
+            values: List[Any],
+            column_type: str,
+            bool_values: Tuple[List[str], List[str]] = (TRUE_VALUES, FALSE_VALUES)
+    ) -> List[Any]:
+        """
+        Convertir los valores de una columna
+
+        Args:
+            values: Valores de la columna en el batch (None si falta la clave)
+            column_type: Tipo destino
+            bool_values: Formas aceptadas como (true, false) para columnas bool
+
+        Returns:
+            Valores convertidos, en el mismo orden
+        """
+        true_values, false_values = bool_values
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if all(value is None or isinstance(value, str) for value in values):
+            array = pa.array(values, type=pa.string())
+            array = pc.if_else(pc.equal(array, ""), pa.scalar(None, pa.string()), array)
+
+            try:
+                if column_type == ColumnTypes.INT:
+                    if not pc.all(pc.match_substring_regex(array, COERCE_INT_PATTERN)).as_py():
+                        raise pa.ArrowInvalid("enteros inválidos")
+                    converted = pc.cast(array, pa.int64())
+                elif column_type == ColumnTypes.FLOAT:
+                    if not pc.all(pc.match_substring_regex(array, COERCE_FLOAT_PATTERN)).as_py():
+                        raise pa.ArrowInvalid("decimales inválidos")
+                    converted = pc.cast(array, pa.float64())
+                    # Exponentes fuera de rango dan inf: se resuelven valor a valor
+                    if not pc.all(pc.is_finite(converted)).as_py():
+                        raise pa.ArrowInvalid("decimales fuera de rango")
+                elif column_type == ColumnTypes.BOOL:
+                    lowered = pc.utf8_lower(array)
+                    is_true = pc.is_in(lowered, pa.array(true_values))
+                    is_false = pc.is_in(lowered, pa.array(false_values))
+                    if not pc.all(pc.or_(is_true, is_false)).as_py():
+                        raise pa.ArrowInvalid("booleanos inválidos")
+                    converted = pc.if_else(pc.is_null(array), pa.scalar(None, pa.bool_()), is_true)
+                else:
+                    converted = self._cast_datetime(array)
+
+                return self._to_python(converted)
+
+            except pa.ArrowInvalid:
+                pass
+
+        # Conversión valor a valor: lo que no encaja queda como está
+        parser = SCALAR_PARSERS[column_type]
+        if column_type == ColumnTypes.BOOL:
+            parser = partial(_parse_bool, true_values=true_values, false_values=false_values)
+        result = []
+        for value in values:
+            if value is None or value == "":
+                result.append(None)
+            elif not isinstance(value, str):
+                result.append(value)
+            else:
+                try:
+                    result.append(parser(value))
+                except ValueError:
+                    self.errors += 1
+                    result.append(value)
+        return result
+
+    @staticmethod
+    def _cast_datetime(array: Any) -> Any:
+        """Convertir strings ISO 8601 a timestamps UTC sin zona (con o sin offset)"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if not pc.all(pc.match_substring_regex(array, DATETIME_PATTERN)).as_py():
+            raise pa.ArrowInvalid("fechas inválidas")
+
+        try:
+            return pc.cast(array, pa.timestamp("us"))
+        except pa.ArrowInvalid:
+            # Todas con offset: convertir a UTC y quitar la zona
+            return pc.cast(pc.cast(array, pa.timestamp("us", tz="UTC")), pa.timestamp("us"))
+
+    @staticmethod
+    def _to_python(array: Any) -> List[Any]:
+        """
+        Pasar un array de pyarrow a lista de Python
+
+        to_numpy().tolist() es varias veces más rápido que to_pylist(); los
+        nulos se rellenan antes y se restauran después.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if pa.types.is_boolean(array.type):
+            return array.to_pylist()
+
+        if array.null_count == 0:
+            return array.to_numpy(zero_copy_only=False).tolist()
+
+        values = array.fill_null(pa.scalar(0, array.type)).to_numpy(zero_copy_only=False).tolist()
+        for index in pc.indices_nonzero(array.is_null()).to_numpy().tolist():
+            values[index] = None
+        return values
+
+    def coerce_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Convertir los tipos de un batch (modifica los documentos)
+
+        Args:
+            documents: Documentos del batch
+
+        Returns:
+            El mismo batch con los valores convertidos
+        """
+        if self.schema is None:
+            self.schema = self.infer_schema(documents) if self.spec.infer else {}
+            self.schema.update(self.spec.column_types)
+            if self.schema:
+                logger.info(f"🔢 Esquema de tipos: {self.schema}")
+
+        for column, column_type in self.schema.items():
+            if column_type == ColumnTypes.STRING:
+                continue
+
+            values = [document.get(column) for document in documents]
+            converted = self._coerce_column(values, column_type, self._bool_values(column))
+            for document, value in zip(documents, converted):
+                if column in document:
+                    document[column] = value
+
+        return documents
+
+    async def coerce_batches(
+            self,
+            batches: AsyncIterator[List[Dict[str, Any]]]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Aplicar la conversión a un flujo de batches
+
+        Args:
+            batches: Iterador asíncrono de batches del parser
+
+        Yields:
+            Batches con los tipos convertidos
+        """
+        async for batch in batches:
+            yield self.coerce_batch(batch)
@@ -0,0 +1,109 @@
+"""
+Value Interner - Un solo objeto por valor repetido en cada columna
+
+Columnas de baja cardinalidad (género, estado, carrera) repiten unos pocos
+valores en miles de filas. Sin interning cada celda es un str nuevo después
+de la limpieza; con interning todas las celdas iguales de una columna
+apuntan al mismo objeto, y la limpieza corre una vez por valor distinto.
+"""
+from functools import partial
+from typing import Any, Callable, List, Sequence
+
+
+class _ColumnPool(dict):
+    """
+    Valor crudo -> valor limpio de una columna
+
+    Un valor que no está en el pool se limpia y se guarda. Al superar
+    max_values la columna se considera de alta cardinalidad (IDs, texto
+    libre): el pool se vacía y se avisa a on_overflow.
+    """
+
+    __slots__ = ("clean", "max_values", "on_overflow")
+
+    def __init__(self, clean: Callable[[Any], str], max_values: int, on_overflow: Callable[[], None]):
+        super().__init__()
+        self.clean = clean
+        self.max_values = max_values
+        self.on_overflow = on_overflow
+
+    def __missing__(self, raw: Any) -> str:
+        value = self.clean(raw)
+        # Solo se guardan str/None: 1, 1.0 y True son la misma clave de dict
+        # pero se limpian distinto ("1", "1.0", "True")
+        if not (raw is None or type(raw) is str):
+            return value
+
+        if len(self) >= self.max_values:
+            self.clear()
+            self.on_overflow()
+            return value
+
+        # El valor limpio se mapea a sí mismo solo si limpiarlo de nuevo no lo
+        # cambia ("CA." -> "CA"), así "CA" y "CA." comparten el mismo objeto.
+        # No siempre es así: "a\xa0." -> "a\xa0", pero "a\xa0" -> "a"
+        pooled = self.get(value)
+        if pooled == value:
+            value = pooled
+        elif pooled is None and self.clean(value) == value:
+            self[value] = value
+        self[raw] = value
+        return value
+
+
+class ColumnInterner:
+    """
+    Limpia e interna los valores de cada columna de un archivo
+
+    Se crea uno por archivo, así los valores quedan compartidos entre batches.
+    Las columnas de alta cardinalidad dejan de pasar por el pool y se limpian
+    directo, sin costo extra.
+    """
+
+    def __init__(self, columns: int, clean: Callable[[Any], str], max_values: int):
+        """
+        Args:
+            columns: Cantidad de columnas leídas
+            clean: Función de limpieza (FileProcessor.clean_value)
+            max_values: Valores distintos por columna antes de dejar de internarla (0 = nunca)
+        """
+        self.clean = clean
+        # Por columna: el lookup del pool mientras se interna, clean cuando se desbordó
+        self.getters: List[Callable[[Any], str]] = [
+            _ColumnPool(clean, max_values, partial(self._stop_interning, position)).__getitem__
+            if max_values > 0 else clean
+            for position in range(columns)
+        ]
+
+    def _stop_interning(self, position: int):
+        self.getters[position] = self.clean
+
+    def clean_values(self, values: Sequence[Any]) -> List[str]:
+        """
+        Limpiar los valores de una fila, uno por columna
+
+        Args:
+            values: Valores crudos en el orden de las columnas
+
+        Returns:
+            Valores limpios; los repetidos son el mismo objeto
+        """
+        return [get(value) for get, value in zip(self.getters, values)]
+
+    def clean_row(self, row: Sequence[Any], indices: Sequence[int]) -> List[str]:
+        """
+        Limpiar las posiciones indicadas de una fila
+
+        Args:
+            row: Fila completa
+            indices: Posición en la fila de cada columna leída
+
+        Returns:
+            Valores limpios en el orden de indices
+        """
+        return [get(row[i]) for get, i in zip(self.getters, indices)]
+
+    @property
+    def interned_columns(self) -> int:
+        """Columnas que siguen internándose (baja cardinalidad)"""
+        return sum(1 for get in self.getters if get is not self.clean)
@@ -0,0 +1,407 @@
+"""
+Xlsx Reader - Lectura en streaming de la primera hoja de un .xlsx
+
+Un .xlsx es un zip con XML. Las partes chicas (workbook, relaciones,
+estilos) se leen con ElementTree. La hoja y los shared strings, que crecen
+con el archivo, se recorren con un tokenizer de expresiones regulares sobre
+el XML descomprimido en bloques: es varias veces más rápido que iterparse
+(que crea un elemento por <c>, <v>, <is> y <t>) y la memoria no depende del
+tamaño de la hoja. La tabla de shared strings se decodifica una sola vez.
+
+Las celdas se devuelven como texto con la misma conversión que hacen
+openpyxl + pandas para una celda: enteros sin ".0", fechas como
+str(datetime), booleanos "True"/"False".
+"""
+import codecs
+import html
+import io
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from xml.etree.ElementTree import iterparse
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Bytes descomprimidos por bloque al recorrer la hoja
+READ_CHUNK_SIZE = 1024 * 1024
+
+# numFmtId integrados con formato de fecha/hora (ECMA-376, 18.8.30)
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+# Texto entre comillas y corchetes (colores, locale) salvo [h], [m], [s]
+FORMAT_STRIP_RE = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+FORMAT_DATE_RE = re.compile(r"(?<!\\)[dmhysDMHYS]")
+FORMAT_ELAPSED_RE = re.compile(r"\[hh?\]|\[mm?\]|\[ss?\]", re.I)
+ATTRIBUTE_RE = re.compile(r"""\b([rst])\s*=\s*["']([^"']*)["']""")
+
+# Tipos de celda según los atributos t (tipo) y s (estilo)
+CELL_SHARED, CELL_INLINE, CELL_TEXT, CELL_NUMBER, CELL_DATE, CELL_BOOL, CELL_ERROR = range(7)
+
+WINDOWS_EPOCH = datetime(1899, 12, 30)
+MAC_EPOCH = datetime(1904, 1, 1)
+
+
+def is_date_format(format_code: str) -> bool:
+    """
+    Indicar si un formato de número muestra fechas u horas (no duraciones)
+
+    Args:
+        format_code: Código de formato de Excel
+
+    Returns:
+        True si las celdas con ese formato son fechas
+    """
+    section = format_code.split(";")[0]
+    if FORMAT_ELAPSED_RE.search(section):
+        return False
+    return FORMAT_DATE_RE.search(FORMAT_STRIP_RE.sub("", section)) is not None
+
+
+def column_index(letters: str) -> int:
+    """Índice 0-based de una columna ("C" -> 2, "AA" -> 26)"""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+class XlsxFormatError(ValueError):
+    """El archivo no es un .xlsx legible (zip o XML inválido, sin hojas)"""
+
+
+class XlsxStreamReader:
+    """
+    Lee filas de la primera hoja de un .xlsx sin cargarla completa en memoria
+
+    Las filas sin ninguna celda con valor se omiten, como las líneas vacías
+    de un CSV. Celdas de error (#N/A, #DIV/0!) y fórmulas sin valor
+    calculado se leen como vacías.
+    """
+
+    def __init__(self, file_content: bytes):
+        try:
+            self.archive = zipfile.ZipFile(io.BytesIO(file_content))
+            self.epoch, self.sheet_path = self._read_workbook()
+            self.date_styles = self._read_date_styles()
+            self.shared_strings = self._read_shared_strings()
+        except (zipfile.BadZipFile, KeyError, SyntaxError, ValueError) as e:
+            raise XlsxFormatError(f"Archivo xlsx inválido: {e}") from e
+
+    def _read_workbook(self) -> Tuple[datetime, str]:
+        """Epoch de fechas (1900/1904) y ruta de la primera hoja"""
+        epoch = WINDOWS_EPOCH
+        first_sheet_rel = None
+
+        with self.archive.open("xl/workbook.xml") as f:
+            for _, elem in iterparse(f):
+                if elem.tag == MAIN_NS + "workbookPr" and elem.get("date1904") in ("1", "true"):
+                    epoch = MAC_EPOCH
+                elif elem.tag == MAIN_NS + "sheet" and first_sheet_rel is None:
+                    first_sheet_rel = elem.get(REL_NS + "id")
+
+        if first_sheet_rel is None:
+            raise XlsxFormatError("El archivo xlsx no tiene hojas")
+
+        with self.archive.open("xl/_rels/workbook.xml.rels") as f:
+            for _, elem in iterparse(f):
+                if elem.tag == PKG_REL_NS + "Relationship" and elem.get("Id") == first_sheet_rel:
+                    target = elem.get("Target")
+                    # Target relativo a xl/ o absoluto desde la raíz del paquete
+                    if target.startswith("/"):
+                        return epoch, target.lstrip("/")
+                    return epoch, posixpath.normpath(posixpath.join("xl", target))
+
+        raise XlsxFormatError(f"Hoja {first_sheet_rel} no encontrada en el xlsx")
+
+    def _read_date_styles(self) -> Set[int]:
+        """Índices de estilo de celda (atributo s) con formato de fecha"""
+        if "xl/styles.xml" not in self.archive.namelist():
+            return set()
+
+        custom_formats: Dict[int, str] = {}
+        cell_formats: List[int] = []
+        with self.archive.open("xl/styles.xml") as f:
+            in_cell_xfs = False
+            for event, elem in iterparse(f, events=("start", "end")):
+                if elem.tag == MAIN_NS + "cellXfs":
+                    in_cell_xfs = event == "start"
+                elif event == "end" and elem.tag == MAIN_NS + "numFmt":
+                    custom_formats[int(elem.get("numFmtId"))] = elem.get("formatCode", "")
+                elif event == "end" and elem.tag == MAIN_NS + "xf" and in_cell_xfs:
+                    cell_formats.append(int(elem.get("numFmtId", 0)))
+
+        return {
+            style for style, format_id in enumerate(cell_formats)
+            if (is_date_format(custom_formats[format_id]) if format_id in custom_formats
+                else format_id in BUILTIN_DATE_FORMATS)
+        }
+
+    def _detect_prefix(self, path: str, root: str) -> str:
+        """Prefijo de namespace con el que la parte escribe sus elementos ("" o "x:")"""
+        root_re = re.compile(rf"<(\w+:)?{root}\b")
+        head = ""
+        with self.archive.open(path) as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                head += chunk.decode("utf-8", errors="replace")
+                match = root_re.search(head)
+                if match or not chunk:
+                    return (match and match.group(1)) or ""
+
+    def _iter_elements(self, path: str, prefix: str, tag: str) -> Iterator[Tuple[str, int]]:
+        """
+        Recorrer en streaming cada <tag> de una parte del zip
+
+        El XML descomprimido se corta por la etiqueta de cierre (str.split, en C),
+        así nunca hay más de un bloque en memoria.
+
+        Args:
+            path: Parte del zip (ej. xl/worksheets/sheet1.xml)
+            prefix: Prefijo de namespace de la parte
+            tag: Elemento a extraer, sin prefijo (row, si)
+
+        Yields:
+            (xml, inicio): el contenido del elemento es xml[inicio:]; los
+            elementos vacíos (<row r="3"/>) llegan como ("", 0)
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        opening, closing = f"<{prefix}{tag}", f"</{prefix}{tag}>"
+        buffer = ""
+
+        with self.archive.open(path) as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                buffer += decoder.decode(chunk, final=not chunk)
+
+                pieces = buffer.split(closing)
+                buffer = pieces.pop()
+                for piece in pieces:
+                    start = piece.rfind(opening)
+                    # Antes del elemento que cierra esta pieza solo puede haber elementos vacíos
+                    for _ in range(piece.count(opening, 0, start)):
+                        yield "", 0
+                    yield piece, piece.index(">", start) + 1
+
+                if not chunk:
+                    break
+
+        # Elementos vacíos al final, antes del cierre del contenedor
+        for _ in range(buffer.split(f"</{prefix}", 1)[0].count(opening)):
+            yield "", 0
+
+    def _read_shared_strings(self) -> List[str]:
+        """Decodificar la tabla de shared strings una sola vez"""
+        path = "xl/sharedStrings.xml"
+        if path not in self.archive.namelist():
+            return []
+
+        prefix = self._detect_prefix(path, "sst")
+        p = re.escape(prefix)
+        text_re = re.compile(rf"<{p}t\b[^>]*?(?:/>|>(.*?)</{p}t>)", re.S)
+        phonetic_re = re.compile(rf"<{p}rPh\b.*?</{p}rPh>", re.S)
+        return [
+            self._element_text(xml[start:], text_re, phonetic_re)
+            for xml, start in self._iter_elements(path, prefix, "si")
+        ]
+
+    @staticmethod
+    def _element_text(xml: str, text_re, phonetic_re) -> str:
+        """Texto de un <si> o <is>: todos los <t>, sin las guías fonéticas"""
+        if "rPh" in xml:
+            xml = phonetic_re.sub("", xml)
+        text = "".join(text_re.findall(xml))
+        return html.unescape(text) if "&" in text else text
+
+    def _cell_kind(self, cell_type: Optional[str], style: Optional[str]) -> int:
+        """Tipo de celda a partir de sus atributos t y s"""
+        if cell_type == "s":
+            return CELL_SHARED
+        if cell_type == "inlineStr":
+            return CELL_INLINE
+        if cell_type == "b":
+            return CELL_BOOL
+        if cell_type == "e":
+            return CELL_ERROR
+        if cell_type in ("str", "d"):
+            return CELL_TEXT
+        if style is not None and int(style) in self.date_styles:
+            return CELL_DATE
+        return CELL_NUMBER
+
+    def _convert(self, kind: int, raw: Optional[str]) -> Optional[str]:
+        """
+        Convertir el valor crudo de una celda a texto
+
+        Args:
+            kind: Tipo de celda (CELL_*)
+            raw: Contenido de <v>, o el texto de <is> en celdas inlineStr
+
+        Returns:
+            Valor como texto, None si la celda está vacía
+        """
+        if not raw or kind == CELL_ERROR:
+            return None
+        if kind == CELL_SHARED:
+            return self.shared_strings[int(raw)]
+        if kind == CELL_NUMBER:
+            if "." in raw or "E" in raw or "e" in raw:
+                number = float(raw)
+                return str(int(number)) if number.is_integer() else str(number)
+            return raw
+        if kind == CELL_DATE:
+            return self._to_datetime(float(raw))
+        if kind == CELL_BOOL:
+            return "True" if raw == "1" else "False"
+        return html.unescape(raw) if "&" in raw else raw
+
+    def _to_datetime(self, serial: float) -> str:
+        """Serial de Excel a texto, como str() del datetime/time de openpyxl"""
+        day, fraction = divmod(serial, 1)
+        time_part = timedelta(milliseconds=round(fraction * 86400000))
+        if 0 <= serial < 1 and time_part.days == 0:
+            return str((datetime.min + time_part).time())
+        # Excel cuenta el 29/02/1900 inexistente: los seriales previos se corren un día
+        if 0 < serial < 60 and self.epoch == WINDOWS_EPOCH:
+            day += 1
+        return str(self.epoch + timedelta(days=day) + time_part)
+
+    def iter_rows(self) -> Iterator[List[Optional[str]]]:
+        """
+        Recorrer las filas de la primera hoja
+
+        Las filas con todas sus celdas simples (<v> o <is><t> sin espacios ni
+        fórmulas, que es lo que escriben Excel, openpyxl y xlsxwriter) se
+        resuelven con una sola expresión regular por fila. El resto (rich
+        text, fórmulas, XML indentado) pasa por _parse_cells.
+
+        Yields:
+            Valores de la fila como texto (None en celdas vacías); cada fila
+            llega hasta su última celda con valor
+        """
+        prefix = self._detect_prefix(self.sheet_path, "sheetData")
+        p = re.escape(prefix)
+        cell_open = f"<{prefix}c"
+        dense_re = re.compile(
+            rf'<{p}c(?: r="([A-Z]+)\d+")?([^>/]*)(?:/>|>(?:<{p}v>([^<]*)</{p}v>'
+            rf'|<{p}is><{p}t>([^<]*)</{p}t></{p}is>)?</{p}c>)'
+        )
+        patterns = (
+            re.compile(rf"<{p}c\b([^>]*?)(?:/>|>(.*?)</{p}c>)", re.S),
+            re.compile(rf"<{p}v>([^<]*)</{p}v>"),
+            re.compile(rf"<{p}t\b[^>]*?(?:/>|>(.*?)</{p}t>)", re.S),
+            re.compile(rf"<{p}rPh\b.*?</{p}rPh>", re.S),
+        )
+        # Atributos de la celda sin r (ej. ' s="3" t="s"') -> tipo; letras de columna -> índice
+        kinds: Dict[str, int] = {}
+        columns: Dict[str, int] = {"": -1}
+
+        def columns_of(letters: str) -> int:
+            index = columns.get(letters)
+            if index is None:
+                index = columns[letters] = column_index(letters)
+            return index
+
+        try:
+            for xml, start in self._iter_elements(self.sheet_path, prefix, "row"):
+                if not start:
+                    continue
+
+                cells = dense_re.findall(xml, start)
+                values = self._convert_cells(cells, kinds) if len(cells) == xml.count(cell_open, start) else None
+
+                if values is None:
+                    values = self._parse_cells(xml[start:], patterns)
+                elif cells and (cells[0][0] not in ("", "A") or columns_of(cells[-1][0]) not in (-1, len(cells) - 1)):
+                    # Fila con huecos: ubicar cada valor por su columna (las celdas vienen en orden)
+                    placed: List[Optional[str]] = []
+                    for (letters, _, _, _), value in zip(cells, values):
+                        index = columns_of(letters)
+                        placed.extend([None] * (index - len(placed)))
+                        placed.append(value)
+                    values = placed
+
+                while values and values[-1] is None:
+                    values.pop()
+                if values:
+                    yield values
+
+        except (IndexError, ValueError) as e:
+            raise XlsxFormatError(f"Archivo xlsx inválido: {e}") from e
+
+    def _convert_cells(self, cells: List[Tuple[str, str, str, str]], kinds: Dict[str, int]) -> Optional[List[Optional[str]]]:
+        """
+        Convertir las celdas de una fila resueltas por la expresión rápida
+
+        Args:
+            cells: (letras, atributos, <v>, texto de <is>) de cada celda
+            kinds: Caché de atributos -> tipo de celda
+
+        Returns:
+            Valores en el orden de las celdas, o None si la fila necesita el camino general
+        """
+        shared_strings = self.shared_strings
+        convert = self._convert
+        values: List[Optional[str]] = []
+        append = values.append
+
+        for _, attributes, raw, text in cells:
+            kind = kinds.get(attributes)
+            if kind is None:
+                kind = self._attributes_kind(attributes)
+                if kind is None:
+                    return None
+                kinds[attributes] = kind
+
+            # Los casos comunes sin llamar a _convert
+            if kind == CELL_SHARED and raw:
+                append(shared_strings[int(raw)])
+            elif kind == CELL_INLINE:
+                append(convert(CELL_TEXT, text) if "&" in text else (text or None))
+            elif kind == CELL_NUMBER and raw.isdigit():
+                append(raw)
+            else:
+                append(convert(kind, raw))
+
+        return values
+
+    def _attributes_kind(self, attributes: str) -> Optional[int]:
+        """Tipo de celda desde sus atributos; None si r no es el primero (camino general)"""
+        parsed = dict(ATTRIBUTE_RE.findall(attributes))
+        if "r" in parsed:
+            return None
+        return self._cell_kind(parsed.get("t"), parsed.get("s"))
+
+    def _parse_cells(self, xml: str, patterns) -> List[Optional[str]]:
+        """
+        Leer las celdas de una fila sin asumir el formato exacto del XML
+
+        Args:
+            xml: Contenido de <row>
+            patterns: Expresiones de celda, <v>, <t> y <rPh> con el prefijo de la hoja
+
+        Returns:
+            Valores de la fila ubicados por la referencia de cada celda
+        """
+        cell_re, value_re, text_re, phonetic_re = patterns
+        values: List[Optional[str]] = []
+
+        for position, (attributes, inner) in enumerate(cell_re.findall(xml)):
+            parsed = dict(ATTRIBUTE_RE.findall(attributes))
+            kind = self._cell_kind(parsed.get("t"), parsed.get("s"))
+
+            if kind == CELL_INLINE:
+                value = self._element_text(inner, text_re, phonetic_re) or None
+            else:
+                match = value_re.search(inner)
+                value = self._convert(kind, match.group(1) if match else None)
+
+            reference = parsed.get("r")
+            index = column_index(reference.rstrip("0123456789")) if reference else position
+            if index >= len(values):
+                values.extend([None] * (index - len(values) + 1))
+            values[index] = value
+
+        return values
@@ -14,7 +14,43 @@ class FileFormats:
     """Formatos de archivo soportados"""
     CSV = ['.csv']
     EXCEL = ['.xlsx', '.xls']
-    ALL_SUPPORTED = CSV + EXCEL
+    PARQUET = ['.parquet']
+    ARROW = ['.arrow', '.feather', '.ipc']
+    NDJSON = ['.ndjson', '.jsonl']
+    ALL_SUPPORTED = CSV + EXCEL + PARQUET + ARROW + NDJSON
+
+
+class CsvEngines:
+    """Motores de parseo CSV disponibles"""
+    STDLIB = "stdlib"
+    PANDAS_C = "pandas-c"
+    PYARROW = "pyarrow"
+    ALL = [STDLIB, PANDAS_C, PYARROW]
+
+
+class ExcelEngines:
+    """Motores de lectura de Excel disponibles"""
+    STREAM = "stream"
+    PANDAS = "pandas"
+    ALL = [STREAM, PANDAS]
+
+
+class ColumnTypes:
+    """Tipos a los que se pueden convertir las columnas"""
+    STRING = "string"
+    INT = "int"
+    FLOAT = "float"
+    BOOL = "bool"
+    DATETIME = "datetime"
+    ALL = [STRING, INT, FLOAT, BOOL, DATETIME]
+
+
+class LoadModes:
+    """Modos de escritura de una carga"""
+    INSERT = "insert"  # Solo inserta; un _id existente falla
+    UPSERT = "upsert"  # Reemplaza el documento con el mismo _id o lo inserta
+    REPLACE = "replace"  # Carga en staging y la intercambia por la colección al terminar
+    ALL = [INSERT, UPSERT, REPLACE]
 
 
 class HttpStatus:
@@ -28,8 +64,35 @@ class HttpStatus:
 class ErrorMessages:
     """Mensajes de error"""
     FILE_NO_NAME = "Archivo sin nombre"
-    FILE_NOT_SUPPORTED = "Formato no soportado. Use CSV o Excel (.xlsx, .xls)"
+    FILE_NOT_SUPPORTED = "Formato no soportado. Use CSV, Excel (.xlsx, .xls), Parquet, Arrow IPC (.arrow, .feather, .ipc) o NDJSON (.ndjson, .jsonl)"
     FILE_TOO_LARGE = "Archivo excede el tamaño máximo ({max_size}MB)"
     MONGODB_SAVE_ERROR = "Error guardando datos en MongoDB"
     VALIDATION_ERROR = "Error de validación"
-    INTERNAL_ERROR = "Error interno"
\ No newline at end of file
+    INTERNAL_ERROR = "Error interno"
+    CSV_ENGINE_NOT_SUPPORTED = "Motor CSV no soportado: {engine}. Use stdlib, pandas-c o pyarrow"
+    EXCEL_ENGINE_NOT_SUPPORTED = "Motor Excel no soportado: {engine}. Use stream o pandas"
+    LOAD_MODE_NOT_SUPPORTED = "Modo de carga no soportado: {mode}. Use insert, upsert o replace"
+    REPLACE_BATCH_FAILED = "Falló el batch {batch} de una carga replace; la colección no se modificó"
+    REPLACE_COMMIT_FAILED = "No se pudo confirmar el intercambio de la colección en staging"
+    BULK_SEARCH_TOO_MANY_IDS = "Demasiados IDs ({count}). Máximo permitido: {max_ids}"
+    ADMISSION_MEMORY = "Servicio sin memoria disponible ({rss:.0f}MB de {limit}MB). Reintente más tarde"
+    ADMISSION_QUEUE_FULL = "Demasiadas tareas en cola (máximo {limit}). Reintente más tarde"
+    ADMISSION_IN_FLIGHT = "Demasiados datos en proceso (máximo {limit}MB). Reintente más tarde"
+    NDJSON_INVALID_LINE = "Línea {line} no es un objeto JSON válido"
+    SHUTTING_DOWN = "Servicio deteniéndose, no acepta cargas nuevas. Reintente en otra instancia"
+    UPSTREAM_UNAVAILABLE = "ig-db-mongo no disponible. Reintente más tarde"
+    COLUMN_TYPES_INVALID = "column_types inválido: {detail}. Use un JSON {{\"columna\": \"string|int|float|bool|datetime\"}}"
+    COLUMN_SPEC_INVALID = "column_spec inválido: {detail}. Use un JSON {{\"include\": [...], \"exclude\": [...], \"rename\": {{...}}, \"id_column\": \"...\"}}"
+    UPLOAD_NOT_FOUND = "Subida '{upload_id}' no encontrada o expirada"
+    UPLOAD_ALREADY_COMPLETED = "La subida ya fue completada; no admite más partes"
+    UPLOAD_PART_NUMBER_INVALID = "Número de parte inválido: {part_number}. Use 1 a {max_parts}"
+    UPLOAD_PART_TOO_LARGE = "La parte excede el tamaño máximo ({max_size}MB)"
+    UPLOAD_TOO_LARGE = "La subida excede el tamaño máximo ({max_size}MB)"
+    UPLOAD_PART_CONFLICT = "La parte {part_number} ya fue procesada con otro contenido"
+    UPLOAD_PARTS_MISSING = "Faltan partes para completar la subida: {parts}"
+    UPLOAD_PARTS_EXTRA = "Hay partes después de total_parts={total_parts}: {parts}"
+    UPLOAD_ABORTED = "Subida cancelada"
+    UPLOAD_IDLE_TIMEOUT = "Subida expirada: sin partes nuevas en {seconds:.0f}s"
+    TASK_HISTORY_DISABLED = "El historial de tareas está deshabilitado (TASK_HISTORY_ENABLED=false)"
+    STATS_WINDOW_INVALID = "Ventana inválida: since debe ser anterior a until"
+    COLUMN_SPEC_UNKNOWN = "column_spec referencia columnas que no existen en el archivo: {columns}"
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Utilidades para métricas de rendimiento
+"""
+import math
+from typing import List, Optional
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Calcular un percentil por rango más cercano
+
+    Args:
+        values: Valores a evaluar (no necesitan estar ordenados)
+        pct: Percentil entre 0 y 100
+
+    Returns:
+        Valor del percentil o None si no hay valores
+    """
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
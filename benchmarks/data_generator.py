@@ -0,0 +1,126 @@
+"""
+Generador de archivos sintéticos (CSV / XLSX) para benchmarks
+
+Las filas se escriben en streaming para no inflar la memoria del proceso
+que luego mide el pipeline.
+"""
+import csv
+import random
+import string
+from pathlib import Path
+from typing import Iterator, List
+
+# Valores de baja cardinalidad, parecidos a app/test-csv.csv
+CATEGORIES = ["Male", "Female", "CA", "NY", "TX", "FL", "Freshman", "Senior", "Math", "Physics"]
+
+
+def build_headers(columns: int) -> List[str]:
+    """
+    Construir headers: la primera columna es el ID
+
+    Args:
+        columns: Cantidad total de columnas
+
+    Returns:
+        Lista de nombres de columna
+    """
+    return ["id"] + [f"col_{i}" for i in range(1, columns)]
+
+
+def generate_rows(rows: int, columns: int, width: int, seed: int = 42) -> Iterator[List[str]]:
+    """
+    Generar filas sintéticas mezclando categorías, números y texto libre
+
+    Args:
+        rows: Cantidad de filas
+        columns: Cantidad de columnas (incluye el ID)
+        width: Largo aproximado de las celdas de texto libre
+        seed: Semilla para que los archivos sean reproducibles
+
+    Yields:
+        Filas como listas de strings
+    """
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + " "
+
+    for i in range(rows):
+        row = [f"ID{i:09d}"]
+        for c in range(1, columns):
+            kind = c % 3
+            if kind == 0:
+                row.append(CATEGORIES[rng.randrange(len(CATEGORIES))])
+            elif kind == 1:
+                row.append(str(rng.randint(0, 1_000_000)))
+            else:
+                row.append("".join(rng.choices(alphabet, k=width)))
+        yield row
+
+
+def generate_csv(path: Path, rows: int, columns: int, width: int) -> Path:
+    """
+    Escribir un CSV sintético
+
+    Args:
+        path: Ruta de salida
+        rows: Cantidad de filas
+        columns: Cantidad de columnas
+        width: Largo de las celdas de texto libre
+
+    Returns:
+        Ruta del archivo generado
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(build_headers(columns))
+        writer.writerows(generate_rows(rows, columns, width))
+
+    return path
+
+
+def generate_xlsx(path: Path, rows: int, columns: int, width: int) -> Path:
+    """
+    Escribir un XLSX sintético con openpyxl en modo write-only
+
+    Args:
+        path: Ruta de salida
+        rows: Cantidad de filas
+        columns: Cantidad de columnas
+        width: Largo de las celdas de texto libre
+
+    Returns:
+        Ruta del archivo generado
+    """
+    from openpyxl import Workbook
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(build_headers(columns))
+    for row in generate_rows(rows, columns, width):
+        sheet.append(row)
+    workbook.save(path)
+
+    return path
+
+
+def generate_file(path: Path, rows: int, columns: int, width: int) -> Path:
+    """
+    Generar un archivo según su extensión (.csv o .xlsx)
+
+    Args:
+        path: Ruta de salida
+        rows: Cantidad de filas
+        columns: Cantidad de columnas
+        width: Largo de las celdas de texto libre
+
+    Returns:
+        Ruta del archivo generado
+    """
+    if path.suffix == ".csv":
+        return generate_csv(path, rows, columns, width)
+    if path.suffix == ".xlsx":
+        return generate_xlsx(path, rows, columns, width)
+    raise ValueError(f"Formato no soportado para generar: {path.suffix}")
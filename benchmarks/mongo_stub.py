@@ -0,0 +1,142 @@
+"""
+Stub en proceso del endpoint bulk-import de ig-db-mongo
+
+Levanta un servidor uvicorn en un hilo aparte con latencia y tasa de error
+configurables, y cuenta los documentos recibidos. Con keep_payloads
+guarda además cada request aceptado y los documentos por colección, y
+responde las búsquedas por ID y el listado de colecciones (lo usan los tests).
+Los batches de una carga replace van a un staging por loadId que se publica
+con replace/commit o se descarta con replace/abort.
+"""
+import asyncio
+import random
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+class MongoStub:
+    """Servidor stub de ig-db-mongo para benchmarks"""
+
+    def __init__(
+            self,
+            latency_ms: float = 0.0,
+            jitter_ms: float = 0.0,
+            error_rate: float = 0.0,
+            seed: int = 42,
+            keep_payloads: bool = False
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.received_documents = 0
+        self.received_requests = 0
+        self.failed_requests = 0
+        self.keep_payloads = keep_payloads
+        self.payloads = []
+        # (clientId, businessName) -> _id -> documento
+        self.collections = {}
+        # (clientId, businessName, loadId) -> _id -> documento, hasta el commit
+        self.staging = {}
+        self.commits = []
+        self.aborts = []
+        self.search_requests = 0
+        self.port = self._free_port()
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def build_app(self) -> FastAPI:
+        """Construir la app FastAPI del stub"""
+        app = FastAPI()
+
+        @app.post("/api/rest/v1/google-sheet/bulk-import")
+        async def bulk_import(request: Request):
+            payload = await request.json()
+            self.received_requests += 1
+
+            delay = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+
+            if self.rng.random() < self.error_rate:
+                self.failed_requests += 1
+                return JSONResponse(status_code=500, content={"error": "stub error"})
+
+            self.received_documents += len(payload.get("data", []))
+            if self.keep_payloads:
+                self.payloads.append(payload)
+                key = (payload["clientId"], payload["businessName"])
+                if payload.get("loadMode") == "replace":
+                    collection = self.staging.setdefault((*key, payload["loadId"]), {})
+                else:
+                    collection = self.collections.setdefault(key, {})
+                collection.update((document["_id"], document) for document in payload.get("data", []))
+            return {"inserted": len(payload.get("data", []))}
+
+        @app.post("/api/rest/v1/google-sheet/bulk-import/replace/commit")
+        async def replace_commit(request: Request):
+            payload = await request.json()
+            key = (payload["clientId"], payload["businessName"])
+            self.commits.append(payload["loadId"])
+            # Sin batches el staging no existe: la colección queda vacía
+            self.collections[key] = self.staging.pop((*key, payload["loadId"]), {})
+            return {"committed": payload["loadId"]}
+
+        @app.post("/api/rest/v1/google-sheet/bulk-import/replace/abort")
+        async def replace_abort(request: Request):
+            payload = await request.json()
+            self.aborts.append(payload["loadId"])
+            self.staging.pop((payload["clientId"], payload["businessName"], payload["loadId"]), None)
+            return {"aborted": payload["loadId"]}
+
+        @app.get("/api/rest/v1/google-sheet/{client_id}/{business_name}/search")
+        async def search(client_id: str, business_name: str, id: str):
+            self.search_requests += 1
+            document = self.collections.get((client_id, business_name), {}).get(id)
+            if document is None:
+                return JSONResponse(status_code=404, content={"message": "Documento no encontrado"})
+            return {"clientId": client_id, "businessName": business_name, "data": document}
+
+        @app.get("/api/rest/v1/google-sheet/{client_id}/collections")
+        async def collections(client_id: str):
+            return sorted(f"{client_id}/{business}-DB" for owner, business in self.collections if owner == client_id)
+
+        return app
+
+    @property
+    def documents(self):
+        """Documentos aceptados, en orden de llegada (requiere keep_payloads)"""
+        return [document for payload in self.payloads for document in payload.get("data", [])]
+
+    def __enter__(self) -> "MongoStub":
+        config = uvicorn.Config(self.build_app(), host="127.0.0.1", port=self.port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.thread.start()
+
+        deadline = time.time() + 10
+        while not self.server.started:
+            if time.time() > deadline:
+                raise RuntimeError("El stub de ig-db-mongo no arrancó")
+            time.sleep(0.05)
+
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
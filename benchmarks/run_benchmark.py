@@ -0,0 +1,198 @@
+"""
+Benchmark del pipeline de carga masiva
+
+Genera (o reutiliza) un archivo sintético, levanta un stub de ig-db-mongo en
+proceso y ejecuta TaskProcessor.process_file_async de punta a punta. El
+resultado (filas/s, RSS pico, tiempos por etapa y latencia p50/p99 por batch)
+se guarda como JSON en benchmarks/results/ para comparar entre commits.
+
+Uso:
+    python -m benchmarks.run_benchmark --rows 100000 --columns 20 --format csv
+    python -m benchmarks.run_benchmark --format xlsx --excel-engine pandas
+    python -m benchmarks.run_benchmark --latency-ms 25 --error-rate 0.01 \\
+        --compare benchmarks/results/<anterior>.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from benchmarks.data_generator import generate_file
+from benchmarks.mongo_stub import MongoStub
+
+BENCH_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCH_DIR / "data"
+RESULTS_DIR = BENCH_DIR / "results"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de ms-client-bulk-load")
+    parser.add_argument("--rows", type=int, default=100_000, help="Filas del archivo sintético")
+    parser.add_argument("--columns", type=int, default=20, help="Columnas del archivo sintético")
+    parser.add_argument("--width", type=int, default=16, help="Largo de las celdas de texto libre")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv", help="Formato del archivo")
+    parser.add_argument("--file", type=Path, help="Usar un archivo existente en lugar de generarlo")
+    parser.add_argument("--regenerate", action="store_true", help="Regenerar el archivo sintético")
+    parser.add_argument("--csv-engine", default=None, help="Motor CSV (stdlib, pandas-c, pyarrow)")
+    parser.add_argument("--excel-engine", default=None, help="Motor Excel (stream, pandas)")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="BATCH_SIZE del servicio")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latencia del stub por request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Variación aleatoria de la latencia")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Proporción de requests con error 500")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR, help="Directorio de resultados")
+    parser.add_argument("--compare", type=Path, help="Resultado JSON previo contra el cual comparar")
+    return parser.parse_args(argv)
+
+
+def peak_rss_mb() -> float:
+    """RSS pico del proceso en MB (ru_maxrss es KB en Linux y bytes en macOS)"""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max_rss / divisor, 1)
+
+
+def git_commit() -> Optional[str]:
+    """Commit actual del repositorio, si está disponible"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR.parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def resolve_input_file(args: argparse.Namespace) -> Path:
+    """Obtener el archivo de entrada, generándolo si hace falta"""
+    if args.file:
+        return args.file
+
+    path = DATA_DIR / f"synthetic_{args.rows}x{args.columns}_w{args.width}.{args.format}"
+    if args.regenerate or not path.exists():
+        print(f"📝 Generando {path.name}...")
+        generate_file(path, args.rows, args.columns, args.width)
+    return path
+
+
+async def run_pipeline(path: Path, csv_engine: Optional[str]) -> Dict[str, Any]:
+    """
+    Ejecutar el pipeline del servicio sobre un archivo
+
+    Los módulos de app se importan aquí para que tomen IG_DB_MONGO_URL y
+    BATCH_SIZE del entorno configurado por el benchmark.
+    """
+    from app.services.task_processor import task_processor
+
+    file_content = path.read_bytes()
+    task_id = await task_processor.create_task(client_id="bench", business_name="bench", filename=path.name)
+
+    start = time.perf_counter()
+    await task_processor.process_file_async(
+        task_id, file_content, path.name, "bench", "bench", csv_engine
+    )
+    wall_seconds = time.perf_counter() - start
+
+    return {"wall_seconds": round(wall_seconds, 3), **(await task_processor.get_task_status(task_id))}
+
+
+def compare(current: Dict[str, Any], previous_path: Path):
+    """Imprimir la variación de las métricas principales contra un resultado previo"""
+    previous = json.loads(previous_path.read_text())
+    metrics = [
+        ("rows_per_second", ("rows_per_second",)),
+        ("peak_rss_mb", ("peak_rss_mb",)),
+        ("parse_seconds", ("stage_timings", "parse_seconds")),
+        ("ship_seconds", ("stage_timings", "ship_seconds")),
+        ("batch_p50_ms", ("batch_latency_ms", "p50")),
+        ("batch_p99_ms", ("batch_latency_ms", "p99")),
+    ]
+
+    print(f"\n📊 Comparación contra {previous_path.name} ({previous.get('commit')})")
+    for label, keys in metrics:
+        old, new = previous, current
+        for key in keys:
+            old = (old or {}).get(key)
+            new = (new or {}).get(key)
+        if old and new is not None:
+            print(f"   {label:16} {old:>12} → {new:>12} ({(new - old) / old * 100:+.1f}%)")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    path = resolve_input_file(args)
+
+    with MongoStub(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate) as stub:
+        os.environ["IG_DB_MONGO_URL"] = stub.url
+        os.environ["BATCH_SIZE"] = str(args.batch_size)
+        # Las corridas del benchmark no deben mezclarse con el historial real del servicio
+        os.environ.setdefault("TASK_HISTORY_ENABLED", "false")
+        if args.excel_engine:
+            os.environ["EXCEL_ENGINE"] = args.excel_engine
+
+        print(f"🚀 Procesando {path.name} contra stub {stub.url}...")
+        # TaskProcessor reporta progreso por stdout; se silencia durante la medición
+        with contextlib.redirect_stdout(io.StringIO()):
+            status = asyncio.run(run_pipeline(path, args.csv_engine))
+
+        stub_stats = {
+            "requests": stub.received_requests,
+            "failed_requests": stub.failed_requests,
+            "documents": stub.received_documents,
+        }
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "input": {
+            "file": path.name,
+            "bytes": path.stat().st_size,
+            "rows": args.rows if not args.file else None,
+            "columns": args.columns if not args.file else None,
+            "width": args.width if not args.file else None,
+            "csv_engine": args.csv_engine,
+            "excel_engine": args.excel_engine,
+            "batch_size": args.batch_size,
+        },
+        "stub": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            **stub_stats,
+        },
+        "status": status.get("status"),
+        "total_rows": status.get("total_rows"),
+        "wall_seconds": status.get("wall_seconds"),
+        "rows_per_second": status.get("rows_per_second"),
+        "peak_rss_mb": peak_rss_mb(),
+        "stage_timings": status.get("stage_timings"),
+        "batch_latency_ms": status.get("batch_latency_ms"),
+        "failed_batches": status.get("failed_batches"),
+        "bytes_sent": status.get("bytes_sent"),
+        "retries": status.get("retries"),
+    }
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output_dir / f"{stamp}_{result['commit'] or 'nocommit'}_{path.stem}.json"
+    output.write_text(json.dumps(result, indent=2))
+
+    print(json.dumps(result, indent=2))
+    print(f"\n💾 Resultado guardado en {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
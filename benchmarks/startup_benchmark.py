@@ -0,0 +1,166 @@
+"""
+Benchmark de arranque en frío del servicio
+
+Mide, en procesos nuevos para no reutilizar módulos ya importados:
+
+- import_seconds: tiempo de `import app.main` (sin el arranque del intérprete)
+- health_seconds: desde lanzar uvicorn hasta el primer 200 de /health
+- los módulos más caros según `python -X importtime`
+- qué dependencias pesadas (pandas, openpyxl, motor, pyarrow) quedaron cargadas al arrancar
+
+El resultado se guarda como JSON en benchmarks/results/ para comparar entre commits.
+
+Uso:
+    python -m benchmarks.startup_benchmark --runs 5
+    python -m benchmarks.startup_benchmark --compare benchmarks/results/<anterior>.json
+"""
+import argparse
+import json
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.run_benchmark import RESULTS_DIR, git_commit
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ["pandas", "openpyxl", "motor", "pymongo", "pyarrow", "numpy"]
+
+IMPORT_SCRIPT = """
+import sys, time, json
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % HEAVY_MODULES
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de ms-client-bulk-load")
+    parser.add_argument("--runs", type=int, default=5, help="Repeticiones de cada medición")
+    parser.add_argument("--top", type=int, default=10, help="Módulos más caros a reportar")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Espera máxima por /health")
+    parser.add_argument("--output-dir", type=Path, default=RESULTS_DIR, help="Directorio de resultados")
+    parser.add_argument("--compare", type=Path, help="Resultado JSON previo contra el cual comparar")
+    return parser.parse_args(argv)
+
+
+def free_port() -> int:
+    """Puerto TCP libre en localhost"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import() -> Dict[str, Any]:
+    """Importar app.main en un intérprete nuevo"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_health(timeout: float) -> float:
+    """Lanzar uvicorn y esperar el primer 200 de /health"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/bulk-load-data/health"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        # Un solo cliente: crear uno por intento (contexto SSL incluido) compite por CPU con el servicio
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.get(url).status_code == 200:
+                        return time.perf_counter() - start
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise TimeoutError(f"/health no respondió en {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def top_imports(limit: int) -> List[Dict[str, Any]]:
+    """Módulos con mayor tiempo acumulado de import según -X importtime"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stderr
+
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append({"module": name.strip(), "cumulative_ms": round(int(cumulative) / 1000, 1)})
+
+    return sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:limit]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "median": round(statistics.median(values), 3),
+        "min": round(min(values), 3),
+        "max": round(max(values), 3)
+    }
+
+
+def compare(current: Dict[str, Any], previous_path: Path):
+    """Imprimir la variación de las medianas contra un resultado previo"""
+    previous = json.loads(previous_path.read_text())
+    print(f"\n📊 Comparación contra {previous_path.name} ({previous.get('commit')})")
+    for label in ("import_seconds", "health_seconds"):
+        old = previous.get(label, {}).get("median")
+        new = current[label]["median"]
+        if old:
+            print(f"   {label:16} {old:>8} → {new:>8} ({(new - old) / old * 100:+.1f}%)")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(f"🚀 Midiendo import de app.main ({args.runs} ejecuciones)...")
+    imports = [measure_import() for _ in range(args.runs)]
+
+    print(f"🚀 Midiendo tiempo hasta el primer /health ({args.runs} ejecuciones)...")
+    health = [measure_health(args.timeout) for _ in range(args.runs)]
+
+    result = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "runs": args.runs,
+        "import_seconds": summarize([run["seconds"] for run in imports]),
+        "health_seconds": summarize(health),
+        "heavy_modules_loaded": imports[-1]["loaded"],
+        "top_imports": top_imports(args.top),
+    }
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output_dir / f"{stamp}_{result['commit'] or 'nocommit'}_startup.json"
+    output.write_text(json.dumps(result, indent=2))
+
+    print(json.dumps(result, indent=2))
+    print(f"\n💾 Resultado guardado en {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
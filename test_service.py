@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """
 Script para generar archivos CSV de prueba y probar el microservicio
+
+Prueba manual contra un servicio corriendo. Para mediciones reproducibles
+usar el benchmark: python -m benchmarks.run_benchmark
 """
 import csv
 import requests
@@ -40,24 +43,27 @@ def create_test_csv(filename: str = "test_data.csv", num_rows: int = 10000):
     return filename
 
 
-def test_upload(csv_file: str, client_id: str = "TEST_CLIENT", file_id: str = None):
+BASE_URL = "http://localhost:8088/bulk-load-data"
+
+
+def test_upload(csv_file: str, client_id: str = "TEST_CLIENT", business_name: str = None):
     """
     Probar el endpoint de carga
     """
-    if file_id is None:
-        file_id = f"TEST_FILE_{int(time.time())}"
+    if business_name is None:
+        business_name = f"TEST_BUSINESS_{int(time.time())}"
     
-    url = "http://localhost:8000/api/v1/upload"
+    url = f"{BASE_URL}/file"
     
     print(f"\n🚀 Enviando archivo a {url}")
     print(f"   Client ID: {client_id}")
-    print(f"   File ID: {file_id}")
+    print(f"   Business name: {business_name}")
     
     with open(csv_file, 'rb') as f:
         files = {'file': (csv_file, f, 'text/csv')}
         data = {
             'client_id': client_id,
-            'file_id': file_id
+            'business_name': business_name
         }
         
         start_time = time.time()
@@ -68,11 +74,9 @@ def test_upload(csv_file: str, client_id: str = "TEST_CLIENT", file_id: str = No
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"\n✅ Carga exitosa!")
-                print(f"   Documentos insertados: {result['documents_inserted']}")
-                print(f"   Colección: {result['collection_name']}")
-                print(f"   Tiempo de procesamiento: {result['processing_time_seconds']}s")
-                print(f"   Tiempo total (incluye red): {elapsed_time:.2f}s")
+                print(f"\n✅ Archivo aceptado!")
+                print(f"   Task ID: {result['task_id']}")
+                print(f"   Tiempo de subida: {elapsed_time:.2f}s")
                 return result
             else:
                 print(f"\n❌ Error: {response.status_code}")
@@ -81,34 +85,40 @@ def test_upload(csv_file: str, client_id: str = "TEST_CLIENT", file_id: str = No
                 
         except requests.exceptions.ConnectionError:
             print("\n❌ No se pudo conectar al servidor. ¿Está corriendo el microservicio?")
-            print("   Ejecuta: uvicorn app.main:app --reload")
+            print("   Ejecuta: python app/main.py")
             return None
         except Exception as e:
             print(f"\n❌ Error inesperado: {e}")
             return None
 
 
-def test_status(client_id: str, file_id: str):
+def test_status(task_id: str, timeout_seconds: int = 300):
     """
-    Consultar el estado de una colección
+    Consultar el estado de una tarea hasta que termine
     """
-    url = f"http://localhost:8000/api/v1/status/{client_id}/{file_id}"
+    url = f"{BASE_URL}/status/{task_id}"
     
     print(f"\n🔍 Consultando estado...")
     
+    deadline = time.time() + timeout_seconds
     try:
-        response = requests.get(url)
-        
-        if response.status_code == 200:
+        while time.time() < deadline:
+            response = requests.get(url)
+            
+            if response.status_code != 200:
+                print(f"❌ Error: {response.status_code}")
+                return None
+            
             result = response.json()
-            if result['exists']:
-                print(f"✅ Colección encontrada")
-                print(f"   Nombre: {result['collection_name']}")
-                print(f"   Documentos: {result['document_count']}")
-            else:
-                print(f"❌ Colección no encontrada")
-        else:
-            print(f"❌ Error: {response.status_code}")
+            if result['status'] not in ('queued', 'processing'):
+                print(f"✅ Tarea terminada: {result['status']}")
+                print(f"   Documentos: {result['total_rows']}")
+                print(f"   Tiempo de procesamiento: {result.get('processing_time_seconds')}s")
+                return result
+            
+            time.sleep(1)
+        
+        print(f"⚠️  La tarea no terminó en {timeout_seconds}s")
             
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -118,7 +128,7 @@ def test_health():
     """
     Verificar el health check
     """
-    url = "http://localhost:8000/api/v1/health"
+    url = f"{BASE_URL}/health"
     
     print(f"\n💓 Health check...")
     
@@ -128,7 +138,7 @@ def test_health():
         
         if result['status'] == 'healthy':
             print(f"✅ Servicio saludable")
-            print(f"   MongoDB: {result['mongodb']}")
+            print(f"   ig-db-mongo: {result['ig_db_mongo_url']}")
         else:
             print(f"⚠️  Servicio con problemas")
             print(f"   Estado: {result['status']}")
@@ -159,7 +169,7 @@ def main():
     # 4. Consultar estado
     if result:
         print("=" * 60)
-        test_status(result['client_id'], result['file_id'])
+        test_status(result['task_id'])
     
     print("\n" + "=" * 60)
     print("✅ Tests completados")
@@ -0,0 +1,60 @@
+"""
+Configuración común de los tests
+
+Los servicios leen get_settings() al importarse: los directorios y bases
+SQLite se apuntan a un directorio temporal antes de importar app, para no
+tocar los de un servicio corriendo en la misma máquina.
+"""
+import os
+import tempfile
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="ms-client-bulk-load-tests-")
+
+for _name, _value in {
+    "QUEUE_DB_PATH": os.path.join(_TMP_DIR, "queue.db"),
+    "SPOOL_DIR": os.path.join(_TMP_DIR, "spool"),
+    "UPLOAD_DIR": os.path.join(_TMP_DIR, "uploads"),
+    "LOCAL_INDEX_DIR": os.path.join(_TMP_DIR, "index"),
+    "CHECKPOINT_DIR": os.path.join(_TMP_DIR, "checkpoints"),
+    "PROFILES_DIR": os.path.join(_TMP_DIR, "profiles"),
+    "TASK_HISTORY_DB_PATH": os.path.join(_TMP_DIR, "history.db"),
+    "TASK_HISTORY_ENABLED": "false",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+@pytest.fixture
+def anyio_backend():
+    """Los tests async corren sobre asyncio, como el servicio"""
+    return "asyncio"
+
+
+@pytest.fixture
+def mongo_stub(monkeypatch):
+    """Stub de ig-db-mongo en un hilo; el cliente y las búsquedas apuntan a él"""
+    from benchmarks.mongo_stub import MongoStub
+    from app.client.mongo_client import mongo_client
+    from app.config.settings import get_settings
+
+    with MongoStub(keep_payloads=True) as stub:
+        monkeypatch.setattr(mongo_client, "base_url", stub.url)
+        monkeypatch.setattr(get_settings(), "IG_DB_MONGO_URL", stub.url)
+        yield stub
+
+
+@pytest.fixture
+def api(mongo_stub):
+    """TestClient con lifespan: las tareas en background corren en su event loop"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services.admission_control import admission_controller
+    from app.services.task_processor import task_processor
+
+    with TestClient(app) as client:
+        yield client
+
+    # El apagado del lifespan deja el servicio drenando: restaurar para el siguiente test
+    task_processor.accepting = True
+    task_processor._interrupt_requested = False
+    admission_controller.draining = False
@@ -0,0 +1,30 @@
+"""
+Utilidades compartidas por los tests
+"""
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+FINAL_STATUSES = ("completed", "completed_with_errors", "failed", "interrupted")
+
+
+async def collect(batches: AsyncIterator[List[Dict[str, Any]]]) -> List[List[Dict[str, Any]]]:
+    """Consumir un generador de batches y devolverlos en una lista"""
+    return [batch async for batch in batches]
+
+
+async def aiter_chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    """Entregar unos bytes en bloques de size, como un cuerpo HTTP"""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def wait_for_task(client, task_id: str, timeout: float = 10.0) -> Dict[str, Any]:
+    """Consultar /status hasta que la tarea termine y devolver su estado final"""
+    deadline = time.time() + timeout
+    while True:
+        status = client.get(f"/bulk-load-data/status/{task_id}").json()
+        if status.get("status") in FINAL_STATUSES:
+            return status
+        if time.time() > deadline:
+            raise AssertionError(f"La tarea {task_id} no terminó: {status}")
+        time.sleep(0.02)
@@ -0,0 +1,101 @@
+"""
+Tests del control de admisión de cargas
+"""
+import pytest
+from app.services import admission_control
+from app.services.admission_control import MB, AdmissionController, admission_controller
+from app.services.circuit_breaker import mongo_breaker
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    service = AdmissionController()
+    service.max_in_flight_bytes = 10 * MB
+    service.max_queued_tasks = 2
+    service.max_rss_mb = 0
+    monkeypatch.setattr(mongo_breaker, "_is_open", False)
+    return service
+
+
+def test_admits_and_reserves_until_in_flight_limit(controller):
+    assert controller.try_admit("a", 6 * MB) is None
+    assert controller.in_flight_bytes == 6 * MB
+
+    status_code, _ = controller.try_admit("b", 5 * MB)
+    assert status_code == 429
+    assert "b" not in controller.reservations
+
+    controller.release("a")
+    controller.release("a")
+    assert controller.try_admit("b", 5 * MB) is None
+
+
+def test_rejects_when_too_many_tasks_are_pending(controller):
+    controller.reserve("a", 0)
+    controller.reserve("b", 0)
+
+    assert controller.check(0)[0] == 429
+
+
+@pytest.mark.anyio
+async def test_queue_mode_uses_the_refreshed_queue_depth(controller):
+    depth = [5]
+    controller.queue_depth_provider = lambda: depth[0]
+
+    assert controller.check(0) is None
+
+    await controller.refresh_queue_depth()
+    assert controller.check(0)[0] == 429
+
+    depth[0] = 0
+    await controller.refresh_queue_depth()
+    assert controller.headroom()["queued_tasks"] == 0
+
+
+def test_rejects_with_503_over_the_memory_limit(controller, monkeypatch):
+    controller.max_rss_mb = 100
+    monkeypatch.setattr(admission_control, "current_rss_mb", lambda: 150.0)
+
+    assert controller.check(0)[0] == 503
+    assert controller.headroom()["accepting"] is False
+
+
+def test_rejects_with_503_while_draining_or_upstream_is_down(controller, monkeypatch):
+    controller.draining = True
+    assert controller.check(0)[0] == 503
+
+    controller.draining = False
+    monkeypatch.setattr(mongo_breaker, "_is_open", True)
+    monkeypatch.setattr(mongo_breaker, "open_until", float("inf"))
+    assert controller.check(0)[0] == 503
+
+
+def test_reassign_moves_the_reservation(controller):
+    controller.reserve("upload", 3 * MB)
+
+    controller.reassign("upload", "task")
+    controller.reassign("missing", "other")
+
+    assert controller.reservations == {"task": 3 * MB}
+
+
+def test_upload_over_capacity_gets_429_with_retry_after(api, monkeypatch):
+    monkeypatch.setattr(admission_controller, "max_in_flight_bytes", 10)
+
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1"},
+        files={"file": ("data.csv", b"_id,a\n1,xxxxxxxxxxxxxxxx\n", "text/csv")}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(admission_controller.retry_after_seconds)
+    assert admission_controller.reservations == {}
+
+
+def test_health_reports_admission_headroom(api):
+    admission = api.get("/bulk-load-data/health").json()["admission"]
+
+    assert admission["accepting"] is True
+    assert admission["draining"] is False
+    assert admission["in_flight_mb"] == 0
@@ -0,0 +1,75 @@
+"""
+Tests del harness de benchmarks: generador de datos, stub y pipeline
+"""
+import csv
+import json
+import httpx
+import pytest
+from benchmarks.data_generator import build_headers, generate_file
+from benchmarks.mongo_stub import MongoStub
+from benchmarks.run_benchmark import compare, run_pipeline
+
+BULK_IMPORT_PATH = "/api/rest/v1/google-sheet/bulk-import"
+
+
+def test_generated_csv_has_requested_shape_and_is_reproducible(tmp_path):
+    first = generate_file(tmp_path / "a.csv", rows=50, columns=7, width=5)
+    second = generate_file(tmp_path / "b.csv", rows=50, columns=7, width=5)
+
+    rows = list(csv.reader(first.open(newline="")))
+    assert rows[0] == build_headers(7) == ["id"] + [f"col_{i}" for i in range(1, 7)]
+    assert len(rows) == 51
+    assert all(len(row) == 7 for row in rows)
+    assert len({row[0] for row in rows[1:]}) == 50
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_generated_xlsx_has_requested_shape(tmp_path):
+    from openpyxl import load_workbook
+
+    path = generate_file(tmp_path / "a.xlsx", rows=10, columns=4, width=3)
+
+    sheet = load_workbook(path, read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == build_headers(4)
+    assert len(rows) == 11
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        generate_file(tmp_path / "a.parquet", rows=1, columns=1, width=1)
+
+
+def test_stub_counts_documents_and_injects_errors():
+    with MongoStub(error_rate=1.0) as failing, MongoStub() as healthy:
+        payload = {"data": [{"_id": "1"}, {"_id": "2"}]}
+        assert httpx.post(failing.url + BULK_IMPORT_PATH, json=payload).status_code == 500
+        assert httpx.post(healthy.url + BULK_IMPORT_PATH, json=payload).json() == {"inserted": 2}
+
+    assert (failing.failed_requests, failing.received_documents) == (1, 0)
+    assert (healthy.received_requests, healthy.received_documents) == (1, 2)
+    assert healthy.payloads == []
+
+
+@pytest.mark.anyio
+async def test_pipeline_ships_every_row_to_the_stub(tmp_path, mongo_stub):
+    path = generate_file(tmp_path / "bench.csv", rows=120, columns=5, width=4)
+
+    status = await run_pipeline(path, csv_engine=None)
+
+    assert status["status"] == "completed"
+    assert status["total_rows"] == 120
+    assert mongo_stub.received_documents == 120
+    assert status["stage_timings"].keys() == {"parse_seconds", "ship_seconds"}
+    assert status["batch_latency_ms"]["p50"] is not None
+
+
+def test_compare_prints_relative_change(tmp_path, capsys):
+    previous = tmp_path / "previous.json"
+    previous.write_text(json.dumps({"commit": "abc", "rows_per_second": 100.0, "stage_timings": {"parse_seconds": 2.0}}))
+
+    compare({"rows_per_second": 150.0, "stage_timings": {"parse_seconds": 1.0}}, previous)
+
+    output = capsys.readouterr().out
+    assert "+50.0%" in output
+    assert "-50.0%" in output
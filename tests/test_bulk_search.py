@@ -0,0 +1,71 @@
+"""
+Tests de la búsqueda masiva de IDs (respuesta NDJSON)
+"""
+import json
+import pytest
+from app.config.settings import get_settings
+from app.services.cache_service import response_cache
+
+
+@pytest.fixture
+def loaded(api):
+    response_cache.invalidate_prefix(("search",))
+    body = b"".join(json.dumps({"_id": str(i), "v": f"v{i}"}).encode() + b"\n" for i in range(5))
+    api.post("/bulk-load-data/stream", params={"client_id": "c1", "business_name": "b1"}, content=body)
+    return api
+
+
+def search(client, ids):
+    response = client.post("/bulk-load-data/c1/b1/search", json={"ids": ids})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return {line["id"]: line for line in map(json.loads, response.text.splitlines())}
+
+
+def test_one_line_per_unique_id(loaded, mongo_stub):
+    results = search(loaded, ["1", "3", "1", "missing"])
+
+    assert set(results) == {"1", "3", "missing"}
+    assert results["1"]["status"] == 200
+    assert results["1"]["result"]["data"] == {"_id": "1", "v": "v1"}
+    assert results["missing"]["status"] == 404
+    assert "error" in results["missing"]
+    assert mongo_stub.search_requests == 3
+
+
+def test_results_come_from_the_cache(loaded, mongo_stub):
+    loaded.get("/bulk-load-data/c1/b1/search/2")
+
+    results = search(loaded, ["2", "4"])
+
+    assert results["2"]["result"]["data"]["v"] == "v2"
+    assert mongo_stub.search_requests == 2
+
+
+def test_limited_concurrency_still_answers_every_id(loaded, monkeypatch):
+    monkeypatch.setattr(get_settings(), "BULK_SEARCH_CONCURRENCY", 1)
+
+    results = search(loaded, [str(i) for i in range(5)])
+
+    assert sorted(results) == [str(i) for i in range(5)]
+    assert all(line["status"] == 200 for line in results.values())
+
+
+def test_too_many_ids_is_rejected(api, monkeypatch):
+    monkeypatch.setattr(get_settings(), "BULK_SEARCH_MAX_IDS", 2)
+
+    response = api.post("/bulk-load-data/c1/b1/search", json={"ids": ["1", "2", "3"]})
+
+    assert response.status_code == 400
+
+
+def test_duplicates_count_once_against_the_limit(api, monkeypatch):
+    monkeypatch.setattr(get_settings(), "BULK_SEARCH_MAX_IDS", 2)
+
+    response = api.post("/bulk-load-data/c1/b1/search", json={"ids": ["1", "1", "2"]})
+
+    assert response.status_code == 200
+
+
+def test_empty_id_list_is_invalid(api):
+    assert api.post("/bulk-load-data/c1/b1/search", json={"ids": []}).status_code == 422
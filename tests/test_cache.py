@@ -0,0 +1,151 @@
+"""
+Tests del cache de búsquedas (TTL + LRU + coalescing)
+"""
+import asyncio
+import pytest
+from app.services import cache_service
+from app.services.cache_service import ResponseCache, response_cache
+
+
+class Loader:
+    """Loader que cuenta sus llamadas y puede demorarse o fallar"""
+
+    def __init__(self, value="v", delay: float = 0, error: Exception = None):
+        self.value = value
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.anyio
+async def test_hit_until_ttl_expires(clock):
+    cache = ResponseCache(ttl_seconds=10, max_entries=10)
+    loader = Loader()
+
+    assert await cache.get_or_load(("search", "c", "b", "1"), loader) == "v"
+    clock[0] += 9
+    assert await cache.get_or_load(("search", "c", "b", "1"), loader) == "v"
+    assert loader.calls == 1
+
+    clock[0] += 2
+    await cache.get_or_load(("search", "c", "b", "1"), loader)
+    assert loader.calls == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.anyio
+async def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+    loaders = {key: Loader(key) for key in "abc"}
+
+    await cache.get_or_load(("a",), loaders["a"])
+    await cache.get_or_load(("b",), loaders["b"])
+    await cache.get_or_load(("a",), loaders["a"])
+    await cache.get_or_load(("c",), loaders["c"])
+
+    await cache.get_or_load(("a",), loaders["a"])
+    await cache.get_or_load(("b",), loaders["b"])
+    assert (loaders["a"].calls, loaders["b"].calls) == (1, 2)
+
+
+@pytest.mark.anyio
+async def test_concurrent_lookups_share_one_load():
+    cache = ResponseCache(ttl_seconds=60, max_entries=10)
+    loader = Loader(delay=0.02)
+
+    results = await asyncio.gather(*(cache.get_or_load(("k",), loader) for _ in range(5)))
+
+    assert results == ["v"] * 5
+    assert loader.calls == 1
+    assert cache.coalesced == 4
+
+
+@pytest.mark.anyio
+async def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = ResponseCache(ttl_seconds=60, max_entries=10)
+    loader = Loader(delay=0.02, error=RuntimeError("upstream"))
+
+    results = await asyncio.gather(*(cache.get_or_load(("k",), loader) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.stats()["entries"] == 0
+    loader.error = None
+    assert await cache.get_or_load(("k",), loader) == "v"
+    assert loader.calls == 2
+
+
+@pytest.mark.anyio
+async def test_invalidation_discards_loads_in_flight():
+    cache = ResponseCache(ttl_seconds=60, max_entries=10)
+    stale = Loader("old", delay=0.02)
+
+    pending = asyncio.ensure_future(cache.get_or_load(("search", "c", "b", "1"), stale))
+    await asyncio.sleep(0)
+    cache.invalidate_collection("c", "b")
+
+    assert await pending == "old"
+    fresh = Loader("new")
+    assert await cache.get_or_load(("search", "c", "b", "1"), fresh) == "new"
+    assert fresh.calls == 1
+
+
+@pytest.mark.anyio
+async def test_invalidation_is_scoped_to_the_collection():
+    cache = ResponseCache(ttl_seconds=60, max_entries=10)
+    await cache.get_or_load(("search", "c", "b", "1"), Loader())
+    await cache.get_or_load(("search", "c", "other", "1"), Loader())
+    await cache.get_or_load(("collections", "c"), Loader())
+
+    cache.invalidate_collection("c", "b")
+
+    assert list(cache._entries) == [("search", "c", "other", "1")]
+
+
+@pytest.mark.anyio
+async def test_disabled_cache_always_loads():
+    cache = ResponseCache(ttl_seconds=60, max_entries=10, enabled=False)
+    loader = Loader()
+
+    await cache.get_or_load(("k",), loader)
+    await cache.get_or_load(("k",), loader)
+
+    assert loader.calls == 2
+
+
+def test_search_endpoint_is_cached_and_invalidated_by_loads(api, mongo_stub):
+    response_cache.invalidate_prefix(("search",))
+    api.post("/bulk-load-data/stream", params={"client_id": "c1", "business_name": "b1"}, content=b'{"_id": "1", "v": "a"}\n')
+
+    first = api.get("/bulk-load-data/c1/b1/search/1")
+    second = api.get("/bulk-load-data/c1/b1/search/1")
+    assert first.json() == second.json()
+    assert first.json()["data"]["v"] == "a"
+    assert mongo_stub.search_requests == 1
+
+    api.post("/bulk-load-data/stream", params={"client_id": "c1", "business_name": "b1", "load_mode": "upsert"},
+             content=b'{"_id": "1", "v": "b"}\n')
+
+    assert api.get("/bulk-load-data/c1/b1/search/1").json()["data"]["v"] == "b"
+    assert mongo_stub.search_requests == 2
+
+
+def test_upstream_errors_are_not_cached(api, mongo_stub):
+    response_cache.invalidate_prefix(("search",))
+
+    assert api.get("/bulk-load-data/c1/b1/search/missing").status_code == 404
+    assert api.get("/bulk-load-data/c1/b1/search/missing").status_code == 404
+    assert mongo_stub.search_requests == 2
@@ -0,0 +1,202 @@
+"""
+Tests de las subidas por partes reanudables
+"""
+import asyncio
+import uuid
+import pytest
+from app.services.chunked_upload import ChunkedUploadService, UploadConflictError, UploadNotFoundError
+from tests.helpers import aiter_chunks, wait_for_task
+
+CONTENT = b"_id,a\n" + b"".join(f"{i},x{i}\n".encode() for i in range(50))
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    service = ChunkedUploadService()
+    service.upload_dir = tmp_path
+    monkeypatch.setattr(service.settings, "UPLOAD_IDLE_TIMEOUT_SECONDS", 5.0)
+    return service
+
+
+def new_upload(uploads, streaming=True) -> str:
+    upload_id = str(uuid.uuid4())
+    uploads.create(upload_id, {"filename": "data.csv", "streaming": streaming})
+    return upload_id
+
+
+async def write(uploads, upload_id, part_number, data: bytes):
+    return await uploads.write_part(upload_id, part_number, aiter_chunks(data, 7))
+
+
+async def read_parts(uploads, upload_id) -> bytes:
+    return b"".join([block async for block in uploads.iter_parts(upload_id)])
+
+
+@pytest.mark.anyio
+async def test_parts_out_of_order_are_read_in_order(uploads):
+    upload_id = new_upload(uploads)
+    await write(uploads, upload_id, 2, b"world")
+    await write(uploads, upload_id, 1, b"hello ")
+
+    assert uploads.complete(upload_id, 2) == 11
+    assert await read_parts(uploads, upload_id) == b"hello world"
+    assert uploads.status(upload_id)["processed_parts"] == 2
+
+
+@pytest.mark.anyio
+async def test_iter_parts_streams_parts_as_they_arrive(uploads):
+    upload_id = new_upload(uploads)
+    reader = asyncio.create_task(read_parts(uploads, upload_id))
+
+    await write(uploads, upload_id, 1, b"a")
+    await asyncio.sleep(0.05)
+    await write(uploads, upload_id, 2, b"b")
+    uploads.complete(upload_id, 2)
+
+    assert await asyncio.wait_for(reader, 5) == b"ab"
+
+
+@pytest.mark.anyio
+async def test_resending_a_part_is_idempotent_until_it_is_processed(uploads):
+    upload_id = new_upload(uploads)
+    first = await write(uploads, upload_id, 1, b"abc")
+
+    assert await write(uploads, upload_id, 1, b"abc") == first
+    await write(uploads, upload_id, 1, b"xyz")
+    assert uploads.status(upload_id)["parts"] == [{"part_number": 1, "size": 3}]
+
+    uploads._consumed[upload_id] = 1
+    with pytest.raises(UploadConflictError):
+        await write(uploads, upload_id, 1, b"other")
+
+
+@pytest.mark.anyio
+async def test_part_number_and_size_limits(uploads, monkeypatch):
+    upload_id = new_upload(uploads)
+    monkeypatch.setattr(uploads, "max_part_bytes", 4)
+
+    with pytest.raises(ValueError):
+        await write(uploads, upload_id, 0, b"a")
+    with pytest.raises(ValueError):
+        await write(uploads, upload_id, 1, b"too long")
+
+    assert uploads.list_parts(upload_id) == {}
+    assert [p.name for p in (uploads.upload_dir / upload_id).iterdir()] == ["upload.json"]
+
+
+def test_complete_requires_every_part(uploads):
+    upload_id = new_upload(uploads)
+    (uploads.upload_dir / upload_id / "000002.part").write_bytes(b"x")
+
+    with pytest.raises(ValueError, match=r"\[1\]"):
+        uploads.complete(upload_id, 2)
+    with pytest.raises(ValueError):
+        uploads.complete(upload_id, 1)
+
+
+@pytest.mark.anyio
+async def test_completed_upload_rejects_new_parts(uploads):
+    upload_id = new_upload(uploads)
+    await write(uploads, upload_id, 1, b"a")
+    uploads.complete(upload_id, 1)
+
+    with pytest.raises(UploadConflictError):
+        await write(uploads, upload_id, 2, b"b")
+    with pytest.raises(UploadConflictError):
+        uploads.complete(upload_id, 1)
+
+
+@pytest.mark.anyio
+async def test_remove_wakes_a_waiting_reader(uploads):
+    upload_id = new_upload(uploads)
+    reader = asyncio.create_task(read_parts(uploads, upload_id))
+    await asyncio.sleep(0.05)
+
+    uploads.remove(upload_id)
+
+    with pytest.raises(ValueError):
+        await asyncio.wait_for(reader, 5)
+
+
+def test_unknown_or_invalid_ids_are_not_found(uploads):
+    with pytest.raises(UploadNotFoundError):
+        uploads.status(str(uuid.uuid4()))
+    with pytest.raises(UploadNotFoundError):
+        uploads.get_meta("../etc")
+
+
+def upload_in_parts(api, filename: str, content: bytes, part_size: int, **data) -> dict:
+    started = api.post(
+        "/bulk-load-data/uploads",
+        data={"client_id": "c1", "business_name": "b1", "filename": filename, **data}
+    ).json()
+    upload_id = started["upload_id"]
+
+    parts = [content[i:i + part_size] for i in range(0, len(content), part_size)]
+    for n, part in enumerate(parts, start=1):
+        assert api.put(f"/bulk-load-data/uploads/{upload_id}/parts/{n}", content=part).status_code == 200
+    assert api.get(f"/bulk-load-data/uploads/{upload_id}").json()["received_bytes"] == len(content)
+
+    response = api.post(f"/bulk-load-data/uploads/{upload_id}/complete", params={"total_parts": len(parts)})
+    assert response.status_code == 200, response.text
+    return {**started, "status": wait_for_task(api, upload_id)}
+
+
+def test_streamed_csv_upload_loads_every_row(api, mongo_stub):
+    result = upload_in_parts(api, "data.csv", CONTENT, part_size=37)
+
+    assert result["streaming"] is True
+    assert result["status"]["status"] == "completed"
+    assert [doc["_id"] for doc in mongo_stub.documents] == [str(i) for i in range(50)]
+    assert mongo_stub.documents[-1] == {"_id": "49", "a": "x49"}
+
+
+def test_non_streamable_upload_is_processed_on_complete(api, mongo_stub):
+    result = upload_in_parts(api, "data.csv", CONTENT, part_size=100, csv_engine="pandas-c")
+
+    assert result["streaming"] is False
+    assert result["status"]["status"] == "completed"
+    assert len(mongo_stub.documents) == 50
+
+
+def test_missing_parts_and_aborted_uploads(api):
+    upload_id = api.post(
+        "/bulk-load-data/uploads",
+        data={"client_id": "c1", "business_name": "b1", "filename": "data.xlsx"}
+    ).json()["upload_id"]
+    api.put(f"/bulk-load-data/uploads/{upload_id}/parts/2", content=b"x")
+
+    assert api.post(f"/bulk-load-data/uploads/{upload_id}/complete", params={"total_parts": 2}).status_code == 400
+
+    assert api.delete(f"/bulk-load-data/uploads/{upload_id}").json()["status"] == "aborted"
+    assert api.get(f"/bulk-load-data/uploads/{upload_id}").status_code == 404
+    assert wait_for_task(api, upload_id)["status"] == "failed"
+
+
+@pytest.mark.anyio
+async def test_queue_mode_spools_the_parts_without_reading_them_into_memory(api, mongo_stub, monkeypatch, tmp_path):
+    from app.services.chunked_upload import chunked_uploads
+    from app.services.task_processor import task_processor
+    from app.services.task_queue import SqliteTaskQueue
+
+    monkeypatch.setattr(task_processor.settings, "WORKER_MODE", "queue")
+    monkeypatch.setattr(task_processor, "task_queue", SqliteTaskQueue(str(tmp_path / "queue.db"), lease_seconds=30, max_attempts=1))
+    monkeypatch.setattr(chunked_uploads, "read_all", None)
+    upload_id = api.post(
+        "/bulk-load-data/uploads",
+        data={"client_id": "c1", "business_name": "b1", "filename": "data.csv", "csv_engine": "pandas-c"}
+    ).json()["upload_id"]
+    for n, start in enumerate(range(0, len(CONTENT), 100), start=1):
+        api.put(f"/bulk-load-data/uploads/{upload_id}/parts/{n}", content=CONTENT[start:start + 100])
+
+    response = api.post(f"/bulk-load-data/uploads/{upload_id}/complete", params={"total_parts": n})
+
+    assert response.status_code == 200, response.text
+    assert task_processor.spool_path(upload_id).read_bytes() == CONTENT
+    claimed_id, payload = task_processor.task_queue.claim("w/0")
+    assert claimed_id == upload_id
+
+    await task_processor._run_claimed_task(claimed_id, payload, "w/0")
+
+    assert (await task_processor.get_task_status(upload_id))["status"] == "completed"
+    assert len(mongo_stub.documents) == 50
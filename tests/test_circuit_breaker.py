@@ -0,0 +1,148 @@
+"""
+Tests del circuit breaker hacia ig-db-mongo y de los reintentos del cliente
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.client import mongo_client as mongo_client_module
+from app.client.mongo_client import mongo_client
+from app.services import circuit_breaker as circuit_breaker_module
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    service = CircuitBreaker("test")
+    service.min_calls = 4
+    service.failure_rate = 0.5
+    monkeypatch.setattr(service.settings, "CIRCUIT_OPEN_SECONDS", 5.0)
+    monkeypatch.setattr(service.settings, "CIRCUIT_MAX_OPEN_SECONDS", 12.0)
+    return service
+
+
+def record(breaker, failed: bool):
+    with breaker.call() as outcome:
+        outcome.failed = failed
+
+
+def open_circuit(breaker):
+    for failed in (False, False, True, True):
+        record(breaker, failed)
+
+
+def test_opens_when_the_failure_rate_reaches_the_threshold(breaker, clock):
+    for failed in (False, False, True):
+        record(breaker, failed)
+    assert breaker.state == CLOSED
+
+    record(breaker, True)
+
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == 5.0
+    with pytest.raises(CircuitOpenError) as error:
+        record(breaker, False)
+    assert error.value.retry_after == 5.0
+
+
+def test_exceptions_and_slow_calls_count_as_failures(breaker, clock):
+    breaker.slow_call_seconds = 0
+    record(breaker, False)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            with breaker.call():
+                raise RuntimeError("timeout")
+
+    assert breaker.state == OPEN
+
+
+def test_half_open_allows_a_single_probe_and_closes_on_success(breaker, clock):
+    open_circuit(breaker)
+    clock[0] += 5
+    assert breaker.state == HALF_OPEN
+
+    with breaker.call():
+        with pytest.raises(CircuitOpenError):
+            record(breaker, False)
+
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_opens == 0
+
+
+def test_failed_probe_reopens_with_doubled_wait_up_to_the_maximum(breaker, clock):
+    open_circuit(breaker)
+
+    for expected in (10.0, 12.0):
+        clock[0] += breaker.retry_after()
+        record(breaker, True)
+        assert breaker.state == OPEN
+        assert breaker.retry_after() == expected
+
+    assert breaker.stats()["times_opened"] == 3
+
+
+def test_cancelled_probe_releases_the_probe_slot(breaker, clock):
+    open_circuit(breaker)
+    clock[0] += 5
+
+    with pytest.raises(asyncio.CancelledError):
+        with breaker.call():
+            raise asyncio.CancelledError()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is True
+
+
+@pytest.mark.anyio
+async def test_wait_until_available_pauses_until_half_open(breaker):
+    open_circuit(breaker)
+    breaker.open_until = circuit_breaker_module.time.monotonic() + 0.1
+
+    assert not await breaker.wait_until_available(0.02)
+    assert await breaker.wait_until_available(1)
+    assert breaker.state == HALF_OPEN
+
+
+@pytest.fixture
+def retries(monkeypatch):
+    monkeypatch.setattr(mongo_client_module, "mongo_breaker", CircuitBreaker("ig-db-mongo"))
+    monkeypatch.setattr(mongo_client.settings, "BULK_IMPORT_MAX_RETRIES", 2)
+    monkeypatch.setattr(mongo_client.settings, "BULK_IMPORT_RETRY_BACKOFF_SECONDS", 0.001)
+    return SimpleNamespace(breaker=mongo_client_module.mongo_breaker)
+
+
+@pytest.mark.anyio
+async def test_server_errors_are_retried_with_backoff(mongo_stub, retries):
+    mongo_stub.error_rate = 1.0
+    transfer = {}
+
+    assert not await mongo_client.bulk_import("c1", "b1", [{"_id": "1"}], transfer=transfer)
+
+    assert mongo_stub.failed_requests == 3
+    assert transfer["retries"] == 2
+    assert list(retries.breaker.window) == [True, True, True]
+
+
+@pytest.mark.anyio
+async def test_open_circuit_fails_fast_after_the_max_pause(mongo_stub, retries, monkeypatch):
+    for _ in range(retries.breaker.min_calls):
+        record(retries.breaker, True)
+    monkeypatch.setattr(mongo_client.settings, "CIRCUIT_MAX_PAUSE_SECONDS", 0.01)
+
+    assert not await mongo_client.bulk_import("c1", "b1", [{"_id": "1"}])
+
+    assert mongo_stub.received_requests == 0
+
+
+def test_health_reports_the_circuit(api):
+    circuit = api.get("/bulk-load-data/health").json()["ig_db_mongo_circuit"]
+
+    assert circuit["state"] in (CLOSED, OPEN, HALF_OPEN)
+    assert {"retry_after_seconds", "recent_failure_rate", "times_opened"} <= circuit.keys()
@@ -0,0 +1,42 @@
+"""
+Tests de la proyección de columnas (ColumnSpec resuelto contra los headers)
+"""
+import pytest
+from app.dto.schemas import ColumnSpec
+from app.services.column_projection import ColumnProjection
+
+
+def test_without_spec_reads_every_column_with_the_first_as_id():
+    projection = ColumnProjection(["_id", "a", "b"])
+
+    assert projection.read_columns == ["_id", "a", "b"]
+    assert projection.read_indices == [0, 1, 2]
+    assert projection.to_document(["1", "x", "y"]) == {"_id": "1", "a": "x", "b": "y"}
+
+
+def test_id_column_outside_include_is_read_last():
+    projection = ColumnProjection(["a", "b", "rut"], ColumnSpec(include=["b"], rename={"b": "B"}, id_column="rut"))
+
+    assert projection.read_columns == ["b", "rut"]
+    assert projection.read_indices == [1, 2]
+    assert projection.to_document(["x", "k"]) == {"_id": "k", "B": "x"}
+
+
+def test_duplicate_headers_resolve_to_the_last_position():
+    projection = ColumnProjection(["id", "a", "b", "a"], ColumnSpec(exclude=["b"]))
+
+    assert projection.read_columns == ["id", "a"]
+    assert projection.read_indices == [0, 3]
+    assert projection.duplicated_headers is True
+
+
+def test_unknown_columns_are_rejected():
+    with pytest.raises(ValueError, match="missing"):
+        ColumnProjection(["a"], ColumnSpec(rename={"missing": "x"}))
+
+
+def test_project_mapping_filters_and_renames_keys():
+    spec = ColumnSpec(include=["a", "b", "zz"], exclude=["b"], rename={"a": "A"})
+
+    assert ColumnProjection.project_mapping({"a": 1, "b": 2, "c": 3}, spec) == {"A": 1}
+    assert ColumnProjection.project_mapping({"a": 1}, None) == {"a": 1}
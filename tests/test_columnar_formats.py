@@ -0,0 +1,122 @@
+"""
+Tests de los formatos columnares: Parquet y Arrow IPC
+"""
+import datetime
+import io
+import json
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+from app.dto.schemas import ColumnSpec
+from app.services.file_processor import FileProcessor
+from tests.helpers import collect
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def processor():
+    processor = FileProcessor()
+    processor.batch_size = 2
+    return processor
+
+
+def sample_table() -> pa.Table:
+    return pa.table({
+        "code": ["A1", "B2.", None],
+        "amount": [10, None, 30],
+        "tags": [[1, 2], [], None],
+        "meta": [{"k": "v."}, {"k": None}, None],
+    })
+
+
+def to_parquet(table: pa.Table, row_group_size: int = 1) -> bytes:
+    sink = io.BytesIO()
+    pq.write_table(table, sink, row_group_size=row_group_size)
+    return sink.getvalue()
+
+
+def to_arrow_file(table: pa.Table) -> bytes:
+    sink = io.BytesIO()
+    feather.write_feather(table, sink, compression="uncompressed")
+    return sink.getvalue()
+
+
+def to_arrow_stream(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+EXPECTED = [
+    {"_id": "A1", "code": "A1", "amount": "10", "tags": [1, 2], "meta": {"k": "v."}},
+    {"_id": "B2", "code": "B2", "amount": "", "tags": [], "meta": {"k": None}},
+    {"_id": "", "code": "", "amount": "30", "tags": "", "meta": ""},
+]
+
+
+@pytest.mark.parametrize("filename, encode", [
+    ("data.parquet", to_parquet),
+    ("data.arrow", to_arrow_file),
+    ("data.ipc", to_arrow_stream),
+])
+async def test_columnar_formats_produce_cleaned_documents(processor, filename, encode):
+    batches = await collect(processor.process_file(encode(sample_table()), filename))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [doc for batch in batches for doc in batch] == EXPECTED
+
+
+async def test_nested_values_match_ndjson(processor):
+    ndjson = "\n".join(
+        json.dumps(row) for row in sample_table().to_pylist()
+    ).encode()
+
+    from_ndjson = await collect(processor.process_file(ndjson, "data.ndjson"))
+    from_parquet = await collect(processor.process_file(to_parquet(sample_table()), "data.parquet"))
+
+    nested = ("tags", "meta")
+    assert [{k: doc[k] for k in nested} for batch in from_ndjson for doc in batch] == \
+        [{k: doc[k] for k in nested} for batch in from_parquet for doc in batch]
+
+
+async def test_nested_values_are_json_serializable(processor):
+    table = pa.table({
+        "_id": ["1"],
+        "events": [[{"at": datetime.date(2024, 1, 2), "raw": b"x"}]],
+    })
+
+    batches = await collect(processor.process_file(to_parquet(table), "data.parquet"))
+
+    document = batches[0][0]
+    assert document["events"] == [{"at": "2024-01-02", "raw": "b'x'"}]
+    json.dumps(document)
+
+
+async def test_projection_reads_only_selected_columns(processor):
+    spec = ColumnSpec(include=["amount"], rename={"amount": "total"}, id_column="code")
+
+    batches = await collect(processor.process_file(to_parquet(sample_table()), "data.parquet", column_spec=spec))
+
+    assert [doc for batch in batches for doc in batch] == [
+        {"_id": "A1", "total": "10"},
+        {"_id": "B2", "total": ""},
+        {"_id": "", "total": "30"},
+    ]
+
+
+async def test_parquet_without_columns_is_rejected(processor):
+    with pytest.raises(ValueError):
+        await collect(processor.process_file(to_parquet(pa.table({})), "empty.parquet"))
+
+
+@pytest.mark.parametrize("encode", [to_parquet, to_arrow_file])
+async def test_duplicate_columns_keep_the_last_one(processor, encode):
+    table = pa.Table.from_arrays([pa.array(["1"]), pa.array(["x"]), pa.array(["y"])], names=["id", "a", "a"])
+    filename = "data.parquet" if encode is to_parquet else "data.arrow"
+
+    batches = await collect(processor.process_file(encode(table), filename))
+
+    assert batches == [[{"_id": "1", "id": "1", "a": "y"}]]
@@ -0,0 +1,132 @@
+"""
+Conformidad de los motores CSV
+
+Todos los motores (stdlib, pandas-c, pyarrow y el parseo en streaming)
+deben producir exactamente los mismos documentos para el mismo archivo.
+stdlib es la referencia: cada fixture fija además su resultado esperado.
+"""
+import pytest
+from app.dto.schemas import ColumnSpec
+from app.services.file_processor import FileProcessor
+from app.utils.constants import CsvEngines
+from tests.helpers import aiter_chunks, collect, wait_for_task
+
+pytestmark = pytest.mark.anyio
+
+ENGINES = [CsvEngines.STDLIB, CsvEngines.PANDAS_C, CsvEngines.PYARROW, "stream"]
+
+FIXTURES = {
+    "ragged_long_first_row": (
+        b"_id,a,b\n1,x,y,z\n2,p,q\n",
+        [{"_id": "1", "a": "x", "b": "y"}, {"_id": "2", "a": "p", "b": "q"}],
+    ),
+    "ragged_long_later_row": (
+        b"_id,a\n1,x\n2,y\n3,z\n4,w,extra\n5,v\n",
+        [{"_id": str(i), "a": a} for i, a in enumerate("xyzwv", start=1)],
+    ),
+    "ragged_short": (
+        b"_id,a,b\n1,x\n2,p,q\n",
+        [{"_id": "1", "a": "x", "b": ""}, {"_id": "2", "a": "p", "b": "q"}],
+    ),
+    "blank_lines": (
+        b"_id,a\n\n1,x\n\n\n2,y\n\n",
+        [{"_id": "1", "a": "x"}, {"_id": "2", "a": "y"}],
+    ),
+    "whitespace_only_line": (
+        b"_id,a\n1,x\n   \n2,y\n",
+        [{"_id": "1", "a": "x"}, {"_id": "", "a": ""}, {"_id": "2", "a": "y"}],
+    ),
+    "duplicate_headers": (
+        b"id,a,a\n1,x,y\n",
+        [{"_id": "1", "id": "1", "a": "y"}],
+    ),
+    "multiline_header": (
+        b'_id,"a\nb",c\n1,x,y\n',
+        [{"_id": "1", "a\nb": "x", "c": "y"}],
+    ),
+    "multiline_header_crlf": (
+        b'"_id","a\r\n""b"""\r\n1,x\r\n',
+        [{"_id": "1", 'a\r\n"b"': "x"}],
+    ),
+    "header_only": (b"_id,a\n", []),
+    "header_only_without_newline": (b"_id,a", []),
+    "bom": (
+        "﻿_id,ñ\n1,á.\n".encode("utf-8"),
+        [{"_id": "1", "ñ": "á"}],
+    ),
+    "latin1": (
+        "_id,ñ\n1,á\n".encode("latin-1"),
+        [{"_id": "1", "ñ": "á"}],
+    ),
+    "quoted_newlines": (
+        b'_id,a\n1,"x\ny"\n2,"z,\r\nw."\n',
+        [{"_id": "1", "a": "x\ny"}, {"_id": "2", "a": "z,\r\nw"}],
+    ),
+    "crlf": (
+        b"_id,a\r\n1,x\r\n2,y",
+        [{"_id": "1", "a": "x"}, {"_id": "2", "a": "y"}],
+    ),
+    "cleaning": (
+        b'_id,a\n" 1. ",  x!!  \n',
+        [{"_id": "1", "a": "x"}],
+    ),
+}
+
+
+async def parse(engine: str, content: bytes, batch_size: int, column_spec=None):
+    processor = FileProcessor()
+    processor.batch_size = batch_size
+    if engine == "stream":
+        batches = processor.process_csv_stream(aiter_chunks(content, 3), "f.csv", column_spec)
+    else:
+        batches = processor.process_csv(content, "f.csv", engine=engine, column_spec=column_spec)
+    return await collect(batches)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+@pytest.mark.parametrize("fixture", FIXTURES)
+async def test_engines_produce_identical_documents(fixture, engine, batch_size):
+    content, expected = FIXTURES[fixture]
+
+    batches = await parse(engine, content, batch_size)
+
+    assert [doc for batch in batches for doc in batch] == expected
+    assert all(batches), "no debe haber batches vacíos"
+    assert all(len(batch) <= batch_size for batch in batches)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("fixture", FIXTURES)
+async def test_engines_match_with_projection(fixture, engine):
+    content, expected = FIXTURES[fixture]
+    if not expected or "a" not in expected[0]:
+        pytest.skip("sin columna a proyectar")
+    spec = ColumnSpec(include=["a"], rename={"a": "alias"})
+
+    batches = await parse(engine, content, 2, spec)
+
+    reference = await parse(CsvEngines.STDLIB, content, 2, spec)
+    assert batches == reference
+    assert [list(doc) for batch in batches for doc in batch] == [["_id", "alias"]] * len(expected)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("content", [b"", b"\n_id,a\n1,x\n"])
+async def test_missing_headers_are_rejected(engine, content):
+    with pytest.raises(ValueError):
+        await parse(engine, content, 2)
+
+
+@pytest.mark.parametrize("engine", [CsvEngines.STDLIB, CsvEngines.PANDAS_C, CsvEngines.PYARROW])
+def test_header_only_file_sends_no_batches(api, mongo_stub, engine):
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1", "csv_engine": engine},
+        files={"file": ("empty.csv", b"_id,a\n", "text/csv")}
+    )
+    status = wait_for_task(api, response.json()["task_id"])
+
+    assert status["status"] == "completed"
+    assert status["total_rows"] == 0
+    assert mongo_stub.received_requests == 0
@@ -0,0 +1,108 @@
+"""
+Tests de los motores Excel: stream (XlsxStreamReader) y pandas
+"""
+import datetime
+import io
+import openpyxl
+import pytest
+from app.dto.schemas import ColumnSpec
+from app.services.file_processor import FileProcessor
+from app.services.xlsx_reader import XlsxFormatError, XlsxStreamReader
+from app.utils.constants import ExcelEngines
+from tests.helpers import collect
+
+pytestmark = pytest.mark.anyio
+
+ENGINES = [ExcelEngines.STREAM, ExcelEngines.PANDAS]
+
+
+def to_xlsx(rows) -> bytes:
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for r, row in enumerate(rows, start=1):
+        for c, value in enumerate(row, start=1):
+            if value is not None:
+                sheet.cell(row=r, column=c, value=value)
+    sink = io.BytesIO()
+    workbook.save(sink)
+    return sink.getvalue()
+
+
+async def parse(engine: str, rows, column_spec=None):
+    processor = FileProcessor()
+    processor.batch_size = 2
+    batches = await collect(processor.process_excel(to_xlsx(rows), "f.xlsx", column_spec, engine=engine))
+    return [doc for batch in batches for doc in batch]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+async def test_engines_read_values_and_name_empty_headers(engine):
+    documents = await parse(engine, [["_id", None, "b"], ["1", "x", "y."], ["2", "p", "q"]])
+
+    assert documents == [
+        {"_id": "1", "Unnamed: 1": "x", "b": "y"},
+        {"_id": "2", "Unnamed: 1": "p", "b": "q"},
+    ]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+async def test_duplicate_headers_keep_the_last_column(engine):
+    documents = await parse(engine, [["id", "a", "a"], ["1", "x", "y"]])
+
+    assert documents == [{"_id": "1", "id": "1", "a": "y"}]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+async def test_projection_and_id_column(engine):
+    spec = ColumnSpec(include=["a"], rename={"a": "alias"}, id_column="b")
+
+    documents = await parse(engine, [["_id", "a", "b"], ["1", "x", "k1"], ["2", "p", "k2"]], spec)
+
+    assert documents == [{"_id": "k1", "alias": "x"}, {"_id": "k2", "alias": "p"}]
+
+
+async def test_blank_rows_and_rows_with_values_only_right_of_the_headers_are_skipped():
+    rows = [["_id", "a"], ["1", "x", "extra"], [None, None], [None, None, "z"], ["2", "y"]]
+
+    documents = await parse(ExcelEngines.STREAM, rows)
+
+    assert documents == [{"_id": "1", "a": "x"}, {"_id": "2", "a": "y"}]
+
+
+async def test_stream_reader_converts_cell_types():
+    rows = [
+        ["_id", "n", "f", "ok", "d"],
+        ["1", 10, 1.5, True, datetime.datetime(2024, 1, 31, 10, 30)],
+        ["2", None, 2.0, False, None],
+    ]
+
+    documents = await parse(ExcelEngines.STREAM, rows)
+
+    assert documents == [
+        {"_id": "1", "n": "10", "f": "1.5", "ok": "True", "d": "2024-01-31 10:30:00"},
+        {"_id": "2", "n": "", "f": "2", "ok": "False", "d": ""},
+    ]
+
+
+def test_stream_reader_rows_and_gaps():
+    reader = XlsxStreamReader(to_xlsx([["a", None, "c"], [None, "b"], [], ["x" * 3]]))
+
+    assert list(reader.iter_rows()) == [["a", None, "c"], [None, "b"], ["xxx"]]
+
+
+def test_invalid_xlsx_is_rejected_by_the_stream_reader():
+    with pytest.raises(XlsxFormatError):
+        XlsxStreamReader(b"not a zip")
+
+
+async def test_pandas_engine_reads_the_workbook_once_and_keeps_its_numeric_columns(monkeypatch):
+    import pandas as pd
+
+    calls = []
+    read_excel = pd.read_excel
+    monkeypatch.setattr(pd, "read_excel", lambda *args, **kwargs: calls.append(kwargs) or read_excel(*args, **kwargs))
+
+    documents = await parse(ExcelEngines.PANDAS, [["_id", "n", "a", "a"], ["k1", 10, "x", "y"], ["k2", None, "p", "q"]])
+
+    assert len(calls) == 1
+    assert documents == [{"_id": "k1", "n": "10.0", "a": "y"}, {"_id": "k2", "n": "", "a": "q"}]
@@ -0,0 +1,44 @@
+"""
+Tests del arranque: las dependencias pesadas se importan solo al usarse
+"""
+import subprocess
+import sys
+from benchmarks.startup_benchmark import HEAVY_MODULES, PROJECT_DIR, measure_import
+
+
+def test_importing_the_app_does_not_load_heavy_modules():
+    result = measure_import()
+
+    assert result["loaded"] == []
+    assert result["seconds"] > 0
+
+
+def test_pandas_engine_imports_pandas_on_first_use():
+    script = (
+        "import asyncio, sys\n"
+        "from app.services.file_processor import file_processor\n"
+        "assert 'pandas' not in sys.modules\n"
+        "async def main():\n"
+        "    return [b async for b in file_processor.process_csv(b'_id,a\\n1,x\\n', 'f.csv', engine='pandas-c')]\n"
+        "print(asyncio.run(main()))\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+
+    assert output[-2:] == ["[[{'_id': '1', 'a': 'x'}]]", "True"]
+
+
+def test_mongo_service_defers_motor_until_connect():
+    script = (
+        "import sys\n"
+        "from app.services.mongo_service import MongoService\n"
+        "MongoService()\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+
+    assert output[-1] == "[]"
@@ -0,0 +1,138 @@
+"""
+Tests de los modos de carga: insert, upsert y replace
+"""
+from types import SimpleNamespace
+import pytest
+from app.mapper.data_mapper import DataMapper
+from app.utils.constants import LoadModes
+from tests.helpers import wait_for_task
+
+CONTENT = b"_id,a\n1,x\n2,y\n3,z\n"
+
+
+def upload(api, content=CONTENT, **data):
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1", **data},
+        files={"file": ("data.csv", content, "text/csv")}
+    )
+    assert response.status_code == 200, response.text
+    task_id = response.json()["task_id"]
+    return task_id, wait_for_task(api, task_id)
+
+
+def test_insert_payload_has_no_load_fields():
+    request = DataMapper.map_to_bulk_import_request("c1", "b1", [{"_id": "1"}])
+
+    assert request == {"clientId": "c1", "businessName": "b1", "data": [{"_id": "1"}]}
+
+
+def test_upsert_and_replace_payloads_carry_the_mode():
+    upsert = DataMapper.map_to_bulk_import_request("c1", "b1", [], load_mode=LoadModes.UPSERT)
+    replace = DataMapper.map_to_bulk_import_request("c1", "b1", [], load_mode=LoadModes.REPLACE, load_id="t1")
+
+    assert upsert["loadMode"] == "upsert" and "loadId" not in upsert
+    assert (replace["loadMode"], replace["loadId"]) == ("replace", "t1")
+
+
+def test_insert_upload_sends_the_plain_payload(api, mongo_stub):
+    _, status = upload(api)
+
+    assert status["status"] == "completed"
+    assert all("loadMode" not in payload for payload in mongo_stub.payloads)
+    assert mongo_stub.commits == []
+
+
+def test_upsert_reupload_is_idempotent(api, mongo_stub):
+    upload(api, load_mode="upsert")
+    _, status = upload(api, b"_id,a\n2,y2\n4,w\n", load_mode="upsert")
+
+    assert status["status"] == "completed"
+    assert status["load_mode"] == "upsert"
+    assert mongo_stub.collections[("c1", "b1")] == {
+        "1": {"_id": "1", "a": "x"},
+        "2": {"_id": "2", "a": "y2"},
+        "3": {"_id": "3", "a": "z"},
+        "4": {"_id": "4", "a": "w"},
+    }
+
+
+def test_replace_swaps_the_collection_only_on_commit(api, mongo_stub):
+    upload(api)
+
+    task_id, status = upload(api, b"_id,a\n9,n\n", load_mode="replace")
+
+    assert status["status"] == "completed"
+    assert mongo_stub.commits == [task_id]
+    assert mongo_stub.collections[("c1", "b1")] == {"9": {"_id": "9", "a": "n"}}
+    assert mongo_stub.staging == {}
+
+
+def test_failed_replace_aborts_and_keeps_the_collection(api, mongo_stub, monkeypatch):
+    from app.client import mongo_client as mongo_client_module
+    from app.client.mongo_client import mongo_client
+    from app.services.circuit_breaker import CircuitBreaker
+
+    upload(api)
+    monkeypatch.setattr(mongo_client_module, "mongo_breaker", CircuitBreaker("ig-db-mongo"))
+    monkeypatch.setattr(mongo_client.settings, "BULK_IMPORT_MAX_RETRIES", 0)
+    mongo_stub.error_rate = 1.0
+
+    task_id, status = upload(api, b"_id,a\n9,n\n", load_mode="replace")
+
+    assert status["status"] == "failed"
+    assert mongo_stub.aborts == [task_id]
+    assert mongo_stub.commits == []
+    assert set(mongo_stub.collections[("c1", "b1")]) == {"1", "2", "3"}
+
+
+def test_unknown_load_mode_is_rejected(api):
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1", "load_mode": "merge"},
+        files={"file": ("data.csv", CONTENT, "text/csv")}
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_mongo_service_writes_by_mode():
+    from app.services.mongo_service import MongoService
+
+    pymongo = pytest.importorskip("pymongo")
+    calls = []
+
+    class FakeCollection:
+        def __init__(self, name):
+            self.name = name
+
+        async def bulk_write(self, operations, ordered):
+            calls.append((self.name, [type(op) for op in operations]))
+            return SimpleNamespace(inserted_count=0, upserted_count=1, matched_count=1)
+
+        async def rename(self, target, dropTarget):
+            calls.append(("rename", self.name, target, dropTarget))
+
+    class FakeDb(dict):
+        def __missing__(self, name):
+            return FakeCollection(name)
+
+        async def drop_collection(self, name):
+            calls.append(("drop", name))
+
+    service = MongoService()
+    service.db = FakeDb()
+    docs = [{"_id": "1"}, {"_id": "2"}]
+
+    await service.bulk_insert_documents("c", docs)
+    assert await service.bulk_insert_documents("c__staging_t1", docs, LoadModes.REPLACE) == 2
+    await service.swap_staging_collection("c", "t1")
+    await service.drop_staging_collection("c", "t2")
+
+    assert calls == [
+        ("c", [pymongo.InsertOne, pymongo.InsertOne]),
+        ("c__staging_t1", [pymongo.ReplaceOne, pymongo.ReplaceOne]),
+        ("rename", "c__staging_t1", "c", True),
+        ("drop", "c__staging_t2"),
+    ]
@@ -0,0 +1,101 @@
+"""
+Tests del índice local de búsquedas por _id
+"""
+import json
+import pytest
+from app.services.cache_service import response_cache
+from app.services.local_index import INDEX_FILE, LocalIndex, local_index
+
+
+@pytest.fixture
+def index(tmp_path):
+    service = LocalIndex()
+    service.enabled = True
+    service.base_dir = tmp_path
+    return service
+
+
+def publish(index, documents, task_id="t1", replace_existing=False, batch_size=2):
+    writer = index.open_writer("c1", "b1", task_id)
+    for start in range(0, len(documents), batch_size):
+        writer.add_batch(documents[start:start + batch_size])
+    return writer.commit(replace_existing=replace_existing)
+
+
+def test_lookup_finds_every_document(index):
+    documents = [{"_id": str(i), "v": i} for i in range(200)]
+    segment = publish(index, documents)
+
+    assert (segment / INDEX_FILE).stat().st_size == 200 * 16
+    assert all(index.lookup("c1", "b1", str(i)) == {"_id": str(i), "v": i} for i in range(200))
+    assert index.lookup("c1", "b1", "missing") is None
+    assert index.lookup("c1", "other", "1") is None
+
+
+def test_first_row_wins_for_repeated_ids(index):
+    publish(index, [{"_id": "1", "v": "first"}, {"_id": "2", "v": "x"}, {"_id": "1", "v": "second"}])
+
+    assert index.lookup("c1", "b1", "1")["v"] == "first"
+
+
+def test_newest_segment_wins_and_old_segments_are_pruned(index, monkeypatch):
+    monkeypatch.setattr(index.settings, "LOCAL_INDEX_MAX_SEGMENTS", 2)
+
+    for load in range(3):
+        publish(index, [{"_id": "1", "v": load}, {"_id": f"only{load}", "v": load}], task_id=f"t{load}")
+
+    assert index.lookup("c1", "b1", "1")["v"] == 2
+    assert index.lookup("c1", "b1", "only1") is not None
+    assert index.lookup("c1", "b1", "only0") is None
+
+
+def test_replace_drops_previous_segments(index):
+    publish(index, [{"_id": "old"}], task_id="t1")
+    publish(index, [{"_id": "new"}], task_id="t2", replace_existing=True)
+
+    assert index.lookup("c1", "b1", "old") is None
+    assert index.lookup("c1", "b1", "new") == {"_id": "new"}
+
+
+def test_empty_or_aborted_loads_publish_nothing(index, tmp_path):
+    assert publish(index, []) is None
+
+    writer = index.open_writer("c1", "b1", "t2")
+    writer.add_batch([{"_id": "1"}])
+    writer.abort()
+
+    assert index.lookup("c1", "b1", "1") is None
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_disabled_index_does_nothing(index):
+    index.enabled = False
+
+    assert index.open_writer("c1", "b1", "t1") is None
+    assert index.lookup("c1", "b1", "1") is None
+
+
+@pytest.fixture
+def enabled_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(local_index, "enabled", True)
+    monkeypatch.setattr(local_index, "base_dir", tmp_path)
+    return local_index
+
+
+def test_search_response_is_the_same_with_warm_or_cold_index(api, mongo_stub, enabled_index):
+    response_cache.invalidate_prefix(("search",))
+    api.post("/bulk-load-data/stream", params={"client_id": "c1", "business_name": "b1"},
+             content=b'{"_id": "1", "v": "a"}\n{"_id": "2", "v": "b"}\n')
+
+    warm = api.get("/bulk-load-data/c1/b1/search/1").json()
+    warm_bulk = api.post("/bulk-load-data/c1/b1/search", json={"ids": ["1", "2"]}).text
+    assert mongo_stub.search_requests == 0
+
+    enabled_index.enabled = False
+    cold = api.get("/bulk-load-data/c1/b1/search/1").json()
+    cold_bulk = api.post("/bulk-load-data/c1/b1/search", json={"ids": ["1", "2"]}).text
+    assert mongo_stub.search_requests == 2
+
+    assert warm == cold == {"clientId": "c1", "businessName": "b1", "data": {"_id": "1", "v": "a"}}
+    by_id = lambda text: {line["id"]: line for line in map(json.loads, text.splitlines())}
+    assert by_id(warm_bulk) == by_id(cold_bulk)
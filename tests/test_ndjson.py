@@ -0,0 +1,102 @@
+"""
+Tests de NDJSON: parseo en bloques y endpoint /stream
+"""
+import json
+import pytest
+from app.dto.schemas import ColumnSpec
+from app.services.file_processor import FileProcessor
+from tests.helpers import aiter_chunks, collect
+
+ROWS = [
+    {"code": "A1.", "name": " Ana ", "tags": ["x", "y."], "meta": {"n": 1}},
+    {"code": "B2", "name": None, "tags": [], "meta": None},
+    {"code": "C3", "name": "Luis", "age": 30},
+]
+CONTENT = ("\n".join(json.dumps(row) for row in ROWS) + "\n").encode()
+
+EXPECTED = [
+    {"_id": "A1", "code": "A1", "name": "Ana", "tags": ["x", "y."], "meta": {"n": 1}},
+    {"_id": "B2", "code": "B2", "name": "", "tags": [], "meta": ""},
+    {"_id": "C3", "code": "C3", "name": "Luis", "age": "30"},
+]
+
+
+@pytest.fixture
+def processor():
+    processor = FileProcessor()
+    processor.batch_size = 2
+    return processor
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, len(CONTENT)])
+async def test_chunk_boundaries_do_not_change_documents(processor, chunk_size):
+    batches = await collect(processor.process_ndjson_stream(aiter_chunks(CONTENT, chunk_size), "s.ndjson"))
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert [doc for batch in batches for doc in batch] == EXPECTED
+
+
+@pytest.mark.anyio
+async def test_blank_lines_and_missing_trailing_newline(processor):
+    content = b'\n{"k": "1"}\n   \n\n{"k": "2"}'
+
+    batches = await collect(processor.process_ndjson(content, "s.jsonl"))
+
+    assert [doc for batch in batches for doc in batch] == [{"_id": "1", "k": "1"}, {"_id": "2", "k": "2"}]
+
+
+@pytest.mark.anyio
+async def test_explicit_id_is_kept(processor):
+    content = b'{"name": "a", "_id": "x1"}\n{"name": "b", "_id": "x2"}\n'
+
+    batches = await collect(processor.process_ndjson(content, "s.ndjson"))
+
+    assert [doc["_id"] for doc in batches[0]] == ["x1", "x2"]
+
+
+@pytest.mark.anyio
+async def test_id_column_overrides_document_id(processor):
+    content = b'{"_id": "x1", "code": "c1", "name": "a"}\n'
+    spec = ColumnSpec(id_column="code", exclude=["name"])
+
+    batches = await collect(processor.process_ndjson(content, "s.ndjson", spec))
+
+    assert batches == [[{"_id": "c1", "code": "c1"}]]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("bad_line", [b"{not json", b"[1, 2]"])
+async def test_invalid_line_reports_line_number(processor, bad_line):
+    content = b'{"k": "1"}\n' + bad_line + b"\n"
+
+    with pytest.raises(ValueError, match="Línea 2"):
+        await collect(processor.process_ndjson(content, "s.ndjson"))
+
+
+def test_stream_endpoint_ingests_body_while_receiving(api, mongo_stub):
+    def body():
+        yield from (CONTENT[i:i + 10] for i in range(0, len(CONTENT), 10))
+
+    response = api.post(
+        "/bulk-load-data/stream",
+        params={"client_id": "c1", "business_name": "b1"},
+        content=body()
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["status"] == "completed"
+    assert result["total_rows"] == 3
+    assert mongo_stub.documents == EXPECTED
+
+
+def test_stream_endpoint_reports_invalid_body(api):
+    response = api.post(
+        "/bulk-load-data/stream",
+        params={"client_id": "c1", "business_name": "b1"},
+        content=b'{"k": "1"}\nnope\n'
+    )
+
+    assert response.json()["status"] == "failed"
+    assert "Línea 2" in response.json()["error_detail"]
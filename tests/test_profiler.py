@@ -0,0 +1,96 @@
+"""
+Tests del profiling por tarea
+"""
+import asyncio
+import pstats
+import pytest
+from app.services.profiler_service import ProfilerService
+from tests.helpers import wait_for_task
+
+
+def busy_work():
+    return sum(i * i for i in range(20000))
+
+
+async def profiled_task(delay: float = 0):
+    busy_work()
+    await asyncio.sleep(delay)
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    service = ProfilerService()
+    service.profiles_dir = tmp_path
+    return service
+
+
+@pytest.mark.anyio
+async def test_profile_task_saves_pstats(profiler):
+    await profiler.profile_task("t1", profiled_task)
+
+    path = profiler.get_profile("t1")
+    assert path is not None
+    assert any(func[2] == "busy_work" for func in pstats.Stats(str(path)).stats)
+    assert "busy_work" in profiler.render_text("t1", sort_by="tottime", limit=20)
+
+
+@pytest.mark.anyio
+async def test_only_one_task_is_profiled_at_a_time(profiler):
+    await asyncio.gather(
+        profiler.profile_task("first", profiled_task, 0.05),
+        profiler.profile_task("second", profiled_task)
+    )
+
+    assert profiler.get_profile("first") is not None
+    assert profiler.get_profile("second") is None
+    assert profiler._active_task_id is None
+
+
+@pytest.mark.anyio
+async def test_profile_is_saved_when_the_task_fails(profiler):
+    async def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await profiler.profile_task("t1", failing)
+
+    assert profiler.get_profile("t1") is not None
+
+
+def test_missing_profile_renders_nothing(profiler):
+    assert profiler.get_profile("nope") is None
+    assert profiler.render_text("nope") is None
+
+
+def test_profile_endpoint_serves_profiled_upload(api):
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1", "profile": "true"},
+        files={"file": ("data.csv", b"_id,a\n1,x\n2,y\n", "text/csv")}
+    )
+    task_id = response.json()["task_id"]
+    assert response.json()["profile_url"] == f"/bulk-load-data/profile/{task_id}"
+    wait_for_task(api, task_id)
+
+    text = api.get(f"/bulk-load-data/profile/{task_id}", params={"format": "text", "limit": 5})
+    assert text.status_code == 200
+    assert "function calls" in text.text
+
+    binary = api.get(f"/bulk-load-data/profile/{task_id}")
+    assert binary.headers["content-type"] == "application/octet-stream"
+
+    assert api.get(f"/bulk-load-data/profile/{task_id}", params={"format": "text", "sort_by": "nope"}).status_code == 400
+    assert api.get(f"/bulk-load-data/profile/{task_id}", params={"format": "svg"}).status_code == 400
+
+
+def test_profile_endpoint_404_without_profile(api):
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1"},
+        files={"file": ("data.csv", b"_id,a\n1,x\n", "text/csv")}
+    )
+    task_id = response.json()["task_id"]
+    wait_for_task(api, task_id)
+
+    assert api.get(f"/bulk-load-data/profile/{task_id}").status_code == 404
+    assert api.get("/bulk-load-data/profile/unknown").status_code == 404
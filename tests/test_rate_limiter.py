@@ -0,0 +1,145 @@
+"""
+Tests del rate limit de envíos a ig-db-mongo (token buckets)
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.config.settings import get_settings
+from app.services import rate_limiter as rate_limiter_module
+from app.services.rate_limiter import MB, RateLimiter, TokenBucket, rate_limiter
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj falso: sleep avanza el tiempo en vez de esperar"""
+    now = [1000.0]
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter_module, "asyncio", SimpleNamespace(sleep=sleep))
+    return SimpleNamespace(now=now, sleeps=sleeps)
+
+
+def limiter(monkeypatch, **limits) -> RateLimiter:
+    settings = get_settings()
+    for name in ("CLIENT_ROWS_PER_SECOND", "CLIENT_MB_PER_SECOND", "GLOBAL_ROWS_PER_SECOND", "GLOBAL_MB_PER_SECOND"):
+        monkeypatch.setattr(settings, f"RATE_LIMIT_{name}", limits.get(name.lower(), 0))
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST_SECONDS", 1.0)
+    return RateLimiter()
+
+
+async def test_bucket_allows_a_burst_then_paces(clock):
+    bucket = TokenBucket(rate=100, capacity=100)
+
+    assert bucket.reserve(100) == 0
+    assert bucket.reserve(50) == pytest.approx(0.5)
+    assert bucket.reserve(50) == pytest.approx(1.0)
+
+    clock.now[0] += 10
+    assert bucket.reserve(100) == 0
+    assert bucket.tokens == 0
+
+
+async def test_request_larger_than_capacity_is_not_starved(clock):
+    bucket = TokenBucket(rate=10, capacity=10)
+
+    assert bucket.reserve(30) == pytest.approx(2.0)
+
+
+async def test_disabled_limiter_never_waits(clock, monkeypatch):
+    service = limiter(monkeypatch)
+
+    assert not service.enabled
+    assert await service.acquire("c1", rows=10 ** 6, nbytes=10 ** 9) == 0
+    assert clock.sleeps == []
+
+
+async def test_clients_are_limited_independently(clock, monkeypatch):
+    service = limiter(monkeypatch, client_rows_per_second=100)
+
+    assert await service.acquire("c1", rows=100, nbytes=0) == 0
+    assert await service.acquire("c1", rows=100, nbytes=0) == pytest.approx(1.0)
+    assert await service.acquire("c2", rows=100, nbytes=0) == 0
+
+    assert service.stats()["throttled_seconds"] == {"c1": 1.0}
+
+
+async def test_global_limit_is_shared_by_all_clients(clock, monkeypatch):
+    service = limiter(monkeypatch, global_rows_per_second=100)
+
+    await service.acquire("c1", rows=100, nbytes=0)
+
+    assert await service.acquire("c2", rows=50, nbytes=0) == pytest.approx(0.5)
+
+
+async def test_slowest_bucket_sets_the_wait(clock, monkeypatch):
+    service = limiter(monkeypatch, client_rows_per_second=1000, client_mb_per_second=1)
+
+    await service.acquire("c1", rows=10, nbytes=MB)
+
+    assert await service.acquire("c1", rows=10, nbytes=2 * MB) == pytest.approx(2.0)
+    assert clock.sleeps == [pytest.approx(2.0)]
+
+
+async def test_throttled_client_does_not_put_the_global_bucket_in_debt(monkeypatch):
+    now = [1000.0]
+
+    async def sleep(seconds):
+        # No avanza el reloj: solo cede el turno, para intercalar a c2 mientras c1 espera
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter_module, "asyncio", SimpleNamespace(sleep=sleep))
+    service = limiter(monkeypatch, client_rows_per_second=100, global_rows_per_second=100)
+    await service.acquire("c1", rows=50, nbytes=0)
+
+    waiting = asyncio.create_task(service.acquire("c1", rows=100, nbytes=0))
+    await asyncio.sleep(0)
+
+    assert await service.acquire("c2", rows=50, nbytes=0) == 0
+    assert await waiting == pytest.approx(0.5 + 1.0)
+
+
+async def test_idle_clients_are_pruned(clock, monkeypatch):
+    service = limiter(monkeypatch, client_rows_per_second=100)
+    await service.acquire("c1", rows=150, nbytes=0)
+    await service.acquire("c2", rows=10, nbytes=0)
+
+    clock.now[0] += rate_limiter_module.PRUNE_INTERVAL_SECONDS
+    await service.acquire("c3", rows=10, nbytes=0)
+
+    assert set(service.client_buckets) == {"c3"}
+    assert service.stats()["throttled_seconds"] == {"c1": 0.5}
+
+
+async def test_throttled_seconds_keep_the_clients_that_waited_most(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter_module, "MAX_THROTTLED_CLIENTS", 2)
+    service = limiter(monkeypatch, client_rows_per_second=10)
+
+    for client_id, rows in (("c1", 30), ("c2", 20), ("c3", 40)):
+        await service.acquire(client_id, rows=rows, nbytes=0)
+
+    assert service.throttled_seconds == {"c1": 2.0, "c3": 3.0}
+
+
+async def test_bulk_import_is_rate_limited_by_rows_and_payload_bytes(mongo_stub, monkeypatch):
+    from app.client.mongo_client import mongo_client
+
+    calls = []
+
+    async def acquire(client_id, rows, nbytes):
+        calls.append((client_id, rows, nbytes))
+        return 0.0
+
+    monkeypatch.setattr(rate_limiter, "acquire", acquire)
+    transfer = {}
+
+    assert await mongo_client.bulk_import("c1", "b1", [{"_id": "1"}, {"_id": "2"}], transfer=transfer)
+
+    assert calls == [("c1", 2, transfer["bytes_sent"])]
@@ -0,0 +1,131 @@
+"""
+Tests del apagado ordenado: drenaje, checkpoints y reanudación
+"""
+import asyncio
+import json
+import pytest
+from app.services.admission_control import admission_controller
+from app.services.file_processor import file_processor
+from app.services.task_processor import TaskProcessor
+
+pytestmark = pytest.mark.anyio
+
+ROWS = 20
+CONTENT = b"_id,a\n" + b"".join(f"{i},x\n".encode() for i in range(ROWS))
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch, mongo_stub):
+    service = TaskProcessor()
+    monkeypatch.setattr(service.settings, "CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setattr(service.settings, "SHUTDOWN_DRAIN_SECONDS", 0.01)
+    monkeypatch.setattr(service.settings, "SHUTDOWN_CHECKPOINT_GRACE_SECONDS", 5)
+    monkeypatch.setattr(file_processor, "batch_size", 1)
+    monkeypatch.setattr(admission_controller, "draining", False)
+    mongo_stub.latency_ms = 20
+    return service
+
+
+async def start_upload(processor) -> str:
+    task_id = await processor.create_task("c1", "b1", "data.csv")
+    processor.submit(processor.process_file_async, task_id, CONTENT, "data.csv", "c1", "b1")
+    await asyncio.sleep(0.15)
+    return task_id
+
+
+async def test_tasks_finishing_within_the_drain_window_complete(processor, monkeypatch, tmp_path):
+    monkeypatch.setattr(processor.settings, "SHUTDOWN_DRAIN_SECONDS", 10)
+    task_id = await start_upload(processor)
+
+    await processor.shutdown()
+
+    assert (await processor.get_task_status(task_id))["status"] == "completed"
+    assert list(tmp_path.iterdir()) == []
+    assert admission_controller.draining is True
+    assert processor.accepting is False
+
+
+async def test_interrupted_task_checkpoints_and_resumes(processor, tmp_path, mongo_stub):
+    task_id = await start_upload(processor)
+
+    await processor.shutdown()
+
+    status = await processor.get_task_status(task_id)
+    meta = json.loads((tmp_path / f"{task_id}.json").read_text())
+    assert status["status"] == "interrupted"
+    assert status["resumable"] is True
+    assert 0 < meta["skip_rows"] < ROWS
+    assert meta["skip_rows"] == mongo_stub.received_documents
+    assert (tmp_path / f"{task_id}.bin").read_bytes() == CONTENT
+
+    restarted = TaskProcessor()
+    restarted.task_store = processor.task_store
+    assert restarted.resume_checkpoints() == 1
+    await asyncio.gather(*restarted._submitted)
+
+    assert (await restarted.get_task_status(task_id))["status"] == "completed"
+    assert [doc["_id"] for doc in mongo_stub.documents] == [str(i) for i in range(ROWS)]
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_batch_in_flight_is_cancelled_after_the_grace_period(processor, monkeypatch, tmp_path, mongo_stub):
+    monkeypatch.setattr(processor.settings, "SHUTDOWN_CHECKPOINT_GRACE_SECONDS", 0)
+    mongo_stub.latency_ms = 200
+    task_id = await start_upload(processor)
+
+    await processor.shutdown()
+
+    meta = json.loads((tmp_path / f"{task_id}.json").read_text())
+    assert (await processor.get_task_status(task_id))["status"] == "interrupted"
+    assert meta["skip_rows"] <= mongo_stub.received_documents
+    assert not processor._running
+
+
+async def test_streams_are_interrupted_without_checkpoint(processor, tmp_path):
+    async def body():
+        for i in range(ROWS):
+            yield json.dumps({"_id": str(i)}).encode() + b"\n"
+
+    task_id = await processor.create_task("c1", "b1", "stream.ndjson")
+    processor.submit(processor.process_stream_async, task_id, body(), "stream.ndjson", "c1", "b1")
+    await asyncio.sleep(0.15)
+
+    await processor.shutdown()
+
+    status = await processor.get_task_status(task_id)
+    assert status["status"] == "interrupted"
+    assert status["resumable"] is False
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_uploads_are_rejected_while_draining(api, monkeypatch):
+    monkeypatch.setattr(admission_controller, "draining", True)
+
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1"},
+        files={"file": ("data.csv", b"_id,a\n1,x\n", "text/csv")}
+    )
+
+    assert response.status_code == 503
+    assert api.get("/bulk-load-data/health").json()["status"] == "draining"
+
+
+async def test_shutdown_waits_for_the_history_write(processor, monkeypatch):
+    import time
+    from app.services import task_processor as task_processor_module
+
+    recorded = []
+
+    def slow_record(task_id, status):
+        time.sleep(0.2)
+        recorded.append((task_id, status["status"]))
+
+    monkeypatch.setattr(task_processor_module.task_history, "record", slow_record)
+    monkeypatch.setattr(processor.settings, "SHUTDOWN_DRAIN_SECONDS", 10)
+    task_id = await start_upload(processor)
+
+    await processor.shutdown()
+
+    assert recorded == [(task_id, "completed")]
+    assert processor._finishing == {}
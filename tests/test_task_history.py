@@ -0,0 +1,129 @@
+"""
+Tests del historial de tareas terminadas y del endpoint /stats
+"""
+from types import SimpleNamespace
+import pytest
+from app.api import routes
+from app.services import task_history as task_history_module
+from app.services import task_processor as task_processor_module
+from app.services.task_history import TaskHistory
+from tests.helpers import wait_for_task
+
+HOUR = 3600.0
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    service = TaskHistory()
+    monkeypatch.setattr(service.settings, "TASK_HISTORY_DB_PATH", str(tmp_path / "history.db"))
+    service.enabled = True
+    return service
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100 * HOUR]
+    monkeypatch.setattr(task_history_module, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def finished(status="completed", client_id="c1", rows=100, rows_per_second=50.0, **extra):
+    return {
+        "status": status,
+        "client_id": client_id,
+        "business_name": "b1",
+        "total_rows": rows,
+        "rows_per_second": rows_per_second,
+        "processing_time_seconds": 2.0,
+        "stage_timings": {"parse_seconds": 0.5, "ship_seconds": 1.5},
+        "batch_latency_ms": {"p50": 10.0, "p99": 30.0},
+        "file_bytes": 1000,
+        "bytes_sent": 1200,
+        "retries": 1,
+        **extra
+    }
+
+
+def test_stats_aggregate_per_client(history, clock):
+    history.record("t1", finished(rows_per_second=10.0))
+    history.record("t2", finished(rows_per_second=30.0))
+    history.record("t3", finished(status="failed", rows=0, rows_per_second=None))
+    history.record("t4", finished(client_id="c2"))
+
+    groups = history.stats(0, clock[0] + 1)
+
+    assert [group["client_id"] for group in groups] == ["c1", "c2"]
+    c1 = groups[0]
+    assert c1["tasks"] == 3
+    assert c1["by_status"] == {"completed": 2, "completed_with_errors": 0, "failed": 1}
+    assert (c1["total_rows"], c1["bytes_sent"], c1["retries"]) == (200, 3600, 3)
+    assert c1["percentiles"]["rows_per_second"] == {"p50": 10.0, "p95": 30.0, "p99": 30.0}
+    assert history.stats(0, clock[0] + 1, client_id="c2")[0]["tasks"] == 1
+
+
+def test_interrupted_and_running_tasks_are_not_recorded(history, clock):
+    history.record("t1", finished(status="interrupted"))
+    history.record("t2", {"status": "processing"})
+
+    assert history.stats(0, clock[0] + 1) == []
+
+
+def test_buckets_are_aligned_and_clipped_to_the_window(history, clock):
+    history.record("t1", finished())
+    clock[0] += 1.5 * HOUR
+    history.record("t2", finished())
+
+    groups = history.stats(99.5 * HOUR, 102 * HOUR, bucket_seconds=HOUR)
+    assert [group["tasks"] for group in groups] == [1, 1]
+    assert [group["window_start"][11:16] for group in groups] == ["04:00", "05:00"]
+
+    groups = history.stats(101.25 * HOUR, 102 * HOUR, bucket_seconds=HOUR)
+    assert [(group["window_start"][11:16], group["window_end"][11:16]) for group in groups] == [("05:15", "06:00")]
+
+
+def test_old_rows_are_pruned(history, clock, monkeypatch):
+    monkeypatch.setattr(history.settings, "TASK_HISTORY_RETENTION_DAYS", 1)
+    history.record("old", finished())
+    clock[0] += 2 * 86400
+    history._last_prune = 0.0
+
+    history.record("new", finished())
+
+    assert history.stats(0, clock[0] + 1)[0]["tasks"] == 1
+
+
+def test_disabled_history_records_nothing(history, clock):
+    history.enabled = False
+    history.record("t1", finished())
+
+    history.enabled = True
+    assert history.stats(0, clock[0] + 1) == []
+
+
+def test_stats_endpoint_reports_finished_uploads(api, history, monkeypatch):
+    monkeypatch.setattr(routes, "task_history", history)
+    monkeypatch.setattr(task_processor_module, "task_history", history)
+
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c9", "business_name": "b1"},
+        files={"file": ("data.csv", b"_id,a\n1,x\n2,y\n", "text/csv")}
+    )
+    wait_for_task(api, response.json()["task_id"])
+
+    stats = api.get("/bulk-load-data/stats", params={"client_id": "c9"}).json()
+
+    assert stats["groups"][0]["tasks"] == 1
+    assert stats["groups"][0]["total_rows"] == 2
+    assert stats["groups"][0]["bytes_sent"] > 0
+
+
+def test_stats_endpoint_validates_the_window(api, history, monkeypatch):
+    monkeypatch.setattr(routes, "task_history", history)
+
+    response = api.get("/bulk-load-data/stats", params={"since": "2024-01-02T00:00:00", "until": "2024-01-01T00:00:00"})
+
+    assert response.status_code == 400
+
+    history.enabled = False
+    assert api.get("/bulk-load-data/stats").status_code == 404
@@ -0,0 +1,144 @@
+"""
+Tests de la cola de tareas compartida (modo queue) y del reclamo por worker
+"""
+import json
+import time
+from pathlib import Path
+import pytest
+from app.services.file_processor import file_processor
+from app.services.task_processor import TaskProcessor
+from app.services.task_queue import SqliteTaskQueue
+from app.services.task_store import SqliteTaskStore
+
+LEASE_SECONDS = 0.05
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SqliteTaskQueue(str(tmp_path / "queue.db"), lease_seconds=LEASE_SECONDS, max_attempts=2)
+
+
+def expire_lease():
+    time.sleep(LEASE_SECONDS + 0.01)
+
+
+def test_claims_in_order_and_only_once(queue):
+    queue.enqueue("t1", {"n": 1})
+    queue.enqueue("t2", {"n": 2})
+
+    assert queue.claim("a") == ("t1", {"n": 1})
+    assert queue.claim("b") == ("t2", {"n": 2})
+    assert queue.claim("c") is None
+    assert queue.depth() == 2
+
+
+def test_heartbeat_keeps_the_lease(queue):
+    queue.enqueue("t1", {})
+    queue.claim("a")
+
+    for _ in range(3):
+        time.sleep(LEASE_SECONDS / 2)
+        assert queue.heartbeat("t1", "a")
+
+    assert queue.claim("b") is None
+
+
+def test_expired_lease_fences_the_previous_worker(queue):
+    queue.enqueue("t1", {})
+    queue.claim("a")
+    expire_lease()
+
+    assert queue.claim("b") == ("t1", {})
+    assert not queue.heartbeat("t1", "a")
+    assert not queue.requeue("t1", "a", {"skip_rows": 5})
+    assert not queue.complete("t1", "a")
+    assert queue.depth() == 1
+
+    assert queue.heartbeat("t1", "b")
+    assert queue.complete("t1", "b")
+    assert queue.depth() == 0
+
+
+def test_requeue_releases_the_task_with_its_checkpoint(queue):
+    queue.enqueue("t1", {"skip_rows": 0})
+    queue.claim("a")
+
+    assert queue.requeue("t1", "a", {"skip_rows": 5})
+    assert queue.claim("b") == ("t1", {"skip_rows": 5})
+    assert not queue.complete("t1", "a")
+
+
+def test_tasks_out_of_attempts_are_reaped(queue):
+    queue.enqueue("t1", {})
+    queue.claim("a")
+    expire_lease()
+    queue.claim("b")
+    expire_lease()
+
+    assert queue.claim("c") is None
+    assert queue.reap_dead() == ["t1"]
+    assert queue.depth() == 0
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    service = TaskProcessor()
+    db_path = str(tmp_path / "queue.db")
+    service.task_store = SqliteTaskStore(db_path)
+    service.task_queue = SqliteTaskQueue(db_path, lease_seconds=LEASE_SECONDS, max_attempts=3)
+    monkeypatch.setattr(service.settings, "QUEUE_LEASE_SECONDS", LEASE_SECONDS)
+    monkeypatch.setattr(file_processor, "batch_size", 1)
+    return service
+
+
+async def enqueue(processor, rows: int) -> str:
+    task_id = await processor.create_task("c1", "b1", "data.csv")
+    content = b"_id,a\n" + b"".join(f"{i},x\n".encode() for i in range(rows))
+    await processor.enqueue_file(task_id, content, "data.csv", "c1", "b1")
+    return task_id
+
+
+@pytest.mark.anyio
+async def test_claimed_task_is_processed_and_removed(processor, mongo_stub):
+    task_id = await enqueue(processor, 3)
+    claimed_id, payload = processor.task_queue.claim("w/0")
+
+    await processor._run_claimed_task(claimed_id, payload, "w/0")
+
+    assert claimed_id == task_id
+    assert (await processor.get_task_status(task_id))["status"] == "completed"
+    assert mongo_stub.received_documents == 3
+    assert processor.task_queue.depth() == 0
+    assert not Path(payload["spool_path"]).exists()
+
+
+@pytest.mark.anyio
+async def test_interrupted_task_is_requeued_from_its_checkpoint(processor, mongo_stub):
+    task_id = await enqueue(processor, 3)
+    _, payload = processor.task_queue.claim("w/0")
+    processor._interrupt_requested = True
+
+    await processor._run_claimed_task(task_id, payload, "w/0")
+
+    assert (await processor.get_task_status(task_id))["status"] == "interrupted"
+    assert processor.task_queue.claim("w/1") == (task_id, {**payload, "skip_rows": 1})
+    assert Path(payload["spool_path"]).exists()
+
+
+@pytest.mark.anyio
+async def test_worker_that_lost_its_lease_stops_and_leaves_the_task(processor, mongo_stub):
+    mongo_stub.latency_ms = 20
+    task_id = await enqueue(processor, 20)
+    _, payload = processor.task_queue.claim("a")
+    expire_lease()
+    assert processor.task_queue.claim("b") is not None
+
+    await processor._run_claimed_task(task_id, payload, "a")
+
+    assert mongo_stub.received_documents < 20
+    assert (await processor.get_task_status(task_id))["status"] == "processing"
+    row = processor.task_queue.conn.execute("SELECT worker_id, payload FROM task_queue").fetchone()
+    assert row[0] == "b"
+    assert json.loads(row[1])["skip_rows"] == 0
+    assert Path(payload["spool_path"]).exists()
+    assert not processor._lost_leases
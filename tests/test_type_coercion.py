@@ -0,0 +1,119 @@
+"""
+Tests de la inferencia y conversión de tipos por columna
+"""
+from datetime import datetime
+import pytest
+from app.dto.schemas import CoercionSpec
+from app.services.type_coercion import TypeCoercer
+from app.utils.constants import ColumnTypes
+from tests.helpers import collect, wait_for_task
+
+
+def coerce(rows, infer=True, column_types=None):
+    coercer = TypeCoercer(CoercionSpec(infer=infer, column_types=column_types or {}))
+    return coercer, coercer.coerce_batch([dict(row) for row in rows])
+
+
+def test_infers_numbers_dates_and_bools():
+    coercer, documents = coerce([
+        {"_id": "1", "n": "10", "x": "1.5", "d": "2024-01-31", "b": "TRUE", "s": "abc"},
+        {"_id": "2", "n": "-3", "x": "2", "d": "2024-01-31T10:00:00Z", "b": "false", "s": "1"},
+    ])
+
+    assert coercer.schema == {"n": ColumnTypes.INT, "x": ColumnTypes.FLOAT, "d": ColumnTypes.DATETIME, "b": ColumnTypes.BOOL}
+    assert documents[0] == {"_id": "1", "n": 10, "x": 1.5, "d": datetime(2024, 1, 31), "b": True, "s": "abc"}
+    assert documents[1]["d"] == datetime(2024, 1, 31, 10)
+    assert documents[1]["b"] is False
+
+
+@pytest.mark.parametrize("values", [["si", "no"], ["no", "no"], ["yes", "no"], ["verdadero", "falso"], ["Sí", "true"]])
+def test_spanish_and_yes_no_words_are_not_inferred_as_bool(values):
+    coercer, documents = coerce([{"_id": str(i), "c": value} for i, value in enumerate(values)])
+
+    assert "c" not in coercer.schema
+    assert [document["c"] for document in documents] == values
+
+
+def test_forced_bool_accepts_every_word_form():
+    _, documents = coerce(
+        [{"_id": str(i), "c": value} for i, value in enumerate(["Si", "no", "yes", "FALSO", "", "tal vez"])],
+        infer=False,
+        column_types={"c": "bool"}
+    )
+
+    assert [document["c"] for document in documents] == [True, False, True, False, None, "tal vez"]
+
+
+def test_inferred_bool_column_keeps_other_words_as_strings():
+    coercer = TypeCoercer(CoercionSpec(infer=True))
+    coercer.coerce_batch([{"_id": "1", "c": "true"}, {"_id": "2", "c": "false"}])
+
+    documents = coercer.coerce_batch([{"_id": "3", "c": "si"}, {"_id": "4", "c": "True"}])
+
+    assert [document["c"] for document in documents] == ["si", True]
+    assert coercer.errors == 1
+
+
+def test_codes_with_leading_zeros_and_ids_stay_strings():
+    coercer, documents = coerce([{"_id": "1", "code": "00123"}, {"_id": "2", "code": "00456"}])
+
+    assert coercer.schema == {}
+    assert documents[0] == {"_id": "1", "code": "00123"}
+
+
+def test_invalid_values_fall_back_to_strings_and_are_counted():
+    coercer = TypeCoercer(CoercionSpec(infer=True))
+    coercer.coerce_batch([{"_id": "1", "n": "1"}, {"_id": "2", "n": "2"}])
+
+    documents = coercer.coerce_batch([{"_id": "3", "n": "3"}, {"_id": "4", "n": "n/a"}, {"_id": "5", "n": ""}])
+
+    assert [document["n"] for document in documents] == [3, "n/a", None]
+    assert coercer.errors == 1
+
+
+def test_forced_string_disables_inference_and_forced_id_is_converted():
+    coercer, documents = coerce([{"_id": "7", "n": "1"}], column_types={"n": "string", "_id": "int"})
+
+    assert documents == [{"_id": 7, "n": "1"}]
+
+
+@pytest.mark.anyio
+async def test_coerce_batches_infers_from_the_first_batch():
+    async def batches():
+        yield [{"_id": "1", "n": "1"}]
+        yield [{"_id": "2", "n": "2"}]
+
+    coercer = TypeCoercer(CoercionSpec(infer=True))
+
+    assert await collect(coercer.coerce_batches(batches())) == [[{"_id": "1", "n": 1}], [{"_id": "2", "n": 2}]]
+
+
+def test_upload_reports_types_and_sends_extended_json(api, mongo_stub):
+    response = api.post(
+        "/bulk-load-data/file",
+        data={"client_id": "c1", "business_name": "b1", "coerce_types": "true"},
+        files={"file": ("data.csv", b"_id,n,d,ok\n1,5,2024-01-31,si\n2,6,2024-02-01,no\n", "text/csv")}
+    )
+    status = wait_for_task(api, response.json()["task_id"])
+
+    assert status["column_types"] == {"n": "int", "d": "datetime"}
+    assert mongo_stub.documents[0] == {"_id": "1", "n": 5, "d": {"$date": "2024-01-31T00:00:00.000Z"}, "ok": "si"}
+
+
+def test_out_of_range_floats_stay_strings_and_are_counted():
+    coercer = TypeCoercer(CoercionSpec(infer=False, column_types={"x": "float"}))
+
+    documents = coercer.coerce_batch([{"_id": "1", "x": "1.5"}, {"_id": "2", "x": "1e400"}, {"_id": "3", "x": "-1e400"}])
+
+    assert [document["x"] for document in documents] == [1.5, "1e400", "-1e400"]
+    assert coercer.errors == 2
+
+
+@pytest.mark.anyio
+async def test_bulk_import_refuses_non_finite_floats(mongo_stub):
+    from app.client.mongo_client import mongo_client
+
+    with pytest.raises(ValueError):
+        await mongo_client.bulk_import("c1", "b1", [{"_id": "1", "x": float("inf")}])
+
+    assert mongo_stub.received_requests == 0
@@ -0,0 +1,70 @@
+"""
+Tests del interning de valores repetidos por columna
+"""
+from app.services.file_processor import FileProcessor
+from app.services.value_interner import ColumnInterner
+
+clean = FileProcessor().clean_value
+
+
+def counting_clean():
+    calls = []
+
+    def counted(value):
+        calls.append(value)
+        return clean(value)
+
+    return counted, calls
+
+
+def test_repeated_values_share_one_object_and_are_cleaned_once():
+    counted, calls = counting_clean()
+    interner = ColumnInterner(2, counted, max_values=10)
+
+    rows = [interner.clean_values([f"{state}.", f"id-{i}"]) for i, state in enumerate(["CA", "CA", "NY"])]
+
+    assert [row[0] for row in rows] == ["CA", "CA", "NY"]
+    assert rows[0][0] is rows[1][0]
+    assert calls.count("CA.") == 1
+
+
+def test_raw_and_cleaned_forms_map_to_the_same_object():
+    interner = ColumnInterner(1, clean, max_values=10)
+
+    first = interner.clean_values(["CA."])[0]
+
+    assert interner.clean_values(["CA"])[0] is first
+
+
+def test_cleaned_value_is_not_aliased_when_cleaning_it_again_changes_it():
+    raw_values = ["a\xa0.", "a\xa0"]
+    expected = [clean(value) for value in raw_values]
+
+    for order in (raw_values, raw_values[::-1]):
+        interner = ColumnInterner(1, clean, max_values=10)
+        cleaned = {value: interner.clean_values([value])[0] for value in order + order}
+
+        assert [cleaned[value] for value in raw_values] == expected
+
+
+def test_high_cardinality_column_stops_interning():
+    interner = ColumnInterner(2, clean, max_values=3)
+
+    for i in range(5):
+        assert interner.clean_values(["x", str(i)]) == ["x", str(i)]
+
+    assert interner.interned_columns == 1
+    assert interner.getters[1] is clean
+
+
+def test_non_string_values_are_not_pooled():
+    interner = ColumnInterner(1, clean, max_values=10)
+
+    assert [interner.clean_values([value])[0] for value in (1, 1.0, True)] == [clean(1), clean(1.0), clean(True)]
+
+
+def test_clean_row_reads_the_projected_positions():
+    interner = ColumnInterner(2, clean, max_values=0)
+
+    assert interner.clean_row(["a", "skip", " b. "], [2, 0]) == ["b", "a"]
+    assert interner.interned_columns == 0